@@ -1,24 +1,51 @@
 import os
-from fastapi import FastAPI, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+import sys
+import json
+import asyncio
+from fastapi import BackgroundTasks, FastAPI, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
-from src.services.auth import authenticate_user, create_access_token, create_user
-from src.integrations.xrpl_client import XRPLClient
-from src.models.user import Base
+from src.services.activity_feed import activity_feed
+from src.services.auth import (
+    authenticate_user_async,
+    create_access_token,
+    create_user_async,
+    get_current_user,
+    get_token_version,
+    oauth2_scheme,
+)
+from src.services.password_hashing import shutdown_hash_pool
+from src.services.platform_stats import confirm_payments, record_payment, run_reconciliation_loop
+from src.services.transaction_history import MAX_PAGE_SIZE, iter_transaction_history, parse_cursor, sync_transaction_history
+from src.integrations.clients import close_clients, get_xrpl_client
+from src.migrations import run_migrations_async
+from src.models.user import User
+from src.routes.admin import admin_router
 from src.schemas.user import UserCreate, UserResponse, UserLogin
-from src.database import engine, get_db
+from src.database import SessionLocal, async_engine, get_async_db, get_db, get_pool_stats
+from src.utils.metrics import InstrumentedRoute, metrics_response
+from src.utils.response_cache import response_cache
 
-# Database initialization
-Base.metadata.create_all(bind=engine)
+# Schema creation is a release step (python -m src.migrations); set
+# AUTO_MIGRATE=false once it runs there to skip it on worker startup
+AUTO_MIGRATE = os.getenv('AUTO_MIGRATE', 'true').lower() in ('1', 'true', 'yes')
+# Balances are kept current by the ledger stream, so a short TTL only absorbs bursts
+BALANCE_CACHE_TTL = float(os.getenv('BALANCE_CACHE_TTL', '2'))
+HISTORY_CACHE_TTL = float(os.getenv('HISTORY_CACHE_TTL', '5'))
 
 app = FastAPI(
     title="EonXRP Platform",
     description="Comprehensive XRP Blockchain Management Platform",
     version="1.0.0"
 )
+# Must be set before any route is declared
+app.router.route_class = InstrumentedRoute
 
 # CORS Configuration
 app.add_middleware(
@@ -29,50 +56,160 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# XRPL Client
-xrpl_client = XRPLClient(network=os.getenv('XRPL_NETWORK', 'testnet'))
+app.include_router(admin_router)
+
+@app.on_event("startup")
+async def migrate_schema():
+    if AUTO_MIGRATE:
+        await run_migrations_async()
+
+@app.on_event("startup")
+async def start_activity_feed():
+    await activity_feed.start()
+
+@app.on_event("startup")
+async def start_stats_reconciliation():
+    app.state.stats_reconciler = asyncio.create_task(run_reconciliation_loop())
+
+@app.on_event("startup")
+async def warm_xrpl_client():
+    # Off the event loop, so the worker serves requests while xrpl-py loads
+    def warm():
+        get_xrpl_client().wallets.refill()
+    asyncio.get_running_loop().run_in_executor(None, warm)
+
+@app.on_event("shutdown")
+def stop_worker_pools():
+    shutdown_hash_pool()
+    close_clients()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    app.state.stats_reconciler.cancel()
+    await activity_feed.stop()
+    await async_engine.dispose()
+
+@app.get("/health/db-pool")
+def database_pool_stats():
+    return get_pool_stats()
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+@app.get("/health/xrpl-nodes")
+def xrpl_node_stats():
+    return get_xrpl_client().nodes.stats()
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
 
 # Authentication Routes
 @app.post("/register", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        created_user = create_user(db, user)
+        created_user = await create_user_async(db, user)
+        activity_feed.publish('register', created_user.username)
         return created_user
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/token")
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(data={"sub": user.username})
+    access_token = create_access_token(data={"sub": user.username, "ver": await get_token_version(db, user.username)})
+    activity_feed.publish('login', user.username)
     return {"access_token": access_token, "token_type": "bearer"}
 
+@app.get("/users/me", response_model=UserResponse)
+async def read_current_user(current_user: User = Depends(get_current_user)):
+    return current_user
+
 # XRPL Routes
 @app.post("/wallet/create")
 def create_xrpl_wallet():
-    return xrpl_client.create_wallet()
+    return get_xrpl_client().create_wallet()
 
 @app.get("/wallet/balance/{address}")
-def get_wallet_balance(address: str):
-    return {"balance": xrpl_client.get_balance(address)}
+async def get_wallet_balance(address: str, request: Request):
+    return await response_cache.serve(
+        request, lambda: {"balance": get_xrpl_client().get_balance(address)}, ttl=BALANCE_CACHE_TTL
+    )
 
 @app.post("/transaction/send")
-def send_xrp_transaction(sender_seed: str, recipient: str, amount: float):
-    sender_wallet = Wallet(seed=sender_seed)
-    return xrpl_client.send_transaction(sender_wallet, recipient, amount)
+def send_xrp_transaction(
+    sender_seed: str,
+    recipient: str,
+    amount: float,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    xrpl_client = get_xrpl_client()
+    sender_wallet = xrpl_client.wallet_from_seed(sender_seed)
+    result = xrpl_client.send_transaction(sender_wallet, recipient, amount)
+    if result['status'] == 'success':
+        # Counted in the platform volume once validated with tesSUCCESS
+        record_payment(
+            db, result['transaction_hash'], sender_wallet.classic_address, recipient,
+            result['amount_drops'], result['last_ledger_sequence']
+        )
+        db.commit()
+        background_tasks.add_task(confirm_payments, xrpl_client, [result['transaction_hash']])
+        activity_feed.publish(
+            'transaction',
+            sender=sender_wallet.classic_address,
+            recipient=recipient,
+            amount=amount,
+            transaction_hash=result['transaction_hash']
+        )
+        for address in (sender_wallet.classic_address, recipient):
+            response_cache.invalidate(f"/wallet/balance/{address}")
+            response_cache.invalidate(f"/transaction/history/{address}")
+    return result
 
 @app.get("/transaction/history/{address}")
-def get_transaction_history(address: str):
-    return xrpl_client.get_transaction_history(address)
+async def get_transaction_history(
+    address: str,
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_db)
+):
+    def page(session: Session):
+        try:
+            after = parse_cursor(cursor)
+            sync_transaction_history(session, get_xrpl_client(), address)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return iter_transaction_history(session, address, cursor=after, limit=limit)
+
+    if limit is None:
+        # Full exports stream instead of being buffered for the cache
+        rows = await run_in_threadpool(page, db)
+        return StreamingResponse(
+            (json.dumps(row) + "\n" for row in rows),
+            media_type="application/x-ndjson"
+        )
+
+    def cached_page() -> bytes:
+        # Own session: the result is shared with coalesced requests
+        with SessionLocal() as session:
+            return "".join(json.dumps(row) + "\n" for row in page(session)).encode()
+
+    return await response_cache.serve(
+        request,
+        cached_page,
+        ttl=HISTORY_CACHE_TTL,
+        media_type="application/x-ndjson"
+    )
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    if '--profile-startup' in sys.argv:
+        from src.utils.startup_profile import print_startup_report
+        print_startup_report('main', cwd=os.path.dirname(os.path.abspath(__file__)))
+    else:
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
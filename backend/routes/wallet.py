@@ -1,8 +1,8 @@
 from fastapi import APIRouter, HTTPException
-from xrpl.wallet import Wallet
-from xrpl.clients import JsonRpcClient
 from pydantic import BaseModel
 
+from src.integrations.clients import get_xrpl_client
+
 router = APIRouter()
 
 class WalletRequest(BaseModel):
@@ -11,7 +11,10 @@ class WalletRequest(BaseModel):
 @router.post("/create")
 async def create_wallet(request: WalletRequest = None):
     try:
-        wallet = Wallet.create() if not request or not request.seed else Wallet(seed=request.seed)
+        xrpl_client = get_xrpl_client()
+        if not request or not request.seed:
+            return xrpl_client.create_wallet()
+        wallet = xrpl_client.wallet_from_seed(request.seed)
         return {
             "address": wallet.classic_address,
             "seed": wallet.seed
@@ -20,10 +23,9 @@ async def create_wallet(request: WalletRequest = None):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/balance/{address}")
-async def get_wallet_balance(address: str):
+def get_wallet_balance(address: str):
     try:
-        client = JsonRpcClient("https://s.altnet.rippletest.net:51234/")
-        # Placeholder for balance retrieval logic
-        return {"address": address, "balance": "0 XRP"}
+        balance = get_xrpl_client().get_balance(address)
+        return {"address": address, "balance": f"{balance} XRP"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1,24 +1,195 @@
 import os
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import AsyncIterator, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .utils.metrics import DB_CHECKOUT_SECONDS, DB_QUERY_SECONDS, DB_SESSION_SECONDS
+from .utils.paths import REPO_ROOT
+
+def resolve_database_url(url: str) -> str:
+    """
+    Anchor a relative SQLite file path at the repository root
+
+    Both apps then open the same file whichever directory they start in.
+    """
+    parsed = make_url(url)
+    database = parsed.database
+    if parsed.get_backend_name() != 'sqlite' or not database or database == ':memory:' or os.path.isabs(database):
+        return url
+    return parsed.set(database=os.path.normpath(os.path.join(REPO_ROOT, database))).render_as_string(hide_password=False)
 
 # SQLAlchemy Database Configuration
-DATABASE_URL = os.getenv(
-    'DATABASE_URL', 
+DATABASE_URL = resolve_database_url(os.getenv(
+    'DATABASE_URL',
     'sqlite:///./eonxrp.db'  # Default to SQLite if no URL provided
-)
+))
+
+# Connection pool tuning
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+_ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+class PoolStats:
+    """
+    Checkout-wait and in-use gauges for one connection pool
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.in_use = 0
+        self.max_in_use = 0
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def checked_out(self):
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def checked_in(self):
+        with self._lock:
+            self.in_use -= 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'in_use': self.in_use,
+                'max_in_use': self.max_in_use,
+                'checkouts': self.checkouts,
+                'wait_seconds_total': self.wait_seconds_total,
+                'avg_wait_seconds': self.wait_seconds_total / self.checkouts if self.checkouts else 0.0,
+                'max_wait_seconds': self.max_wait_seconds,
+                'timeouts': self.timeouts,
+            }
+
+def _timed_pool(base, stats: PoolStats):
+    # QueuePool._do_get is where callers block on an exhausted pool. Stats live
+    # on the class so they survive engine.dispose() recreating the pool.
+    checkout_seconds = DB_CHECKOUT_SECONDS.labels(stats.name)
+
+    class TimedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                connection = super()._do_get()
+            except Exception:
+                stats.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            waited = time.perf_counter() - start
+            stats.record_wait(waited)
+            checkout_seconds.observe(waited)
+            return connection
+
+    TimedPool.__name__ = f"Timed{base.__name__}"
+    return TimedPool
+
+def _instrument(engine, stats: PoolStats):
+    event.listen(engine, 'checkout', lambda *args: stats.checked_out())
+    event.listen(engine, 'checkin', lambda *args: stats.checked_in())
+
+    query_seconds = DB_QUERY_SECONDS.labels(stats.name)
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    def after_execute(conn, cursor, statement, parameters, context, executemany):
+        query_seconds.observe(time.perf_counter() - context._query_start)
+
+    event.listen(engine, 'before_cursor_execute', before_execute)
+    event.listen(engine, 'after_cursor_execute', after_execute)
+
+def _pool_kwargs() -> dict:
+    return {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING,
+    }
+
+def async_database_url(url: str) -> str:
+    """
+    Map a sync DATABASE_URL onto its asyncpg/aiosqlite equivalent
+    """
+    parsed = make_url(url)
+    drivername = _ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+pool_stats = {
+    'sync': PoolStats('sync'),
+    'async': PoolStats('async'),
+}
 
 engine = create_engine(
-    DATABASE_URL, 
-    connect_args={"check_same_thread": False} if 'sqlite' in DATABASE_URL else {}
+    DATABASE_URL,
+    connect_args={"check_same_thread": False} if 'sqlite' in DATABASE_URL else {},
+    poolclass=_timed_pool(QueuePool, pool_stats['sync']),
+    **_pool_kwargs()
 )
 
+async_engine = create_async_engine(
+    async_database_url(DATABASE_URL),
+    poolclass=_timed_pool(AsyncAdaptedQueuePool, pool_stats['async']),
+    **_pool_kwargs()
+)
+
+_instrument(engine, pool_stats['sync'])
+_instrument(async_engine.sync_engine, pool_stats['async'])
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 def get_db() -> Session:
+    start = time.perf_counter()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+        DB_SESSION_SECONDS.labels('sync').observe(time.perf_counter() - start)
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    start = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            yield db
+    finally:
+        DB_SESSION_SECONDS.labels('async').observe(time.perf_counter() - start)
+
+def get_pool_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Current gauges for the sync and async connection pools
+    """
+    stats = {}
+    for name, pool_engine in (('sync', engine), ('async', async_engine.sync_engine)):
+        snapshot = pool_stats[name].snapshot()
+        snapshot['size'] = pool_engine.pool.size()
+        snapshot['overflow'] = pool_engine.pool.overflow()
+        stats[name] = snapshot
+    return stats
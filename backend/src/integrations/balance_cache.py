@@ -0,0 +1,252 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from xrpl.asyncio.clients import AsyncWebsocketClient
+from xrpl.models.requests import Subscribe, Unsubscribe
+
+DROPS_PER_XRP = 1_000_000
+
+
+class BalanceCache:
+    """
+    Bounded LRU of XRP balances kept fresh by an account subscription
+
+    A cold miss subscribes to the address over a WebSocket and, once
+    rippled confirms the subscription, reads it with account_info; every
+    validated transaction that touches a watched AccountRoot then rewrites
+    its cached balance in place, so repeat reads never reach rippled. Only
+    balances backed by a confirmed subscription are cached: while the stream
+    is down or still connecting, misses go straight to account_info. Evicted
+    addresses are unsubscribed.
+
+    Each address carries a version bumped by every stream update, so a
+    fetch that raced a payment never overwrites the newer streamed balance.
+    """
+
+    def __init__(
+        self,
+        fetch_balance: Callable[[str], float],
+        ws_url: str,
+        max_size: int = 10_000,
+        reconnect_delay: float = 1.0,
+        max_reconnect_delay: float = 30.0,
+        subscribe_timeout: float = 5.0
+    ):
+        """
+        :param fetch_balance: Returns an address's balance in XRP from account_info
+        :param ws_url: rippled WebSocket endpoint used for the subscription
+        :param max_size: Maximum number of cached (and watched) accounts
+        :param reconnect_delay: Initial delay before reconnecting the stream
+        :param max_reconnect_delay: Upper bound of the reconnect backoff
+        :param subscribe_timeout: How long a miss waits for rippled to confirm
+            its subscription before answering uncached
+        """
+        self._fetch_balance = fetch_balance
+        self.ws_url = ws_url
+        self.max_size = max_size
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.subscribe_timeout = subscribe_timeout
+
+        self._balances: 'OrderedDict[str, float]' = OrderedDict()
+        # Stream updates seen per cached or in-flight address
+        self._versions: Dict[str, int] = {}
+        # Misses in flight per address
+        self._pending: Dict[str, int] = {}
+        # Bumped on every disconnect, which drops all subscriptions
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ws: Optional[AsyncWebsocketClient] = None
+        self._connected = threading.Event()
+        self._stopped = threading.Event()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, address: str) -> float:
+        """
+        Return an account's balance in XRP, from memory when possible
+
+        :param address: Classic address of the account
+        :return: Balance in XRP
+        """
+        with self._lock:
+            balance = self._balances.get(address)
+            if balance is not None:
+                self._balances.move_to_end(address)
+                self.hits += 1
+                return balance
+            self.misses += 1
+            self._pending[address] = self._pending.get(address, 0) + 1
+            version = self._versions.get(address, 0)
+
+        try:
+            # Payments validated after the subscription is confirmed arrive on
+            # the stream, earlier ones are in the account_info read
+            generation = self._subscribe_now(address)
+            balance = self._fetch_balance(address)
+            if generation is None:
+                return balance
+            balance, evicted = self._store(address, balance, version, generation)
+        finally:
+            with self._lock:
+                self._pending[address] -= 1
+                if not self._pending[address]:
+                    del self._pending[address]
+                    if address not in self._balances:
+                        self._versions.pop(address, None)
+        if evicted:
+            self._schedule(self._unsubscribe(evicted))
+        return balance
+
+    def invalidate(self, address: Optional[str] = None):
+        """
+        Forget one cached balance, or all of them
+
+        :param address: Address to drop; clears the whole cache when omitted
+        """
+        with self._lock:
+            if address is None:
+                self._balances.clear()
+                self._versions = {watched: version + 1 for watched, version in self._versions.items() if watched in self._pending}
+            else:
+                self._balances.pop(address, None)
+                if address in self._pending:
+                    self._versions[address] = self._versions.get(address, 0) + 1
+                else:
+                    self._versions.pop(address, None)
+
+    def _store(self, address: str, balance: float, version: int, generation: int):
+        """
+        Cache a fetched balance unless the stream got there first
+
+        :return: Balance to answer with and the addresses evicted to make room
+        """
+        evicted: List[str] = []
+        with self._lock:
+            if self._generation != generation:
+                # The subscription died with its connection
+                return balance, evicted
+            if self._versions.get(address, 0) != version:
+                # A stream update (or an invalidation) landed while fetching
+                return self._balances.get(address, balance), evicted
+            self._balances[address] = balance
+            self._balances.move_to_end(address)
+            while len(self._balances) > self.max_size:
+                stale = self._balances.popitem(last=False)[0]
+                if stale not in self._pending:
+                    self._versions.pop(stale, None)
+                evicted.append(stale)
+        return balance, evicted
+
+    def _update(self, address: str, drops: str):
+        with self._lock:
+            if address in self._balances or address in self._pending:
+                # Newer than any fetch in flight, which will defer to it
+                self._versions[address] = self._versions.get(address, 0) + 1
+                self._balances[address] = int(drops) / DROPS_PER_XRP
+
+    def apply_transaction(self, message: dict):
+        """
+        Fold a validated `transaction` stream message into the cache
+
+        :param message: Raw message received from the subscription
+        """
+        if message.get('type') != 'transaction' or not message.get('validated'):
+            return
+        for affected in message.get('meta', {}).get('AffectedNodes', []):
+            for kind, node in affected.items():
+                if node.get('LedgerEntryType') != 'AccountRoot':
+                    continue
+                if kind == 'DeletedNode':
+                    self.invalidate(node.get('FinalFields', {}).get('Account'))
+                    continue
+                fields = node.get('FinalFields') or node.get('NewFields') or {}
+                if 'Account' in fields and 'Balance' in fields:
+                    self._update(fields['Account'], fields['Balance'])
+
+    def _ensure_stream(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._loop.run_until_complete,
+                args=(self._run(),),
+                name='xrpl-balance-stream',
+                daemon=True
+            )
+            self._thread.start()
+
+    def _schedule(self, coro):
+        if self._loop is None or self._stopped.is_set():
+            coro.close()
+            return
+        asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _subscribe_now(self, address: str) -> Optional[int]:
+        """
+        Subscribe to an address and wait for rippled to confirm
+
+        :return: Connection generation the subscription lives on, None if unconfirmed
+        """
+        self._ensure_stream()
+        if not self._connected.is_set() or self._stopped.is_set():
+            # Stream down or still connecting: answer from account_info right away
+            return None
+        try:
+            future = asyncio.run_coroutine_threadsafe(self._subscribe(address), self._loop)
+            return future.result(self.subscribe_timeout)
+        except Exception:
+            return None
+
+    async def _subscribe(self, address: str) -> Optional[int]:
+        ws, generation = self._ws, self._generation
+        if ws is None or not ws.is_open():
+            return None
+        response = await ws.request(Subscribe(accounts=[address]))
+        return generation if response.is_successful() else None
+
+    async def _unsubscribe(self, accounts: Iterable[str]):
+        if self._ws is not None and self._ws.is_open():
+            await self._ws.send(Unsubscribe(accounts=list(accounts)))
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while not self._stopped.is_set():
+            try:
+                async with AsyncWebsocketClient(self.ws_url) as ws:
+                    self._ws = ws
+                    self._connected.set()
+                    delay = self.reconnect_delay
+                    async for message in ws:
+                        self.apply_transaction(message)
+            except Exception:
+                pass
+            finally:
+                self._connected.clear()
+                self._ws = None
+            # Subscriptions died with the connection and updates may have been missed
+            with self._lock:
+                self._generation += 1
+            self.invalidate()
+            if self._stopped.is_set():
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def close(self):
+        """
+        Stop the subscription thread and drop all cached balances
+        """
+        self._stopped.set()
+        self._connected.clear()
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        self.invalidate()
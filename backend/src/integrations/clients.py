@@ -0,0 +1,39 @@
+import os
+import threading
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from .signing_service import SigningService
+    from .xrpl_client import XRPLClient
+
+# Built on first use so importing the app skips xrpl-py
+_xrpl_client: Optional['XRPLClient'] = None
+_signing_service: Optional['SigningService'] = None
+_lock = threading.Lock()
+
+def get_xrpl_client() -> 'XRPLClient':
+    global _xrpl_client
+    if _xrpl_client is None:
+        with _lock:
+            if _xrpl_client is None:
+                from .xrpl_client import XRPLClient
+                _xrpl_client = XRPLClient(network=os.getenv('XRPL_NETWORK', 'testnet'))
+    return _xrpl_client
+
+def get_signing_service() -> 'SigningService':
+    global _signing_service
+    if _signing_service is None:
+        with _lock:
+            if _signing_service is None:
+                from .signing_service import SigningService
+                _signing_service = SigningService()
+    return _signing_service
+
+def close_clients():
+    """
+    Stop the worker processes and connections behind whichever clients were built
+    """
+    if _xrpl_client is not None:
+        _xrpl_client.close()
+    if _signing_service is not None:
+        _signing_service.close()
@@ -0,0 +1,276 @@
+"""
+Pool of rippled JSON-RPC endpoints with health probing, latency-aware
+routing and hedged reads
+
+Transport-agnostic: callers pass an async `send(url, payload)` returning the
+decoded JSON-RPC body. The eon_xrp app, deployed from the repository root,
+imports this module as backend.src.integrations.node_pool, so it must only
+import the standard library.
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_NODES = {
+    'mainnet': ('https://xrplcluster.com/', 'https://s1.ripple.com:51234/', 'https://s2.ripple.com:51234/'),
+    'testnet': ('https://s.altnet.rippletest.net:51234/', 'https://testnet.xrpl-labs.com/'),
+    'devnet': ('https://s.devnet.rippletest.net:51234/',),
+}
+
+XRPL_PROBE_INTERVAL = float(os.getenv('XRPL_PROBE_INTERVAL', '10'))
+XRPL_HEDGE_MIN_DELAY = float(os.getenv('XRPL_HEDGE_MIN_DELAY', '0.05'))
+XRPL_HEDGE_MAX_DELAY = float(os.getenv('XRPL_HEDGE_MAX_DELAY', '2'))
+# Validated ledgers a node may trail the best one by before it is skipped
+XRPL_MAX_LEDGER_LAG = int(os.getenv('XRPL_MAX_LEDGER_LAG', '3'))
+XRPL_MAX_NODE_FAILURES = int(os.getenv('XRPL_MAX_NODE_FAILURES', '3'))
+
+# rippled answers these when the node, not the request, is the problem
+NODE_ERRORS = frozenset({'tooBusy', 'slowDown', 'noNetwork', 'noCurrent', 'noClosed', 'amendmentBlocked'})
+SYNCED_STATES = frozenset({'full', 'proposing', 'validating'})
+# Methods that change state go to one node only, never hedged or retried elsewhere
+PINNED_METHODS = frozenset({'submit', 'submit_multisigned'})
+
+Send = Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+class NodeUnavailable(Exception):
+    """
+    A node answered with an error about its own state (e.g. tooBusy)
+    """
+
+def node_urls(network: str) -> Optional[List[str]]:
+    """
+    Endpoints for a network
+
+    XRPL_RPC_URLS (comma separated) or XRPL_RPC_URL, when set, replace the
+    defaults, e.g. to point at benchmarks/fake_rippled.py.
+
+    :return: URLs in order of preference, or None for an unknown network
+    """
+    configured = os.getenv('XRPL_RPC_URLS') or os.getenv('XRPL_RPC_URL')
+    if configured:
+        return [url.strip() for url in configured.split(',') if url.strip()]
+    nodes = DEFAULT_NODES.get(network)
+    return list(nodes) if nodes else None
+
+def is_pinned(payload: Dict[str, Any]) -> bool:
+    """
+    Whether a JSON-RPC payload must go to the pinned submission node
+
+    Besides submits this covers reads of the open ('current') ledger, which
+    is node-local: a Sequence read there must match the node it is sent to.
+    """
+    if payload.get('method') in PINNED_METHODS:
+        return True
+    params = payload.get('params') or [{}]
+    return params[0].get('ledger_index') == 'current'
+
+class Node:
+    def __init__(self, url: str, rank: int, window: int = 200, alpha: float = 0.2):
+        """
+        :param url: JSON-RPC endpoint
+        :param rank: Position in the configured list, the tie-breaker
+        :param window: Latency samples kept for the hedge percentile
+        :param alpha: Weight of the newest sample in the moving average
+        """
+        self.url = url
+        self.rank = rank
+        self.alpha = alpha
+        self.healthy = True
+        self.failures = 0
+        self.latency: Optional[float] = None
+        self.samples = deque(maxlen=window)
+        self.validated_ledger = 0
+        self.requests = 0
+        self.errors = 0
+
+    def observe(self, seconds: float):
+        self.requests += 1
+        self.failures = 0
+        self.samples.append(seconds)
+        self.latency = seconds if self.latency is None else self.alpha * seconds + (1 - self.alpha) * self.latency
+
+    def observe_failure(self, max_failures: int):
+        self.requests += 1
+        self.errors += 1
+        self.failures += 1
+        if self.failures >= max_failures:
+            self.healthy = False
+
+    def percentile(self, q: float) -> Optional[float]:
+        if len(self.samples) < 20:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int(q * (len(ordered) - 1))]
+
+    def sort_key(self):
+        # Unmeasured nodes rank after measured ones until a probe times them
+        return (not self.healthy, self.latency if self.latency is not None else float('inf'), self.rank)
+
+class NodePool:
+    """
+    Routes JSON-RPC calls to the fastest healthy rippled node
+
+    Reads go to the best-ranked node; if it has not answered within its own
+    p95 latency, the same request is sent to the runner-up and the first
+    answer wins. Failures fail over the same way. Submissions and open-ledger
+    reads stay on one pinned node, which only changes when it turns unhealthy.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        probe_interval: float = XRPL_PROBE_INTERVAL,
+        hedge_min_delay: float = XRPL_HEDGE_MIN_DELAY,
+        hedge_max_delay: float = XRPL_HEDGE_MAX_DELAY,
+        max_ledger_lag: int = XRPL_MAX_LEDGER_LAG,
+        max_failures: int = XRPL_MAX_NODE_FAILURES
+    ):
+        """
+        :param urls: Endpoints in order of preference
+        :param probe_interval: Seconds between server_info probes
+        :param hedge_min_delay: Lower bound on the hedge delay
+        :param hedge_max_delay: Hedge delay until enough latencies are known
+        :param max_ledger_lag: Validated ledgers a node may trail the best by
+        :param max_failures: Consecutive failures before a node is marked down
+        """
+        if not urls:
+            raise ValueError("NodePool needs at least one endpoint")
+        self.nodes = [Node(url, rank) for rank, url in enumerate(urls)]
+        self.probe_interval = probe_interval
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.max_ledger_lag = max_ledger_lag
+        self.max_failures = max_failures
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._pinned: Optional[Node] = None
+        # Shared by request threads, each with its own event loop
+        self._lock = threading.Lock()
+
+    @property
+    def urls(self) -> List[str]:
+        return [node.url for node in self.nodes]
+
+    def ranked(self) -> List[Node]:
+        with self._lock:
+            return sorted(self.nodes, key=Node.sort_key)
+
+    def pinned(self) -> Node:
+        with self._lock:
+            if self._pinned is None or not self._pinned.healthy:
+                self._pinned = min(self.nodes, key=Node.sort_key)
+            return self._pinned
+
+    def hedge_delay(self, node: Node) -> float:
+        p95 = node.percentile(0.95)
+        if p95 is None:
+            return self.hedge_max_delay
+        return min(self.hedge_max_delay, max(self.hedge_min_delay, p95))
+
+    async def _attempt(self, node: Node, send: Send, payload: Dict[str, Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            body = await send(node.url, payload)
+            error = (body.get('result') or {}).get('error')
+            if error in NODE_ERRORS:
+                raise NodeUnavailable(f"{node.url}: {error}")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            with self._lock:
+                node.observe_failure(self.max_failures)
+            raise
+        with self._lock:
+            node.observe(time.perf_counter() - start)
+        return body
+
+    async def request(self, send: Send, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Send one JSON-RPC payload through the pool
+
+        :param send: Coroutine function posting payload to a URL
+        :param payload: JSON-RPC body, e.g. {'method': 'account_info', 'params': [...]}
+        :return: Decoded JSON-RPC response body
+        """
+        if is_pinned(payload):
+            return await self._attempt(self.pinned(), send, payload)
+
+        candidates = self.ranked()
+        backups = iter(candidates[1:])
+        primary = asyncio.ensure_future(self._attempt(candidates[0], send, payload))
+        pending = {primary}
+        timeout = self.hedge_delay(candidates[0])
+        hedged = False
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if hedged and task is not primary:
+                            with self._lock:
+                                self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                # Nothing yet after the hedge delay, or a node failed: bring in the next one
+                backup = next(backups, None)
+                if backup is not None:
+                    if not done:
+                        hedged = True
+                        with self._lock:
+                            self.hedged += 1
+                    pending.add(asyncio.ensure_future(self._attempt(backup, send, payload)))
+                timeout = None
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def probe(self, send: Send):
+        """
+        Time server_info on every node and mark stale or unsynced ones down
+        """
+        async def probe_node(node: Node):
+            try:
+                body = await self._attempt(node, send, {'method': 'server_info', 'params': [{}]})
+                info = body['result']['info']
+                node.validated_ledger = (info.get('validated_ledger') or {}).get('seq', 0)
+                return info.get('server_state') in SYNCED_STATES
+            except Exception:
+                return False
+
+        synced = await asyncio.gather(*(probe_node(node) for node in self.nodes))
+        best = max(node.validated_ledger for node in self.nodes)
+        with self._lock:
+            for node, ok in zip(self.nodes, synced):
+                node.healthy = ok and best - node.validated_ledger <= self.max_ledger_lag
+                if node.healthy:
+                    node.failures = 0
+
+    async def probe_forever(self, send: Send):
+        while True:
+            await self.probe(send)
+            await asyncio.sleep(self.probe_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'pinned': self._pinned.url if self._pinned else None,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'nodes': [
+                    {
+                        'url': node.url,
+                        'healthy': node.healthy,
+                        'latency_ms': round(node.latency * 1000, 2) if node.latency is not None else None,
+                        'p95_ms': round(node.percentile(0.95) * 1000, 2) if node.percentile(0.95) is not None else None,
+                        'validated_ledger': node.validated_ledger,
+                        'requests': node.requests,
+                        'errors': node.errors,
+                    }
+                    for node in sorted(self.nodes, key=Node.sort_key)
+                ],
+            }
@@ -0,0 +1,78 @@
+import threading
+from typing import Callable, Dict
+
+# Engine results that mean our cached Sequence has drifted from the ledger
+RESYNC_ENGINE_RESULTS = ('tefPAST_SEQ', 'terPRE_SEQ')
+
+
+class _AccountSequence:
+    __slots__ = ('lock', 'next_sequence')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.next_sequence = None
+
+
+class SequenceAllocator:
+    """
+    In-process Sequence allocator for XRPL sending accounts
+
+    The next Sequence is fetched from the ledger once per account and then
+    handed out locally, so concurrent senders from the same account can
+    submit back to back instead of waiting on an account_info round trip.
+    """
+
+    def __init__(self, fetch_sequence: Callable[[str], int]):
+        """
+        :param fetch_sequence: Returns the next valid Sequence for an address
+        """
+        self._fetch_sequence = fetch_sequence
+        self._accounts: Dict[str, _AccountSequence] = {}
+        self._accounts_lock = threading.Lock()
+
+    def _state(self, account: str) -> _AccountSequence:
+        state = self._accounts.get(account)
+        if state is None:
+            with self._accounts_lock:
+                state = self._accounts.setdefault(account, _AccountSequence())
+        return state
+
+    def allocate(self, account: str) -> int:
+        """
+        Reserve the next Sequence for an account
+
+        :param account: Classic address of the sending account
+        :return: Sequence number reserved for the caller
+        """
+        state = self._state(account)
+        with state.lock:
+            if state.next_sequence is None:
+                state.next_sequence = self._fetch_sequence(account)
+            sequence = state.next_sequence
+            state.next_sequence += 1
+            return sequence
+
+    def release(self, account: str, sequence: int):
+        """
+        Return a Sequence that never reached the ledger
+
+        Only the most recently allocated number can be handed back; anything
+        older leaves a gap that the next terPRE_SEQ resync will close.
+
+        :param account: Classic address of the sending account
+        :param sequence: Sequence previously returned by allocate
+        """
+        state = self._state(account)
+        with state.lock:
+            if state.next_sequence == sequence + 1:
+                state.next_sequence = sequence
+
+    def resync(self, account: str):
+        """
+        Drop the cached Sequence so the next allocation refetches it
+
+        :param account: Classic address of the sending account
+        """
+        state = self._state(account)
+        with state.lock:
+            state.next_sequence = None
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from xrpl.core.addresscodec import decode_seed
+from xrpl.models.transactions.transaction import Transaction
+from xrpl.transaction import sign
+from xrpl.wallet import Wallet
+
+SIGNING_WORKERS = int(os.getenv('SIGNING_WORKERS', str(os.cpu_count() or 1)))
+# Transactions shipped to a worker per task; amortizes pickling and IPC
+SIGNING_CHUNK_SIZE = int(os.getenv('SIGNING_CHUNK_SIZE', '256'))
+# JSON file of key id -> seed, e.g. a mounted secret; only its path passes through the parent
+SIGNING_KEYS_FILE = os.getenv('SIGNING_KEYS_FILE')
+
+# Key id -> Wallet, populated once per worker process by _init_worker
+_worker_wallets: Dict[str, Wallet] = {}
+
+@dataclass
+class SignedTransaction:
+    key_id: str
+    tx_blob: str
+    tx_hash: str
+
+def load_keys_from_env() -> Dict[str, str]:
+    """
+    Read signing seeds from SIGNING_KEYS, a JSON object of key id -> seed
+
+    Only parsed inside the worker processes, but the variable is inherited
+    from the parent, whose environment (os.environ, /proc/<pid>/environ)
+    holds the seeds as well. Meant for development; see load_signing_keys.
+    """
+    return json.loads(os.getenv('SIGNING_KEYS', '{}'))
+
+def load_signing_keys() -> Dict[str, str]:
+    """
+    Read signing seeds from SIGNING_KEYS_FILE, falling back to SIGNING_KEYS
+
+    Runs inside the worker processes only: with SIGNING_KEYS_FILE set the
+    parent handles nothing but the path, so seeds never enter its memory
+    or environment. The file is still readable by anything running as the
+    service user; keeping keys from the parent process entirely would take
+    a separate user or an external signer.
+    """
+    if SIGNING_KEYS_FILE:
+        with open(SIGNING_KEYS_FILE, encoding='utf-8') as f:
+            return json.load(f)
+    return load_keys_from_env()
+
+def _init_worker(key_loader: Callable[[], Dict[str, str]]):
+    for key_id, seed in key_loader().items():
+        # from_seed assumes ed25519 unless told otherwise; the seed encodes its algorithm
+        _worker_wallets[key_id] = Wallet.from_seed(seed, algorithm=decode_seed(seed)[1])
+
+def _sign_chunk(chunk: List[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, str]]:
+    signed = []
+    for key_id, tx_json in chunk:
+        wallet = _worker_wallets.get(key_id)
+        if wallet is None:
+            raise KeyError(f"Unknown signing key: {key_id}")
+        transaction = sign(Transaction.from_xrpl(tx_json), wallet)
+        signed.append((transaction.blob(), transaction.get_hash()))
+    return signed
+
+def _key_addresses() -> Dict[str, str]:
+    return {key_id: wallet.classic_address for key_id, wallet in _worker_wallets.items()}
+
+class SigningService:
+    """
+    Offline transaction signing in a process pool
+
+    Seeds are loaded by key_loader inside each worker process and never
+    cross back to the caller; callers refer to keys by id and get back
+    serialized blobs ready for submit-by-blob. How far the seeds are kept
+    from the parent depends on the loader, see load_signing_keys.
+    Transactions must already be autofilled (Sequence, Fee, LastLedgerSequence).
+    """
+
+    def __init__(
+        self,
+        key_loader: Callable[[], Dict[str, str]] = load_signing_keys,
+        workers: int = SIGNING_WORKERS,
+        chunk_size: int = SIGNING_CHUNK_SIZE
+    ):
+        """
+        :param key_loader: Picklable module-level callable returning key id -> seed
+        :param workers: Number of signing processes
+        :param chunk_size: Transactions per worker task
+        """
+        self.key_loader = key_loader
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.key_loader,)
+            )
+        return self._executor
+
+    def _chunks(self, items: Sequence[Tuple[str, Transaction]]) -> List[List[Tuple[str, Dict[str, Any]]]]:
+        payload = [(key_id, transaction.to_xrpl()) for key_id, transaction in items]
+        return [payload[i:i + self.chunk_size] for i in range(0, len(payload), self.chunk_size)]
+
+    @staticmethod
+    def _collect(items: Sequence[Tuple[str, Transaction]], results: List[List[Tuple[str, str]]]) -> List[SignedTransaction]:
+        flat = [signed for chunk in results for signed in chunk]
+        return [
+            SignedTransaction(key_id=key_id, tx_blob=tx_blob, tx_hash=tx_hash)
+            for (key_id, _), (tx_blob, tx_hash) in zip(items, flat)
+        ]
+
+    def key_addresses(self) -> Dict[str, str]:
+        """
+        Classic address of every key the workers hold
+        """
+        return self._get_executor().submit(_key_addresses).result()
+
+    def sign_batch(self, items: Sequence[Tuple[str, Transaction]]) -> List[SignedTransaction]:
+        """
+        Sign autofilled transactions, preserving input order
+
+        :param items: (key id, autofilled transaction) pairs
+        :return: Signed blobs and hashes in the same order
+        """
+        executor = self._get_executor()
+        return self._collect(items, list(executor.map(_sign_chunk, self._chunks(items))))
+
+    async def sign_batch_async(self, items: Sequence[Tuple[str, Transaction]]) -> List[SignedTransaction]:
+        """
+        Same as sign_batch without blocking the event loop
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(executor, _sign_chunk, chunk) for chunk in self._chunks(items)
+        ))
+        return self._collect(items, list(results))
+
+    def close(self):
+        """
+        Stop the signing processes, discarding the keys they hold
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,142 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, List, Set, Tuple
+
+from xrpl.constants import CryptoAlgorithm
+from xrpl.wallet import Wallet
+
+from ..utils.process_pool import get_process_pool
+
+WALLET_POOL_ALGORITHM = os.getenv('WALLET_POOL_ALGORITHM', 'ed25519')
+WALLET_POOL_LOW_WATERMARK = int(os.getenv('WALLET_POOL_LOW_WATERMARK', '32'))
+WALLET_POOL_HIGH_WATERMARK = int(os.getenv('WALLET_POOL_HIGH_WATERMARK', '256'))
+# Refill batches running at once in the shared process pool
+WALLET_POOL_WORKERS = int(os.getenv('WALLET_POOL_WORKERS', '1'))
+WALLET_POOL_BATCH_SIZE = int(os.getenv('WALLET_POOL_BATCH_SIZE', '32'))
+
+# (public key, private key, seed)
+Keypair = Tuple[str, str, str]
+
+def _generate_keypairs(algorithm: str, count: int) -> List[Keypair]:
+    keypairs = []
+    for _ in range(count):
+        wallet = Wallet.create(algorithm=CryptoAlgorithm(algorithm))
+        keypairs.append((wallet.public_key, wallet.private_key, wallet.seed))
+    return keypairs
+
+class WalletPool:
+    """
+    Bounded pool of pre-generated XRPL keypairs
+
+    Key generation and address derivation run in the shared process pool
+    whenever the pool drops below the low watermark, so handing out a wallet
+    on the request path is a deque pop. At most `workers` refill batches run
+    at once, leaving the other pool workers to password hashing.
+
+    Pooled keys are ordinary Python strings in this process until handed
+    out, like the seed create_wallet returns; nothing is wiped.
+    """
+
+    def __init__(
+        self,
+        algorithm: str = WALLET_POOL_ALGORITHM,
+        low_watermark: int = WALLET_POOL_LOW_WATERMARK,
+        high_watermark: int = WALLET_POOL_HIGH_WATERMARK,
+        workers: int = WALLET_POOL_WORKERS,
+        batch_size: int = WALLET_POOL_BATCH_SIZE
+    ):
+        """
+        :param algorithm: 'ed25519' or 'secp256k1'
+        :param low_watermark: Refill starts when fewer keypairs than this are pooled
+        :param high_watermark: Refill stops once this many keypairs are pooled
+        :param workers: Refill batches running at once in the shared process pool
+        :param batch_size: Keypairs generated per worker task
+        """
+        self.algorithm = CryptoAlgorithm(algorithm).value
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self.workers = workers
+        self.batch_size = batch_size
+        self._entries: Deque[Keypair] = deque()
+        self._pending = 0
+        self._backlog: Deque[int] = deque()
+        self._in_flight = 0
+        self._running: Set[Future] = set()
+        self._closed = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def acquire(self) -> Wallet:
+        """
+        Hand out a fresh wallet, generating one inline only if the pool is empty
+        """
+        with self._lock:
+            entry = self._entries.popleft() if self._entries else None
+        self.refill()
+        if entry is None:
+            self.misses += 1
+            return Wallet.create(algorithm=CryptoAlgorithm(self.algorithm))
+        self.hits += 1
+        public_key, private_key, seed = entry
+        return Wallet(public_key, private_key, seed=seed)
+
+    def refill(self):
+        """
+        Schedule background generation up to the high watermark if below the low one
+        """
+        with self._lock:
+            available = len(self._entries) + self._pending
+            if self._closed or available >= self.low_watermark:
+                return
+            needed = self.high_watermark - available
+            while needed > 0:
+                batch = min(self.batch_size, needed)
+                self._backlog.append(batch)
+                self._pending += batch
+                needed -= batch
+        self._dispatch()
+
+    def _dispatch(self):
+        with self._lock:
+            batches = []
+            while self._backlog and self._in_flight < self.workers:
+                batches.append(self._backlog.popleft())
+                self._in_flight += 1
+        for batch in batches:
+            future = get_process_pool().submit(_generate_keypairs, self.algorithm, batch)
+            with self._lock:
+                self._running.add(future)
+            future.add_done_callback(lambda done, batch=batch: self._store(done, batch))
+
+    def _store(self, future: Future, batch: int):
+        try:
+            keypairs = future.result()
+        except BaseException:
+            keypairs = []
+        with self._lock:
+            self._running.discard(future)
+            self._in_flight -= 1
+            self._pending -= batch
+            if not self._closed:
+                for keypair in keypairs:
+                    if len(self._entries) < self.high_watermark:
+                        self._entries.append(keypair)
+        self._dispatch()
+
+    def close(self):
+        """
+        Cancel outstanding refills and drop every pooled keypair
+        """
+        with self._lock:
+            self._closed = True
+            self._entries.clear()
+            self._backlog.clear()
+            running = list(self._running)
+        for future in running:
+            future.cancel()
@@ -1,42 +1,213 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import httpx
+from xrpl.account import get_balance, get_next_valid_seq_number
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
 from xrpl.clients import JsonRpcClient
+from xrpl.core.addresscodec import decode_seed
 from xrpl.wallet import Wallet
+from xrpl.ledger import get_fee, get_latest_validated_ledger_sequence
+from xrpl.models.requests import AccountTx, SubmitOnly, Tx
 from xrpl.models.transactions import Payment
-from xrpl.transaction import submit
-from typing import Dict, Any
+from xrpl.transaction import autofill_and_sign, submit
+from xrpl.utils import xrp_to_drops
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+from ..core.exceptions import TransactionException
+from ..utils.metrics import XRPL_RPC_ERRORS, XRPL_RPC_SECONDS
+from .balance_cache import DROPS_PER_XRP, BalanceCache
+from .node_pool import NodePool, node_urls
+from .sequence_allocator import RESYNC_ENGINE_RESULTS, SequenceAllocator
+from .wallet_pool import WalletPool
+
+# Connection pool configuration
+XRPL_RPC_TIMEOUT = float(os.getenv('XRPL_RPC_TIMEOUT', '10'))
+XRPL_MAX_CONNECTIONS = int(os.getenv('XRPL_MAX_CONNECTIONS', '20'))
+XRPL_MAX_KEEPALIVE = int(os.getenv('XRPL_MAX_KEEPALIVE', '10'))
+
+class PooledJsonRpcClient(JsonRpcClient):
+    """
+    Sync JSON-RPC client routing through a NodePool over persistent connections
+
+    xrpl-py's sync client runs every call in a fresh event loop with a fresh
+    httpx client, paying a TLS handshake per request. Here the posts run on
+    one long-lived httpx.Client from a small thread pool, and the per-call
+    event loop only coordinates hedged attempts.
+    """
+
+    def __init__(
+        self,
+        pool: NodePool,
+        timeout: float = XRPL_RPC_TIMEOUT,
+        max_connections: int = XRPL_MAX_CONNECTIONS,
+        max_keepalive: int = XRPL_MAX_KEEPALIVE
+    ):
+        """
+        :param pool: Nodes to route between
+        :param timeout: Timeout in seconds for each HTTP attempt
+        :param max_connections: Upper bound on concurrent connections
+        :param max_keepalive: Idle connections kept open for reuse
+        """
+        super().__init__(pool.urls[0])
+        self.pool = pool
+        self._http = httpx.Client(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='xrpl-rpc')
+        self._stop_probing = threading.Event()
+        self._prober: Optional[threading.Thread] = None
+
+    def _post(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self._http.post(url, json=payload).json()
+
+    async def _send(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._post, url, payload)
+
+    async def _request_impl(self, request):
+        method = request.method.value
+        start = time.perf_counter()
+        try:
+            response = json_to_response(await self.pool.request(self._send, request_to_json_rpc(request)))
+        except Exception as e:
+            XRPL_RPC_ERRORS.labels(method, type(e).__name__).inc()
+            raise
+        finally:
+            XRPL_RPC_SECONDS.labels(method).observe(time.perf_counter() - start)
+        if not response.is_successful():
+            XRPL_RPC_ERRORS.labels(method, response.result.get('error', 'unknown')).inc()
+        return response
+
+    def start_probing(self):
+        """
+        Probe node health and latency from a daemon thread until close()
+        """
+        def probe_loop():
+            while not self._stop_probing.is_set():
+                asyncio.run(self.pool.probe(self._send))
+                self._stop_probing.wait(self.pool.probe_interval)
+
+        if self._prober is None and len(self.pool.nodes) > 1:
+            self._prober = threading.Thread(target=probe_loop, name='xrpl-node-probe', daemon=True)
+            self._prober.start()
+
+    def close(self):
+        self._stop_probing.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
 
 class XRPLClient:
     def __init__(self, network: str = 'testnet'):
-        self.network_urls = {
-            'mainnet': 'https://s1.ripple.com:51234/',
-            'testnet': 'https://s.altnet.rippletest.net:51234/',
-            'devnet': 'https://s.devnet.rippletest.net:51234/'
+        self.websocket_urls = {
+            'mainnet': 'wss://s1.ripple.com/',
+            'testnet': 'wss://s.altnet.rippletest.net:51233/',
+            'devnet': 'wss://s.devnet.rippletest.net:51233/'
         }
-        self.client = JsonRpcClient(self.network_urls.get(network, self.network_urls['testnet']))
+        # XRPL_RPC_URL(S) / XRPL_WS_URL point at specific nodes, e.g. benchmarks/fake_rippled.py
+        self.nodes = NodePool(node_urls(network) or node_urls('testnet'))
+        ws_url = os.getenv('XRPL_WS_URL') or self.websocket_urls.get(network, self.websocket_urls['testnet'])
+        self.client = PooledJsonRpcClient(self.nodes)
+        self.client.start_probing()
+        self.balances = BalanceCache(
+            lambda address: get_balance(address, self.client) / DROPS_PER_XRP,
+            ws_url=ws_url,
+            max_size=int(os.getenv('BALANCE_CACHE_SIZE', '10000'))
+        )
+        self.sequences = SequenceAllocator(
+            lambda address: get_next_valid_seq_number(address, self.client, ledger_index='current')
+        )
+        self.wallets = WalletPool()
+
+    def close(self):
+        self.wallets.close()
+        self.client.close()
 
     def create_wallet(self) -> Dict[str, str]:
-        wallet = Wallet.create()
+        wallet = self.wallets.acquire()
         return {
             'address': wallet.classic_address,
             'seed': wallet.seed
         }
 
+    @staticmethod
+    def wallet_from_seed(seed: str) -> Wallet:
+        """
+        Restore a wallet, deriving keys with the algorithm the seed encodes
+        """
+        return Wallet.from_seed(seed, algorithm=decode_seed(seed)[1])
+
     def get_balance(self, address: str) -> float:
-        # Implement balance retrieval logic
-        # This is a placeholder and needs actual XRPL implementation
-        return 0.0
+        return self.balances.get(address)
 
-    def send_transaction(self, sender_wallet: Wallet, recipient: str, amount: float) -> Dict[str, Any]:
+    def _submit_payment(self, sender_wallet: Wallet, recipient: str, drops: str):
+        account = sender_wallet.classic_address
+        sequence = self.sequences.allocate(account)
         payment = Payment(
-            account=sender_wallet.classic_address,
+            account=account,
             destination=recipient,
-            amount=str(int(amount * 1_000_000))  # Convert to drops
+            amount=drops,
+            sequence=sequence
         )
 
         try:
-            response = submit(payment, sender_wallet, self.client)
+            # Sequence is preset, so autofill only fills Fee and LastLedgerSequence
+            signed_payment = autofill_and_sign(transaction=payment, wallet=sender_wallet, client=self.client)
+            response = submit(transaction=signed_payment, client=self.client)
+        except Exception:
+            self.sequences.release(account, sequence)
+            raise
+
+        engine_result = response.result.get('engine_result', '')
+        if engine_result in RESYNC_ENGINE_RESULTS:
+            self.sequences.resync(account)
+        elif engine_result[:3] in ('tef', 'tem', 'tel'):
+            # Rejected before reaching the ledger, the Sequence was not consumed
+            self.sequences.release(account, sequence)
+        return response
+
+    def send_transaction(self, sender_wallet: Wallet, recipient: str, amount: float) -> Dict[str, Any]:
+        """
+        Submit an XRP payment
+
+        A 'success' status only means rippled accepted the payment for
+        consensus; its final result is known once validated (see
+        get_validated_result).
+
+        :param amount: Amount in XRP
+        :return: status, transaction_hash, engine_result, amount_drops and
+            last_ledger_sequence on success; status and message otherwise
+        """
+        try:
+            drops = xrp_to_drops(Decimal(str(amount)))
+            response = self._submit_payment(sender_wallet, recipient, drops)
+            if response.result.get('engine_result') == 'tefPAST_SEQ':
+                # Definitively rejected, safe to retry once with a fresh Sequence
+                response = self._submit_payment(sender_wallet, recipient, drops)
+
+            engine_result = response.result.get('engine_result', '')
+            if engine_result == 'tefPAST_SEQ':
+                return {
+                    'status': 'error',
+                    'message': 'Sequence out of sync (tefPAST_SEQ), please retry'
+                }
+            if engine_result[:3] in ('tef', 'tem', 'tel'):
+                # Never reaches a ledger
+                return {
+                    'status': 'error',
+                    'message': f"Payment rejected: {engine_result} {response.result.get('engine_result_message', '')}".rstrip()
+                }
+            tx_json = response.result['tx_json']
             return {
                 'status': 'success',
-                'transaction_hash': response.result['tx_json']['hash']
+                'transaction_hash': tx_json['hash'],
+                'engine_result': engine_result,
+                'amount_drops': int(drops),
+                'last_ledger_sequence': tx_json.get('LastLedgerSequence')
             }
         except Exception as e:
             return {
@@ -44,6 +215,91 @@ class XRPLClient:
                 'message': str(e)
             }
 
-    def get_transaction_history(self, address: str) -> list:
-        # Implement transaction history retrieval
-        return []
+    def prepare_payments(
+        self,
+        account: str,
+        payments: Sequence[Tuple[str, str]],
+        ledger_offset: int = 20
+    ) -> List[Payment]:
+        """
+        Build fully autofilled Payments for offline signing
+
+        Fee and LastLedgerSequence are fetched once for the whole batch and
+        Sequences come from the allocator, so no per-transaction round trips.
+
+        :param account: Sending account
+        :param payments: (destination, amount in drops) pairs
+        :param ledger_offset: Ledgers after the latest validated one before the batch expires
+        :return: Payments ready for SigningService.sign_batch
+        """
+        fee = get_fee(self.client)
+        last_ledger_sequence = get_latest_validated_ledger_sequence(self.client) + ledger_offset
+        return [
+            Payment(
+                account=account,
+                destination=destination,
+                amount=drops,
+                sequence=self.sequences.allocate(account),
+                fee=fee,
+                last_ledger_sequence=last_ledger_sequence
+            )
+            for destination, drops in payments
+        ]
+
+    def submit_blob(self, tx_blob: str, account: Optional[str] = None):
+        """
+        Submit a transaction signed elsewhere
+
+        :param tx_blob: Serialized signed transaction
+        :param account: Sender, to resync its Sequence on tefPAST_SEQ/terPRE_SEQ
+        """
+        response = self.client.request(SubmitOnly(tx_blob=tx_blob))
+        if account and response.result.get('engine_result') in RESYNC_ENGINE_RESULTS:
+            self.sequences.resync(account)
+        return response
+
+    def get_validated_result(self, tx_hash: str) -> Optional[str]:
+        """
+        Final TransactionResult of a transaction, once it is in a validated ledger
+
+        :param tx_hash: Transaction hash
+        :return: e.g. 'tesSUCCESS' or a tec code; None while not (yet) validated
+        """
+        response = self.client.request(Tx(transaction=tx_hash))
+        if not response.is_successful() or not response.result.get('validated'):
+            return None
+        return response.result.get('meta', {}).get('TransactionResult')
+
+    def get_validated_ledger_index(self) -> int:
+        return get_latest_validated_ledger_sequence(self.client)
+
+    def get_transaction_history(
+        self,
+        address: str,
+        ledger_index_min: int = -1,
+        page_size: int = 400
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Walk account_tx oldest-first, following markers page by page
+
+        :param address: Account whose history to fetch
+        :param ledger_index_min: First ledger to include (-1 for the earliest available)
+        :param page_size: Transactions requested per account_tx call
+        :return: Iterator over raw account_tx result pages
+        """
+        marker = None
+        while True:
+            response = self.client.request(AccountTx(
+                account=address,
+                ledger_index_min=ledger_index_min,
+                ledger_index_max=-1,
+                forward=True,
+                limit=page_size,
+                marker=marker
+            ))
+            if not response.is_successful():
+                raise TransactionException(response.result.get('error_message') or response.result.get('error'))
+            yield response.result
+            marker = response.result.get('marker')
+            if marker is None:
+                break
@@ -0,0 +1,27 @@
+import asyncio
+
+from .database import async_engine, engine
+# Every model module registers its tables on the shared Base
+from .models import activity, rewards, stats, token, transaction  # noqa: F401
+from .models.user import Base
+
+def run_migrations(bind=engine):
+    """
+    Create any missing tables
+
+    Run once per deploy as a release step (python -m src.migrations)
+    rather than on every worker import.
+    """
+    Base.metadata.create_all(bind=bind)
+
+async def run_migrations_async():
+    """
+    Same as run_migrations on the async engine, for the startup hook
+    """
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+if __name__ == "__main__":
+    run_migrations()
+    asyncio.run(async_engine.dispose())
+    print("Database schema up to date")
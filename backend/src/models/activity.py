@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+
+from .user import Base
+
+class ActivityEvent(Base):
+    __tablename__ = 'activity_events'
+
+    # Append-only; seq is the tail watermark, event_id the id clients see
+    # Also written by the eon_xrp mint workers (src/eon_xrp/activity.py)
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(String, unique=True, nullable=False)
+    occurred_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    action = Column(String, nullable=False)
+    username = Column(String, nullable=True)
+    detail = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<ActivityEvent {self.action} {self.username} @{self.occurred_at}>"
@@ -0,0 +1,65 @@
+from sqlalchemy import Column, Boolean, Integer, BigInteger, String, Text, DateTime, ForeignKey
+from datetime import datetime
+
+from .user import Base
+
+class RewardDistribution(Base):
+    __tablename__ = 'reward_distributions'
+
+    id = Column(String, primary_key=True)
+    status = Column(String, nullable=False, default='running')
+    # sha256 over recipients and weights; a resume must present the same input
+    input_digest = Column(String, nullable=False)
+    # Recipient file name, relative to REWARD_EXPORT_DIR
+    source_path = Column(String, nullable=True)
+    weight_field = Column(String, nullable=True)
+    weight_scale = Column(BigInteger, nullable=False, default=1)
+    pool_drops = Column(BigInteger, nullable=False)
+    # Drawn from the community pool counter rather than an explicit amount
+    from_pool = Column(Boolean, nullable=False, default=False)
+    # Actually paid out, set on completion (tec failures are carried instead)
+    delivered_drops = Column(BigInteger, nullable=True)
+    min_payout_drops = Column(BigInteger, nullable=False)
+    batch_size = Column(Integer, nullable=False)
+    recipients = Column(Integer, nullable=False)
+    recipients_paid = Column(Integer, nullable=False, default=0)
+    distributed_drops = Column(BigInteger, nullable=False, default=0)
+    carried_drops = Column(BigInteger, nullable=False, default=0)
+    remainder_drops = Column(BigInteger, nullable=False, default=0)
+    batches_total = Column(Integer, nullable=False, default=0)
+    batches_done = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+    # 1 until the distribution completes or is cancelled, then NULL; unique,
+    # so at most one distribution is unfinished and the carry balances a
+    # resume plans from cannot change under it
+    active = Column(Integer, unique=True, nullable=True, default=1)
+
+class RewardBatch(Base):
+    __tablename__ = 'reward_batches'
+
+    distribution_id = Column(String, ForeignKey('reward_distributions.id'), primary_key=True)
+    batch_index = Column(Integer, primary_key=True)
+    status = Column(String, nullable=False)
+    # JSON lists aligned with the batch's payees: signed blobs and engine results
+    tx_blobs = Column(Text, nullable=False)
+    engine_results = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class RewardCarry(Base):
+    __tablename__ = 'reward_carry'
+
+    # Drops owed to an address that were below the payout threshold
+    address = Column(String, primary_key=True)
+    drops = Column(BigInteger, nullable=False, default=0)
+
+class RewardPoolCredit(Base):
+    __tablename__ = 'reward_pool_credits'
+
+    # Funding added to the community reward pool
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    drops = Column(BigInteger, nullable=False)
+    note = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
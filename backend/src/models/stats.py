@@ -0,0 +1,68 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, update
+from sqlalchemy.dialects import postgresql, sqlite
+from datetime import datetime
+
+from .user import Base
+
+class PlatformStats(Base):
+    __tablename__ = 'platform_stats'
+
+    # Single-row table, maintained incrementally by services.platform_stats
+    id = Column(Integer, primary_key=True, default=1)
+    total_users = Column(BigInteger, nullable=False, default=0)
+    total_tokens = Column(BigInteger, nullable=False, default=0)
+    total_volume_drops = Column(BigInteger, nullable=False, default=0)
+    community_reward_pool_drops = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    reconciled_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<PlatformStats users={self.total_users} tokens={self.total_tokens}>"
+
+class PlatformPayment(Base):
+    __tablename__ = 'platform_payments'
+
+    # Payments sent through /transaction/send; only validated tesSUCCESS
+    # ones count towards total_volume_drops
+    tx_hash = Column(String, primary_key=True)
+    sender = Column(String, nullable=False)
+    recipient = Column(String, nullable=False)
+    drops = Column(BigInteger, nullable=False)
+    last_ledger_sequence = Column(Integer, nullable=True)
+    # Final TransactionResult, NULL until settled
+    result = Column(String, nullable=True, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    settled_at = Column(DateTime, nullable=True)
+
+STATS_ROW_ID = 1
+
+_UPSERT_INSERTS = {
+    'postgresql': postgresql.insert,
+    'sqlite': sqlite.insert,
+}
+
+def stats_increment(dialect_name: str, **deltas):
+    """
+    Statement adding deltas to the stats row, creating the row if missing
+
+    A single atomic INSERT ... ON CONFLICT DO UPDATE, safe under concurrent
+    writers without row locks. Shared with the eon_xrp mint workers.
+
+    :param dialect_name: Session bind's dialect, e.g. 'postgresql' or 'sqlite'
+    :param deltas: PlatformStats column -> amount to add
+    """
+    values = {name: delta for name, delta in deltas.items() if delta}
+    dialect_insert = _UPSERT_INSERTS.get(dialect_name)
+    if dialect_insert is None:
+        # No portable upsert; relies on the row being seeded
+        return update(PlatformStats).where(PlatformStats.id == STATS_ROW_ID).values(
+            **{name: getattr(PlatformStats, name) + delta for name, delta in values.items()}
+        )
+    statement = dialect_insert(PlatformStats).values(id=STATS_ROW_ID, **values)
+    return statement.on_conflict_do_update(
+        index_elements=[PlatformStats.id],
+        set_={
+            **{name: getattr(PlatformStats, name) + statement.excluded[name] for name in values},
+            'updated_at': datetime.utcnow(),
+        }
+    )
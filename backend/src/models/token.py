@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Index
+from datetime import datetime
+
+from .user import Base
+
+class RegisteredToken(Base):
+    __tablename__ = 'token_registry'
+
+    # Rows are added by the eon_xrp mint workers (src/eon_xrp/registry.py)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # 'meme_token' or 'nft_collection'
+    symbol = Column(String, nullable=False, index=True)
+    name = Column(String, nullable=False)
+    creator = Column(String, nullable=False, index=True)
+    tx_hash = Column(String, unique=True, nullable=True)
+    uri_slug = Column(String, nullable=False)
+    # Validated ledger at submission time
+    ledger_index = Column(Integer, nullable=True)
+    # Traded volume; nothing settles token trades yet, so it stays 0
+    volume_drops = Column(BigInteger, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Keyset pagination index; id breaks ties
+    __table_args__ = (
+        Index('ix_token_registry_created', 'created_at', 'id'),
+    )
+
+    def __repr__(self):
+        return f"<RegisteredToken {self.symbol} by {self.creator}>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+
+from .user import Base
+
+class AccountTransaction(Base):
+    __tablename__ = 'account_transactions'
+
+    # The composite primary key doubles as the keyset pagination index
+    account = Column(String, primary_key=True)
+    ledger_index = Column(Integer, primary_key=True)
+    tx_index = Column(Integer, primary_key=True)
+    tx_hash = Column(String, index=True)
+    tx_type = Column(String)
+    tx_json = Column(Text)
+
+    def __repr__(self):
+        return f"<AccountTransaction {self.account} {self.ledger_index}:{self.tx_index}>"
+
+class AccountSyncState(Base):
+    __tablename__ = 'account_sync_state'
+
+    account = Column(String, primary_key=True)
+    high_water_ledger = Column(Integer, nullable=False, default=0)
+    synced_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<AccountSyncState {self.account} @{self.high_water_ledger}>"
@@ -18,3 +18,18 @@ class User(Base):
 
     def __repr__(self):
         return f"<User {self.username}>"
+
+class TokenRevocation(Base):
+    __tablename__ = 'token_revocations'
+
+    # Bumped to revoke every token issued to the user; tokens carry the
+    # version current at login in their "ver" claim
+    username = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class RevokedToken(Base):
+    __tablename__ = 'revoked_tokens'
+
+    # Single revoked access tokens, kept until they would have expired anyway
+    jti = Column(String, primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
@@ -1,8 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Dict
+import asyncio
+import json
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Dict, Optional
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 
-admin_router = APIRouter(prefix="/admin", tags=["admin"])
+from ..database import AsyncSessionLocal, SessionLocal, get_async_db
+from ..integrations.clients import get_signing_service, get_xrpl_client
+from ..models.rewards import RewardDistribution
+from ..models.stats import PlatformStats as PlatformStatsRow
+from ..services.activity_feed import activity_feed
+from ..services.auth import get_current_admin
+from ..services.platform_stats import DROPS_PER_XRP, STATS_ROW_ID, get_platform_stats as read_platform_stats
+from ..services.reward_distribution import (
+    REWARD_BATCH_SIZE,
+    REWARD_MIN_PAYOUT_DROPS,
+    REWARD_WEIGHT_SCALE,
+    RewardDistributor,
+    credit_reward_pool,
+    dry_run_report,
+    load_recipients_ndjson,
+    recipients_from_pairs,
+    resolve_export_path,
+)
+from ..services.token_registry import list_registered_tokens
+from ..utils.metrics import InstrumentedRoute
+from ..utils.response_cache import response_cache
+
+TOKENS_CACHE_TTL = float(os.getenv('TOKENS_CACHE_TTL', '30'))
+# The feed is served from memory; the cache only coalesces bursts
+ACTIVITIES_CACHE_TTL = float(os.getenv('ACTIVITIES_CACHE_TTL', '1'))
+
+# Every admin route requires a superuser token
+admin_router = APIRouter(
+    prefix="/admin",
+    tags=["admin"],
+    route_class=InstrumentedRoute,
+    dependencies=[Depends(get_current_admin)]
+)
 
 class PlatformStats(BaseModel):
     total_users: int
@@ -11,68 +48,84 @@ class PlatformStats(BaseModel):
     community_reward_pool: float
 
 class TokenInfo(BaseModel):
+    cursor: str
+    id: int
+    kind: str
     symbol: str
     name: str
     creator: str
+    tx_hash: Optional[str]
+    uri_slug: str
+    ledger_index: Optional[int]
     volume: float
+    created_at: str
 
 class UserActivity(BaseModel):
-    username: str
-    recent_action: str
-    timestamp: str
+    id: str
+    action: str
+    username: Optional[str]
+    occurred_at: str
+    detail: Dict
 
 @admin_router.get("/stats", response_model=PlatformStats)
-async def get_platform_stats():
+async def get_platform_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve comprehensive platform statistics
+
+    Served from the incrementally maintained aggregate row, so the cost
+    does not grow with the size of the underlying tables.
     """
-    # Placeholder implementation - replace with actual database queries
-    return PlatformStats(
-        total_users=1250,
-        total_tokens=87,
-        total_volume=523_456.78,
-        community_reward_pool=45_678.90
-    )
+    return PlatformStats(**await read_platform_stats(db))
 
 @admin_router.get("/tokens", response_model=List[TokenInfo])
-async def list_tokens():
-    """
-    Retrieve list of tokens created on the platform
-    """
-    # Placeholder implementation
-    return [
-        TokenInfo(
-            symbol="MEME1",
-            name="First Meme Token",
-            creator="user123",
-            volume=45_678.90
-        ),
-        TokenInfo(
-            symbol="DOGE2",
-            name="Community Doge",
-            creator="user456",
-            volume=23_456.78
-        )
-    ]
+async def list_tokens(
+    request: Request,
+    sort: str = 'recent',
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    creator: Optional[str] = None
+):
+    """
+    Retrieve tokens and NFT collections created on the platform
+
+    Newest first (sort='recent'); pass the cursor of the last row to get
+    the next page.
+    """
+    async def tokens():
+        # Own session: the result is shared with coalesced requests
+        async with AsyncSessionLocal() as db:
+            try:
+                return await list_registered_tokens(db, sort=sort, cursor=cursor, limit=limit, creator=creator)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+    return await response_cache.serve(request, tokens, ttl=TOKENS_CACHE_TTL)
 
 @admin_router.get("/user-activities", response_model=List[UserActivity])
-async def get_recent_activities():
-    """
-    Retrieve recent user activities
-    """
-    # Placeholder implementation
-    return [
-        UserActivity(
-            username="CryptoKing",
-            recent_action="Created MEME1 Token",
-            timestamp="2 minutes ago"
-        ),
-        UserActivity(
-            username="BlockchainQueen",
-            recent_action="Traded 1000 DOGE2",
-            timestamp="15 minutes ago"
-        )
-    ]
+async def get_recent_activities(request: Request, limit: int = 50, before: Optional[str] = None):
+    """
+    Retrieve recent user activities, newest first
+
+    Served from the in-memory ring of recent events; pages older than the
+    ring (before = id of the oldest event shown) come from activity_events.
+    """
+    async def activities():
+        async with AsyncSessionLocal() as db:
+            return await activity_feed.page(db, limit=max(1, min(limit, 200)), before=before)
+    return await response_cache.serve(request, activities, ttl=ACTIVITIES_CACHE_TTL)
+
+@admin_router.get("/user-activities/stream")
+async def stream_activities(request: Request):
+    """
+    Server-Sent Events stream of user activities as they happen
+
+    Reconnecting clients send Last-Event-ID and get the events they missed,
+    as long as those are still in the ring.
+    """
+    async def events():
+        async for event in activity_feed.subscribe(request.headers.get('last-event-id')):
+            yield f"id: {event['id']}\nevent: activity\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
 
 @admin_router.post("/tokens/create")
 async def create_platform_token(token_details: Dict):
@@ -82,10 +135,175 @@ async def create_platform_token(token_details: Dict):
     # Implement token creation logic
     return {"status": "success", "message": "Token created successfully"}
 
+class RewardRecipient(BaseModel):
+    address: str
+    weight: float
+
+class RewardDistributionRequest(BaseModel):
+    # NDJSON file name inside REWARD_EXPORT_DIR, e.g. a community export
+    source_file: Optional[str] = None
+    recipients: Optional[List[RewardRecipient]] = None
+    weight_field: str = 'contribution_score'
+    weight_scale: int = REWARD_WEIGHT_SCALE
+    pool_drops: Optional[int] = None
+    min_payout_drops: int = REWARD_MIN_PAYOUT_DROPS
+    batch_size: int = REWARD_BATCH_SIZE
+    dry_run: bool = True
+
+class RewardPoolCreditRequest(BaseModel):
+    drops: int
+    note: Optional[str] = None
+
+def _load_recipients(request: RewardDistributionRequest):
+    if request.source_file:
+        return load_recipients_ndjson(resolve_export_path(request.source_file), request.weight_field, request.weight_scale)
+    if request.recipients:
+        return recipients_from_pairs(((r.address, r.weight) for r in request.recipients), request.weight_scale)
+    raise ValueError("Provide source_file or recipients")
+
+def _distribution_status(distribution: RewardDistribution) -> Dict:
+    return {
+        'distribution_id': distribution.id,
+        'status': distribution.status,
+        'recipients': distribution.recipients,
+        'recipients_paid': distribution.recipients_paid,
+        'distributed_drops': distribution.distributed_drops,
+        'carried_drops': distribution.carried_drops,
+        'remainder_drops': distribution.remainder_drops,
+        'batches_total': distribution.batches_total,
+        'batches_done': distribution.batches_done,
+        'error': distribution.error,
+    }
+
+def _run_distribution(distribution_id: str, recipients):
+    with SessionLocal() as db:
+        RewardDistributor(get_xrpl_client(), get_signing_service()).run(db, distribution_id, recipients)
+
+def _plan_distribution(request: RewardDistributionRequest):
+    recipients = _load_recipients(request)
+    with SessionLocal() as db:
+        pool_drops = request.pool_drops
+        from_pool = pool_drops is None
+        if from_pool:
+            stats = db.get(PlatformStatsRow, STATS_ROW_ID)
+            pool_drops = stats.community_reward_pool_drops if stats else 0
+        if request.dry_run:
+            return {'status': 'dry_run', **dry_run_report(db, recipients, pool_drops, request.min_payout_drops, request.batch_size)}, None
+        allocation = RewardDistributor.plan(db, recipients, pool_drops, request.min_payout_drops)
+        distribution = RewardDistributor.create(
+            db, recipients, allocation, request.min_payout_drops, request.batch_size,
+            source_file=request.source_file,
+            weight_field=request.weight_field,
+            weight_scale=request.weight_scale,
+            from_pool=from_pool
+        )
+        summary = {**_distribution_status(distribution), 'amount_distributed': allocation.summary(request.batch_size)['amount_distributed']}
+        return summary, recipients
+
+@admin_router.post("/community-rewards/pool")
+async def credit_community_reward_pool(request: RewardPoolCreditRequest):
+    """
+    Fund the community reward pool
+
+    Distributions without an explicit pool_drops pay out of this pool and
+    debit what they deliver.
+    """
+    def credit():
+        with SessionLocal() as db:
+            return credit_reward_pool(db, request.drops, request.note)
+
+    try:
+        pool_drops = await asyncio.get_running_loop().run_in_executor(None, credit)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {'community_reward_pool': pool_drops / DROPS_PER_XRP, 'pool_drops': pool_drops}
+
 @admin_router.post("/community-rewards/distribute")
-async def distribute_community_rewards():
+async def distribute_community_rewards(request: RewardDistributionRequest):
     """
     Distribute rewards from community pool
+
+    Shares are pro rata by weight in exact integer drops. With dry_run (the
+    default) only the totals are returned; otherwise the payout runs in the
+    background in checkpointed batches and can be followed or resumed by id.
+    Returns 409 while another distribution is unfinished.
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        result, recipients = await loop.run_in_executor(None, _plan_distribution, request)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if recipients is not None:
+        loop.run_in_executor(None, _run_distribution, result['distribution_id'], recipients)
+    return result
+
+@admin_router.get("/community-rewards/distributions/{distribution_id}")
+async def get_reward_distribution(distribution_id: str, db: AsyncSession = Depends(get_async_db)):
+    distribution = await db.get(RewardDistribution, distribution_id)
+    if distribution is None:
+        raise HTTPException(status_code=404, detail="Distribution not found")
+    return _distribution_status(distribution)
+
+@admin_router.post("/community-rewards/distributions/{distribution_id}/resume")
+async def resume_reward_distribution(distribution_id: str, request: Optional[RewardDistributionRequest] = None):
+    """
+    Continue an interrupted distribution; already submitted payments are not repeated
+
+    Recipients are reloaded from the original source_file unless given
+    again. Returns 409 while another run holds the distribution.
+    """
+    def claim():
+        with SessionLocal() as db:
+            distribution = db.get(RewardDistribution, distribution_id)
+            if distribution is None:
+                raise LookupError("Distribution not found")
+            if request and (request.recipients or request.source_file):
+                recipients = _load_recipients(request)
+            elif not distribution.source_path:
+                raise ValueError("Distribution was created from inline recipients; send them again")
+            else:
+                recipients = load_recipients_ndjson(
+                    resolve_export_path(distribution.source_path), distribution.weight_field, distribution.weight_scale
+                )
+            if not RewardDistributor.claim(db, distribution_id):
+                raise RuntimeError(f"Distribution is {distribution.status}, not interrupted")
+            return recipients
+
+    loop = asyncio.get_running_loop()
+    try:
+        recipients = await loop.run_in_executor(None, claim)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    loop.run_in_executor(None, _run_distribution, distribution_id, recipients)
+    return {'status': 'resumed', 'distribution_id': distribution_id}
+
+@admin_router.post("/community-rewards/distributions/{distribution_id}/cancel")
+async def cancel_reward_distribution(distribution_id: str):
     """
-    # Implement reward distribution logic
-    return {"status": "success", "amount_distributed": 5000}
+    Cancel an interrupted distribution that has not signed any payment yet
+
+    Only one distribution can be unfinished at a time; this frees the slot.
+    Returns 409 once payments were signed, as those must be resumed instead.
+    """
+    def cancel():
+        with SessionLocal() as db:
+            distribution = db.get(RewardDistribution, distribution_id)
+            if distribution is None:
+                raise LookupError("Distribution not found")
+            if not RewardDistributor.cancel(db, distribution_id):
+                raise RuntimeError(f"Distribution is {distribution.status} or has signed payments; resume it instead")
+
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(None, cancel)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {'status': 'cancelled', 'distribution_id': distribution_id}
@@ -0,0 +1,263 @@
+import asyncio
+import json
+import os
+import queue
+import threading
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import AsyncSessionLocal
+from ..models.activity import ActivityEvent
+from ..utils.logger import logger
+
+# Latest events kept in memory per worker (the hot tier)
+ACTIVITY_BUFFER_SIZE = int(os.getenv('ACTIVITY_BUFFER_SIZE', '1000'))
+ACTIVITY_FLUSH_INTERVAL = float(os.getenv('ACTIVITY_FLUSH_INTERVAL', '0.5'))
+# Events waiting for the table; beyond this they are dropped, not waited on
+ACTIVITY_MAX_PENDING = int(os.getenv('ACTIVITY_MAX_PENDING', '10000'))
+# How often each worker picks up events written by other processes
+ACTIVITY_TAIL_INTERVAL = float(os.getenv('ACTIVITY_TAIL_INTERVAL', '1'))
+# seq values re-read behind the watermark, for transactions that committed out of order
+ACTIVITY_TAIL_LOOKBACK = int(os.getenv('ACTIVITY_TAIL_LOOKBACK', '200'))
+
+def _event_from_row(row: ActivityEvent) -> Dict[str, Any]:
+    return {
+        'id': row.event_id,
+        'action': row.action,
+        'username': row.username,
+        'occurred_at': row.occurred_at.isoformat(),
+        'detail': json.loads(row.detail) if row.detail else {},
+    }
+
+class ActivityFeed:
+    """
+    Platform activity: a ring buffer of the latest events per worker, backed
+    by the append-only activity_events table
+
+    publish() never waits on the database: the event goes into the ring, out
+    to live subscribers and onto a queue that a background task writes in
+    batches. The same task tails the table, so events written by other
+    workers (or by the eon_xrp mint workers) reach this worker's ring too.
+    """
+
+    def __init__(
+        self,
+        capacity: int = ACTIVITY_BUFFER_SIZE,
+        flush_interval: float = ACTIVITY_FLUSH_INTERVAL,
+        max_pending: int = ACTIVITY_MAX_PENDING,
+        tail_interval: float = ACTIVITY_TAIL_INTERVAL,
+        tail_lookback: int = ACTIVITY_TAIL_LOOKBACK
+    ):
+        """
+        :param capacity: Events kept in the ring buffer
+        :param flush_interval: Seconds between batched table writes
+        :param max_pending: Unwritten events kept before new ones are dropped
+        :param tail_interval: Seconds between reads of other processes' events
+        :param tail_lookback: seq values re-read behind the watermark
+        """
+        self.flush_interval = flush_interval
+        self.tail_interval = tail_interval
+        self.tail_lookback = tail_lookback
+        self.dropped = 0
+        self._ring: deque = deque(maxlen=capacity)
+        # Ids recently admitted to the ring, so tailing skips them
+        self._seen: 'OrderedDict[str, None]' = OrderedDict()
+        self._seen_limit = capacity * 4
+        self._pending: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watermark = 0
+
+    def publish(self, action: str, username: Optional[str] = None, **detail) -> Dict[str, Any]:
+        """
+        Record an event without blocking; safe from any thread
+
+        :param action: Event type, e.g. 'register', 'login', 'transaction'
+        :param username: Acting user, if known
+        :param detail: JSON-serializable event fields
+        :return: The event as served to clients
+        """
+        occurred_at = datetime.utcnow()
+        event = {
+            'id': uuid.uuid4().hex,
+            'action': action,
+            'username': username,
+            'occurred_at': occurred_at.isoformat(),
+            'detail': detail,
+        }
+        self._admit(event)
+        try:
+            self._pending.put_nowait({
+                'event_id': event['id'],
+                'occurred_at': occurred_at,
+                'action': action,
+                'username': username,
+                'detail': json.dumps(detail),
+            })
+        except queue.Full:
+            # Still in the ring and the live stream, just not persisted
+            self.dropped += 1
+        return event
+
+    def _admit(self, event: Dict[str, Any]):
+        with self._lock:
+            self._ring.append(event)
+            self._seen[event['id']] = None
+            while len(self._seen) > self._seen_limit:
+                self._seen.popitem(last=False)
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._fan_out, event)
+
+    def _fan_out(self, event: Dict[str, Any]):
+        for subscriber in self._subscribers:
+            if not subscriber.full():
+                subscriber.put_nowait(event)
+
+    def recent(self, limit: int = 50, before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Newest events from the ring buffer
+
+        :param limit: Maximum number of events
+        :param before: Only events older than this event id
+        :return: Events newest-first; fewer than limit once the ring runs out
+        """
+        with self._lock:
+            events = list(self._ring)
+        events.reverse()
+        if before is not None:
+            ids = [event['id'] for event in events]
+            if before not in ids:
+                return []
+            events = events[ids.index(before) + 1:]
+        return events[:limit]
+
+    def _newer_than(self, event_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            events = list(self._ring)
+        ids = [event['id'] for event in events]
+        return events[ids.index(event_id) + 1:] if event_id in ids else []
+
+    def _known(self, event_id: str) -> bool:
+        with self._lock:
+            return event_id in self._seen
+
+    async def page(self, db: AsyncSession, limit: int = 50, before: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        One page of the feed, from the ring and then, past its end, from the table
+
+        :param db: Async session for the cold tier
+        :param limit: Page size
+        :param before: Id of the oldest event the client already has
+        """
+        events = self.recent(limit, before) if before is None or self._known(before) else []
+        if len(events) < limit:
+            # Ring order is arrival order, so the table may repeat a few of them
+            shown = {event['id'] for event in events}
+            oldest = events[-1]['id'] if events else before
+            events += [
+                event for event in await self._older(db, oldest, limit - len(events))
+                if event['id'] not in shown
+            ]
+        return events
+
+    @staticmethod
+    async def _older(db: AsyncSession, before: Optional[str], limit: int) -> List[Dict[str, Any]]:
+        query = select(ActivityEvent).order_by(ActivityEvent.seq.desc()).limit(limit)
+        if before is not None:
+            seq = (await db.execute(select(ActivityEvent.seq).where(ActivityEvent.event_id == before))).scalar()
+            if seq is None:
+                # Not written yet, or unknown
+                return []
+            query = query.where(ActivityEvent.seq < seq)
+        return [_event_from_row(row) for row in (await db.execute(query)).scalars()]
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield events as they are published, after replaying any the client missed
+
+        :param last_event_id: Resume after this event if it is still in the ring
+        """
+        updates: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._subscribers.add(updates)
+        try:
+            if last_event_id is not None:
+                for event in self._newer_than(last_event_id):
+                    yield event
+            while True:
+                yield await updates.get()
+        finally:
+            self._subscribers.discard(updates)
+
+    async def start(self):
+        """
+        Warm the ring from the table and start the writer/tail task
+        """
+        self._loop = asyncio.get_running_loop()
+        try:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(ActivityEvent).order_by(ActivityEvent.seq.desc()).limit(self._ring.maxlen)
+                )).scalars().all()
+            for row in reversed(rows):
+                self._admit(_event_from_row(row))
+            self._watermark = rows[0].seq if rows else 0
+        except Exception as e:
+            logger.error(f"Activity feed warm-up failed: {e}")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._flush()
+
+    async def _run(self):
+        next_tail = 0.0
+        while True:
+            try:
+                await self._flush()
+                if self._loop.time() >= next_tail:
+                    await self._tail()
+                    next_tail = self._loop.time() + self.tail_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Activity feed sync failed: {e}")
+            await asyncio.sleep(self.flush_interval)
+
+    async def _flush(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._pending.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(ActivityEvent), batch)
+            await db.commit()
+
+    async def _tail(self):
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(ActivityEvent)
+                .where(ActivityEvent.seq > self._watermark - self.tail_lookback)
+                .order_by(ActivityEvent.seq)
+                .limit(self.tail_lookback + self._ring.maxlen)
+            )).scalars().all()
+        for row in rows:
+            self._watermark = max(self._watermark, row.seq)
+            if not self._known(row.event_id):
+                self._admit(_event_from_row(row))
+
+activity_feed = ActivityFeed()
@@ -1,24 +1,48 @@
+import os
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
 
-from jose import jwt
-from passlib.context import CryptContext
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..models.user import User
+from ..database import get_async_db
+from ..models.user import RevokedToken, TokenRevocation, User
 from ..schemas.user import UserCreate
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from ..utils.cache import TTLCache
+from .platform_stats import record_stats_delta, record_stats_delta_async
+from .password_hashing import (
+    pwd_context,
+    verify_password,
+    get_password_hash,
+    verify_and_update,
+    get_password_hash_async,
+    verify_and_update_async,
+)
 
 SECRET_KEY = "YOUR_SECRET_KEY"  # Replace with secure secret
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+# Verified token -> (claims, user); entries never outlive the token's exp.
+# Revocations made by other workers take effect here within TOKEN_CACHE_TTL.
+_token_cache = TTLCache(
+    max_size=int(os.getenv('TOKEN_CACHE_SIZE', '10000')),
+    ttl=float(os.getenv('TOKEN_CACHE_TTL', '60'))
+)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -26,16 +50,145 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def _get_user(db: Session, username: str):
+    return db.query(User).filter(User.username == username).first()
+
+def _token_version(username: str):
+    return (
+        select(func.coalesce(func.max(TokenRevocation.version), 0))
+        .where(TokenRevocation.username == username)
+        .scalar_subquery()
+    )
+
+async def get_token_version(db: AsyncSession, username: str) -> int:
+    """
+    Version to embed in a new token's "ver" claim
+    """
+    return await db.scalar(select(_token_version(username)))
+
+async def revoke_token(db: AsyncSession, token: str):
+    """
+    Reject a single access token from now until it expires, on every worker
+    """
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM], options={"verify_exp": False})
+    except JWTError:
+        return
+    _token_cache.pop(token)
+    if "jti" not in claims:
+        return
+    now = datetime.utcnow()
+    expires_at = datetime.utcfromtimestamp(claims["exp"]) if "exp" in claims else now + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    # Prune entries for tokens that have expired on their own
+    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+    if await db.get(RevokedToken, claims["jti"]) is None:
+        db.add(RevokedToken(jti=claims["jti"], expires_at=expires_at))
+    await db.commit()
+
+async def revoke_user_tokens(db: AsyncSession, username: str):
+    """
+    Reject every access token issued to a user up to now, on every worker
+    """
+    updated = await db.execute(
+        update(TokenRevocation)
+        .where(TokenRevocation.username == username)
+        .values(version=TokenRevocation.version + 1)
+    )
+    if updated.rowcount == 0:
+        db.add(TokenRevocation(username=username, version=1))
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another worker created the row first; bump it instead
+        await db.rollback()
+        await revoke_user_tokens(db, username)
+        return
+    _token_cache.discard_where(lambda token, entry: entry[0].get("sub") == username)
+
+async def _get_user_async(db: AsyncSession, username: str):
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
+
+async def _load_token(db: AsyncSession, token: str):
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+    username = claims.get("sub")
+    if username is None:
+        return None
+    # User, current token version and jti revocation in one round trip
+    row = (await db.execute(
+        select(
+            User,
+            _token_version(username),
+            exists().where(RevokedToken.jti == claims.get("jti"))
+        ).where(User.username == username)
+    )).first()
+    if row is None:
+        return None
+    user, version, revoked = row
+    if revoked or claims.get("ver", 0) != version or not user.is_active:
+        return None
+    # Detach so the cached row outlives this request's session
+    db.expunge(user)
+    _token_cache.set(token, (claims, user), expires_at=claims["exp"])
+    return user
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)) -> User:
+    """
+    FastAPI dependency resolving the bearer token to its active user
+
+    Verified tokens are served from an in-memory LRU until they expire, so
+    only the first request with a given token pays for signature checks, the
+    user lookup and the revocation check.
+    """
+    entry = _token_cache.get(token)
+    if entry is not None:
+        return entry[1]
+    user = await _load_token(db, token)
+    if user is None:
+        raise _credentials_exception
+    return user
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    FastAPI dependency admitting only superusers
+    """
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
+
 def authenticate_user(db: Session, username: str, password: str):
-    user = db.query(User).filter(User.username == username).first()
+    user = _get_user(db, username)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update(password, user.hashed_password)
+    if not valid:
         return False
+    if new_hash:
+        # Stored hash used an outdated bcrypt cost, upgrade it while we have the password
+        user.hashed_password = new_hash
+        db.commit()
+    return user
+
+async def authenticate_user_async(db: AsyncSession, username: str, password: str):
+    """
+    authenticate_user with bcrypt verification offloaded to the hashing pool
+    """
+    user = await _get_user_async(db, username)
+    if not user:
+        return False
+    valid, new_hash = await verify_and_update_async(password, user.hashed_password)
+    if not valid:
+        return False
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
     return user
 
 def create_user(db: Session, user: UserCreate):
@@ -46,6 +199,23 @@ def create_user(db: Session, user: UserCreate):
         hashed_password=hashed_password
     )
     db.add(db_user)
+    record_stats_delta(db, total_users=1)
     db.commit()
     db.refresh(db_user)
     return db_user
+
+async def create_user_async(db: AsyncSession, user: UserCreate):
+    """
+    create_user with bcrypt hashing offloaded to the hashing pool
+    """
+    hashed_password = await get_password_hash_async(user.password)
+    db_user = User(
+        username=user.username,
+        email=user.email,
+        hashed_password=hashed_password
+    )
+    db.add(db_user)
+    await record_stats_delta_async(db, total_users=1)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from ..utils.process_pool import CPU_POOL_WORKERS, get_process_pool, shutdown_process_pool
+
+# bcrypt cost factor; hashes below it are upgraded on the next successful login
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+# Jobs allowed in flight per shared pool worker before callers wait for a slot
+PASSWORD_HASH_QUEUE_DEPTH = int(os.getenv('PASSWORD_HASH_QUEUE_DEPTH', '4'))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS
+)
+
+_slots: Optional[asyncio.Semaphore] = None
+
+def verify_password(plain_password, hashed_password):
+    return pwd_context.verify(plain_password, hashed_password)
+
+def get_password_hash(password):
+    return pwd_context.hash(password)
+
+def verify_and_update(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored cost is outdated
+
+    :return: (valid, new_hash) where new_hash is None unless a rehash was needed
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+def _get_slots() -> asyncio.Semaphore:
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(CPU_POOL_WORKERS * PASSWORD_HASH_QUEUE_DEPTH)
+    return _slots
+
+async def _run_in_pool(func, *args):
+    async with _get_slots():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_process_pool(), func, *args)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hash a password in the shared process pool
+    """
+    return await _run_in_pool(get_password_hash, password)
+
+async def verify_and_update_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify (and, if outdated, rehash) a password in the shared process pool
+    """
+    return await _run_in_pool(verify_and_update, plain_password, hashed_password)
+
+def shutdown_hash_pool():
+    """
+    Stop the shared worker processes hashing runs in
+    """
+    global _slots
+    shutdown_process_pool()
+    _slots = None
+
+def benchmark_bcrypt_rounds(rounds: Iterable[int] = (10, 11, 12, 13, 14), samples: int = 5) -> Dict[int, float]:
+    """
+    Measure single-core hashing time for candidate bcrypt costs
+
+    :param rounds: Cost factors to try
+    :param samples: Hashes timed per cost factor
+    :return: Mapping of cost factor to mean milliseconds per hash
+    """
+    results = {}
+    for cost in rounds:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=cost)
+        start = time.perf_counter()
+        for _ in range(samples):
+            context.hash("benchmark-password")
+        results[cost] = (time.perf_counter() - start) / samples * 1000
+    return results
+
+if __name__ == "__main__":
+    for cost, millis in benchmark_bcrypt_rounds().items():
+        print(f"bcrypt rounds={cost}: {millis:.1f} ms/hash, ~{1000 / millis * CPU_POOL_WORKERS:.0f} hashes/s with {CPU_POOL_WORKERS} workers")
@@ -0,0 +1,199 @@
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database import AsyncSessionLocal, SessionLocal
+from ..integrations.clients import get_xrpl_client
+from ..models.stats import STATS_ROW_ID, PlatformPayment, PlatformStats, stats_increment
+from ..models.user import User
+from ..utils.logger import logger
+
+if TYPE_CHECKING:
+    from ..integrations.xrpl_client import XRPLClient
+
+DROPS_PER_XRP = 1_000_000
+STATS_RECONCILE_INTERVAL = float(os.getenv('STATS_RECONCILE_INTERVAL', '3600'))
+# How long a send waits in the background for its payment to validate;
+# the reconciliation loop settles whatever is still pending after that
+PAYMENT_CONFIRM_TIMEOUT = float(os.getenv('PAYMENT_CONFIRM_TIMEOUT', '120'))
+PAYMENT_CONFIRM_POLL = float(os.getenv('PAYMENT_CONFIRM_POLL', '1'))
+# Final result recorded for a payment that expired unvalidated
+EXPIRED_RESULT = 'tefMAX_LEDGER'
+
+# Counter column -> builder of a scalar subquery recomputing it from source tables
+_reconcilers: Dict[str, Callable] = {}
+
+def register_reconciler(column: str, build_subquery: Callable):
+    """
+    Register the source-of-truth query used to correct drift in a counter
+
+    :param column: PlatformStats column name
+    :param build_subquery: Returns a scalar subquery producing the exact value
+    """
+    _reconcilers[column] = build_subquery
+
+register_reconciler('total_users', lambda: select(func.count()).select_from(User).scalar_subquery())
+register_reconciler('total_volume_drops', lambda: select(func.coalesce(func.sum(PlatformPayment.drops), 0)).where(
+    PlatformPayment.result == 'tesSUCCESS'
+).scalar_subquery())
+
+def record_stats_delta(db: Session, **deltas):
+    """
+    Queue counter increments in the caller's transaction (committed by the caller)
+
+    :param db: Sync database session
+    :param deltas: PlatformStats column -> amount to add
+    """
+    if any(deltas.values()):
+        db.execute(stats_increment(db.get_bind().dialect.name, **deltas))
+
+async def record_stats_delta_async(db: AsyncSession, **deltas):
+    """
+    Async variant of record_stats_delta
+    """
+    if any(deltas.values()):
+        await db.execute(stats_increment(db.get_bind().dialect.name, **deltas))
+
+def record_payment(db: Session, tx_hash: str, sender: str, recipient: str, drops: int, last_ledger_sequence: Optional[int]):
+    """
+    Track a submitted payment until it settles (committed by the caller)
+
+    :param last_ledger_sequence: Ledger after which the payment can no longer validate
+    """
+    db.add(PlatformPayment(
+        tx_hash=tx_hash,
+        sender=sender,
+        recipient=recipient,
+        drops=drops,
+        last_ledger_sequence=last_ledger_sequence
+    ))
+
+def settle_payment(db: Session, tx_hash: str, result: str) -> bool:
+    """
+    Record a payment's final result, adding it to the volume on tesSUCCESS
+
+    Only the first settlement of a payment counts, so concurrent confirmers
+    never add its volume twice.
+
+    :param result: Validated TransactionResult, or EXPIRED_RESULT
+    :return: Whether this call settled the payment
+    """
+    settled = db.execute(
+        update(PlatformPayment)
+        .where(PlatformPayment.tx_hash == tx_hash, PlatformPayment.result.is_(None))
+        .values(result=result, settled_at=datetime.utcnow())
+    ).rowcount
+    if settled and result == 'tesSUCCESS':
+        drops = db.execute(select(PlatformPayment.drops).where(PlatformPayment.tx_hash == tx_hash)).scalar_one()
+        record_stats_delta(db, total_volume_drops=drops)
+    db.commit()
+    return bool(settled)
+
+def confirm_payments(
+    xrpl_client: 'XRPLClient',
+    tx_hashes: Iterable[str],
+    timeout: float = PAYMENT_CONFIRM_TIMEOUT,
+    poll: float = PAYMENT_CONFIRM_POLL
+):
+    """
+    Settle payments as they reach a validated ledger or expire
+
+    :param tx_hashes: Payments recorded with record_payment
+    :param timeout: Seconds to keep polling; unsettled payments stay pending
+    :param poll: Seconds between polls
+    """
+    pending = set(tx_hashes)
+    deadline = time.monotonic() + timeout
+    with SessionLocal() as db:
+        while pending:
+            rows = db.execute(
+                select(PlatformPayment.tx_hash, PlatformPayment.last_ledger_sequence)
+                .where(PlatformPayment.tx_hash.in_(pending), PlatformPayment.result.is_(None))
+            ).all()
+            pending = {tx_hash for tx_hash, _ in rows}
+            validated_ledger = None
+            for tx_hash, last_ledger_sequence in rows:
+                result = xrpl_client.get_validated_result(tx_hash)
+                if result is None and last_ledger_sequence is not None:
+                    if validated_ledger is None:
+                        validated_ledger = xrpl_client.get_validated_ledger_index()
+                    if validated_ledger > last_ledger_sequence:
+                        # Past its last ledger; look once more in case it validated meanwhile
+                        result = xrpl_client.get_validated_result(tx_hash) or EXPIRED_RESULT
+                if result is not None:
+                    settle_payment(db, tx_hash, result)
+                    pending.discard(tx_hash)
+            if not pending or time.monotonic() >= deadline:
+                return
+            time.sleep(poll)
+
+def settle_pending_payments(older_than: float = PAYMENT_CONFIRM_TIMEOUT):
+    """
+    One settlement pass over payments whose background confirmation gave up or was lost
+    """
+    with SessionLocal() as db:
+        stale = db.execute(
+            select(PlatformPayment.tx_hash).where(
+                PlatformPayment.result.is_(None),
+                PlatformPayment.created_at < datetime.utcnow() - timedelta(seconds=older_than)
+            )
+        ).scalars().all()
+    if stale:
+        confirm_payments(get_xrpl_client(), stale, timeout=0)
+
+async def ensure_stats_row(db: AsyncSession):
+    if await db.get(PlatformStats, STATS_ROW_ID) is None:
+        try:
+            await db.execute(insert(PlatformStats).values(id=STATS_ROW_ID))
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+
+async def get_platform_stats(db: AsyncSession) -> Dict[str, float]:
+    """
+    Read the materialized aggregates (a single primary-key lookup)
+    """
+    stats = await db.get(PlatformStats, STATS_ROW_ID)
+    if stats is None:
+        return {'total_users': 0, 'total_tokens': 0, 'total_volume': 0.0, 'community_reward_pool': 0.0}
+    return {
+        'total_users': stats.total_users,
+        'total_tokens': stats.total_tokens,
+        'total_volume': stats.total_volume_drops / DROPS_PER_XRP,
+        'community_reward_pool': stats.community_reward_pool_drops / DROPS_PER_XRP,
+    }
+
+async def reconcile_platform_stats(db: AsyncSession):
+    """
+    Overwrite reconcilable counters with values recomputed from source tables
+    """
+    await ensure_stats_row(db)
+    values = {column: build() for column, build in _reconcilers.items()}
+    values['reconciled_at'] = datetime.utcnow()
+    await db.execute(update(PlatformStats).where(PlatformStats.id == STATS_ROW_ID).values(**values))
+    await db.commit()
+
+async def run_reconciliation_loop(interval: float = STATS_RECONCILE_INTERVAL):
+    """
+    Reconcile the aggregates at startup and then every `interval` seconds
+
+    Payments still pending are settled first, so the volume includes them.
+    """
+    while True:
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, settle_pending_payments)
+        except Exception as e:
+            logger.error(f"Settling pending payments failed: {e}")
+        try:
+            async with AsyncSessionLocal() as db:
+                await reconcile_platform_stats(db)
+        except Exception as e:
+            logger.error(f"Platform stats reconciliation failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,557 @@
+import gzip
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.rewards import RewardBatch, RewardCarry, RewardDistribution, RewardPoolCredit
+from ..models.stats import PlatformStats
+from ..utils.logger import logger
+from .platform_stats import DROPS_PER_XRP, STATS_ROW_ID, record_stats_delta, register_reconciler
+
+if TYPE_CHECKING:
+    from ..integrations.signing_service import SigningService
+    from ..integrations.xrpl_client import XRPLClient
+
+REWARD_MIN_PAYOUT_DROPS = int(os.getenv('REWARD_MIN_PAYOUT_DROPS', '1000'))
+REWARD_BATCH_SIZE = int(os.getenv('REWARD_BATCH_SIZE', '200'))
+# Fractional weights (contribution scores) are fixed-point scaled to integers
+REWARD_WEIGHT_SCALE = int(os.getenv('REWARD_WEIGHT_SCALE', '1000000'))
+# SigningService key id holding the reward pool account
+REWARD_SIGNING_KEY_ID = os.getenv('REWARD_SIGNING_KEY_ID', 'reward_pool')
+# Recipient files can only be read from this directory (unset: inline recipients only)
+REWARD_EXPORT_DIR = os.getenv('REWARD_EXPORT_DIR')
+# How long a batch waits for its payments to be validated before the run is interrupted
+REWARD_VALIDATION_TIMEOUT = float(os.getenv('REWARD_VALIDATION_TIMEOUT', '120'))
+REWARD_VALIDATION_POLL = float(os.getenv('REWARD_VALIDATION_POLL', '1'))
+# A 'running' distribution with no progress for this long is considered abandoned
+REWARD_RUN_STALE_SECONDS = float(os.getenv('REWARD_RUN_STALE_SECONDS', '600'))
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+# Preliminary submit outcomes after which a payment must not be sent again:
+# applied (tes/tec) or queued. A blob signed by an earlier run may also come
+# back tefPAST_SEQ/tefALREADY, meaning it already made it into a ledger.
+# None of these is final; batches complete only once the ledger validates them.
+_FINAL_PREFIXES = ('tes', 'tec')
+_QUEUED = ('terQUEUED',)
+_ALREADY_APPLIED = ('tefPAST_SEQ', 'tefALREADY')
+# Never applied and can no longer be: sign again with a fresh Sequence and fee
+_EXPIRED = ('tefMAX_LEDGER', 'telINSUF_FEE_P')
+
+@dataclass
+class RecipientSet:
+    addresses: List[str]
+    weights: np.ndarray  # int64
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def digest(self) -> str:
+        h = hashlib.sha256()
+        h.update('\n'.join(self.addresses).encode())
+        h.update(self.weights.astype('<i8').tobytes())
+        return h.hexdigest()
+
+@dataclass
+class Allocation:
+    payouts: np.ndarray  # drops paid now, 0 where carried
+    carry: np.ndarray    # drops owed after this run
+    pool_drops: int
+    distributed_drops: int
+    carried_drops: int
+    remainder_drops: int
+
+    @property
+    def payees(self) -> np.ndarray:
+        return np.flatnonzero(self.payouts)
+
+    def summary(self, batch_size: int) -> Dict[str, float]:
+        paid = self.payouts[self.payouts > 0]
+        return {
+            'recipients': int(self.payouts.size),
+            'recipients_paid': int(paid.size),
+            'recipients_carried': int(np.count_nonzero(self.carry)),
+            'pool_drops': self.pool_drops,
+            'distributed_drops': self.distributed_drops,
+            'carried_drops': self.carried_drops,
+            'remainder_drops': self.remainder_drops,
+            'amount_distributed': self.distributed_drops / DROPS_PER_XRP,
+            'batches': -(-int(paid.size) // batch_size),
+            'min_payout_drops': int(paid.min()) if paid.size else 0,
+            'median_payout_drops': int(np.median(paid)) if paid.size else 0,
+            'max_payout_drops': int(paid.max()) if paid.size else 0,
+        }
+
+def _to_weights(values: Iterable[float], scale: int) -> np.ndarray:
+    weights = np.floor(np.fromiter(values, dtype=np.float64) * scale)
+    if weights.size and (weights.min() < 0 or weights.max() > _INT64_MAX):
+        raise ValueError("Weights must be non-negative and fit in 64 bits after scaling")
+    return weights.astype(np.int64)
+
+def recipients_from_pairs(pairs: Iterable[Tuple[str, float]], scale: int = 1) -> RecipientSet:
+    addresses, values = [], []
+    for address, weight in pairs:
+        addresses.append(address)
+        values.append(weight)
+    return RecipientSet(addresses, _to_weights(values, scale))
+
+def resolve_export_path(name: str, export_dir: Optional[str] = REWARD_EXPORT_DIR) -> str:
+    """
+    Absolute path of a recipient file inside the export directory
+
+    :param name: File name, relative to export_dir
+    :param export_dir: Directory recipient files may be read from
+    :raises ValueError: No export directory configured, or name escapes it
+    """
+    if not export_dir:
+        raise ValueError("REWARD_EXPORT_DIR is not configured; send recipients inline")
+    base = os.path.realpath(export_dir)
+    path = os.path.realpath(os.path.join(base, name))
+    if path == base or os.path.commonpath([base, path]) != base:
+        raise ValueError("source_file must name a file inside the export directory")
+    return path
+
+def check_batch_size(batch_size: int):
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+def load_recipients_ndjson(path: str, weight_field: str = 'contribution_score', scale: int = REWARD_WEIGHT_SCALE) -> RecipientSet:
+    """
+    Read recipients from an NDJSON file, e.g. a community export
+
+    :param path: File path, gzip if it ends in .gz
+    :param weight_field: Record field holding the weight (score or balance)
+    :param scale: Multiplier applied before flooring weights to integers
+    """
+    opener = gzip.open if path.endswith('.gz') else open
+    addresses, values = [], []
+    with opener(path, 'rt') as f:
+        for line in f:
+            record = json.loads(line)
+            address = record.get('wallet_address') or record.get('address')
+            if address is None:
+                continue  # export header
+            addresses.append(address)
+            values.append(record.get(weight_field, 0) or 0)
+    return RecipientSet(addresses, _to_weights(values, scale))
+
+def _exact_sum(values: np.ndarray) -> int:
+    if values.size and int(values.max()) > _INT64_MAX // values.size:
+        return int(values.astype(object).sum())
+    return int(values.sum())
+
+def pro_rata_shares(weights: np.ndarray, pool_drops: int) -> np.ndarray:
+    """
+    floor(pool * w / W) for every weight, exactly
+
+    Split as q*w + floor(r*w / W) with q, r = divmod(pool, W), so the only
+    product that can exceed 64 bits is r*w; that falls back to Python ints.
+    """
+    total = _exact_sum(weights)
+    if total == 0 or pool_drops <= 0:
+        return np.zeros_like(weights)
+    q, r = divmod(pool_drops, total)
+    shares = weights * q
+    if r and int(weights.max()) > _INT64_MAX // r:
+        shares += (weights.astype(object) * r // total).astype(np.int64)
+    elif r:
+        shares += weights * r // total
+    return shares
+
+def allocate(weights: np.ndarray, pool_drops: int, carry: np.ndarray, min_payout_drops: int) -> Allocation:
+    """
+    Split a pool pro rata, paying only amounts that reach the threshold
+
+    Amounts below min_payout_drops are carried per recipient into the next
+    distribution; rounding dust (under one drop per recipient) stays in the pool.
+    """
+    shares = pro_rata_shares(weights, pool_drops)
+    owed = shares + carry
+    payable = owed >= max(min_payout_drops, 1)
+    payouts = np.where(payable, owed, 0)
+    new_carry = np.where(payable, 0, owed)
+    return Allocation(
+        payouts=payouts,
+        carry=new_carry,
+        pool_drops=pool_drops,
+        distributed_drops=_exact_sum(payouts),
+        carried_drops=_exact_sum(new_carry),
+        remainder_drops=pool_drops - _exact_sum(shares),
+    )
+
+def load_carry(db: Session, addresses: List[str]) -> np.ndarray:
+    carried = dict(db.execute(select(RewardCarry.address, RewardCarry.drops)).all())
+    return np.fromiter((carried.get(address, 0) for address in addresses), dtype=np.int64, count=len(addresses))
+
+class RewardDistributor:
+    """
+    Plans, signs and submits a reward distribution in checkpointed batches
+
+    Each batch's signed blobs are stored before anything is submitted, so a
+    resumed run resubmits the same transactions (which rippled rejects as
+    already applied) instead of signing new ones and paying twice. A batch
+    only counts as done once every payment is in a validated ledger. Carry
+    balances only change when the whole distribution completes, and only one
+    distribution is unfinished at a time, which keeps the allocation
+    reproducible across resumes.
+    """
+
+    def __init__(
+        self,
+        xrpl_client: 'XRPLClient',
+        signing: 'SigningService',
+        key_id: str = REWARD_SIGNING_KEY_ID,
+        validation_timeout: float = REWARD_VALIDATION_TIMEOUT,
+        validation_poll: float = REWARD_VALIDATION_POLL
+    ):
+        self.xrpl_client = xrpl_client
+        self.signing = signing
+        self.key_id = key_id
+        self.validation_timeout = validation_timeout
+        self.validation_poll = validation_poll
+
+    @staticmethod
+    def plan(db: Session, recipients: RecipientSet, pool_drops: int, min_payout_drops: int) -> Allocation:
+        return allocate(recipients.weights, pool_drops, load_carry(db, recipients.addresses), min_payout_drops)
+
+    @staticmethod
+    def create(
+        db: Session,
+        recipients: RecipientSet,
+        allocation: Allocation,
+        min_payout_drops: int,
+        batch_size: int,
+        source_file: Optional[str] = None,
+        weight_field: Optional[str] = None,
+        weight_scale: int = 1,
+        from_pool: bool = False
+    ) -> RewardDistribution:
+        """
+        Record a planned distribution, ready to run
+
+        :param from_pool: pool_drops was read from the community pool counter,
+            which is debited by what is delivered on completion
+        :raises RuntimeError: Another distribution is still unfinished
+        """
+        check_batch_size(batch_size)
+        unfinished = active_distribution(db)
+        if unfinished is not None:
+            raise RuntimeError(f"Distribution {unfinished.id} is {unfinished.status}; resume or cancel it first")
+        distribution = RewardDistribution(
+            id=str(uuid.uuid4()),
+            status='running',
+            input_digest=recipients.digest(),
+            source_path=source_file,
+            weight_field=weight_field,
+            weight_scale=weight_scale,
+            pool_drops=allocation.pool_drops,
+            from_pool=from_pool,
+            min_payout_drops=min_payout_drops,
+            batch_size=batch_size,
+            recipients=len(recipients),
+            recipients_paid=int(allocation.payees.size),
+            distributed_drops=allocation.distributed_drops,
+            carried_drops=allocation.carried_drops,
+            remainder_drops=allocation.remainder_drops,
+            batches_total=-(-int(allocation.payees.size) // batch_size),
+            active=1,
+        )
+        db.add(distribution)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Lost a race with a concurrent create
+            db.rollback()
+            raise RuntimeError("Another distribution is still unfinished; resume or cancel it first")
+        return distribution
+
+    @staticmethod
+    def claim(db: Session, distribution_id: str, stale_after: float = REWARD_RUN_STALE_SECONDS) -> bool:
+        """
+        Take over an interrupted distribution, or one whose run stopped making progress
+
+        A single compare-and-set UPDATE, so of two concurrent resumes only one
+        gets to run.
+
+        :return: False if the distribution is running elsewhere, completed or unknown
+        """
+        now = datetime.utcnow()
+        claimed = db.execute(
+            update(RewardDistribution)
+            .where(
+                RewardDistribution.id == distribution_id,
+                or_(
+                    RewardDistribution.status == 'interrupted',
+                    and_(
+                        RewardDistribution.status == 'running',
+                        RewardDistribution.updated_at < now - timedelta(seconds=stale_after)
+                    )
+                )
+            )
+            .values(status='running', error=None, updated_at=now)
+        )
+        db.commit()
+        return claimed.rowcount == 1
+
+    @staticmethod
+    def cancel(db: Session, distribution_id: str) -> bool:
+        """
+        Drop an interrupted distribution that never signed a payment
+
+        One that did may have submitted it, so it has to be resumed to
+        completion; otherwise the carry of recipients it already paid would
+        be owed again.
+
+        :return: False if it is running, has signed payments or is unknown
+        """
+        signed = select(RewardBatch.distribution_id).where(RewardBatch.distribution_id == distribution_id)
+        cancelled = db.execute(
+            update(RewardDistribution)
+            .where(
+                RewardDistribution.id == distribution_id,
+                RewardDistribution.status == 'interrupted',
+                ~signed.exists()
+            )
+            .values(status='cancelled', active=None, updated_at=datetime.utcnow())
+        )
+        db.commit()
+        return cancelled.rowcount == 1
+
+    def run(self, db: Session, distribution_id: str, recipients: RecipientSet) -> RewardDistribution:
+        """
+        Execute or resume a distribution until every batch is validated
+
+        The caller must hold the run: either it just called create(), or
+        claim() returned True. Any failure, including a mismatched input,
+        leaves the distribution 'interrupted' with the error recorded.
+
+        :param db: Sync session, used from a worker thread
+        :param distribution_id: Row created by create()
+        :param recipients: Same input the distribution was created from
+        """
+        distribution = db.get(RewardDistribution, distribution_id)
+        if distribution is None:
+            raise ValueError(f"Unknown distribution: {distribution_id}")
+        if distribution.status == 'completed':
+            return distribution
+
+        try:
+            if recipients.digest() != distribution.input_digest:
+                raise ValueError("Recipients differ from the ones this distribution was planned with")
+            allocation = self.plan(db, recipients, distribution.pool_drops, distribution.min_payout_drops)
+            payees = allocation.payees
+            account = self.signing.key_addresses().get(self.key_id)
+            if account is None:
+                raise ValueError(f"Signing key '{self.key_id}' is not loaded")
+
+            for batch_index in range(distribution.batches_total):
+                start = batch_index * distribution.batch_size
+                self._run_batch(db, distribution, batch_index, account, recipients, allocation, payees[start:start + distribution.batch_size])
+        except Exception as e:
+            logger.error(f"Reward distribution {distribution_id} interrupted: {e}")
+            db.rollback()
+            distribution.status = 'interrupted'
+            distribution.error = str(e)
+            db.commit()
+            return distribution
+
+        self._complete(db, distribution, recipients, allocation)
+        return distribution
+
+    def _run_batch(self, db, distribution, batch_index, account, recipients, allocation, rows):
+        batch = db.get(RewardBatch, (distribution.id, batch_index))
+        if batch is not None and batch.status == 'validated':
+            return
+        # Blobs from an earlier run may have landed without their result being recorded
+        resumed = batch is not None
+
+        if batch is None:
+            blobs = self._sign(account, [(recipients.addresses[row], str(allocation.payouts[row])) for row in rows])
+            results = [None] * len(blobs)
+            batch = RewardBatch(distribution_id=distribution.id, batch_index=batch_index, status='signed', tx_blobs=json.dumps(blobs))
+            db.add(batch)
+            # Checkpoint: the blobs exist before any of them reaches rippled
+            self._checkpoint(db, distribution)
+        else:
+            blobs = json.loads(batch.tx_blobs)
+            results = json.loads(batch.engine_results or 'null') or [None] * len(blobs)
+            # Re-sign only payments that never landed and whose blob expired
+            stale = [i for i, result in enumerate(results) if result in _EXPIRED]
+            if stale:
+                fresh = self._sign(account, [(recipients.addresses[rows[i]], str(allocation.payouts[rows[i]])) for i in stale])
+                for i, blob in zip(stale, fresh):
+                    blobs[i], results[i] = blob, None
+                batch.tx_blobs = json.dumps(blobs)
+                batch.engine_results = json.dumps(results)
+                self._checkpoint(db, distribution)
+
+        for i, blob in enumerate(blobs):
+            if results[i] is not None and self._settled(results[i], resumed):
+                continue
+            response = self.xrpl_client.submit_blob(blob, account)
+            results[i] = response.result.get('engine_result') or response.result.get('error', 'unknown')
+            batch.engine_results = json.dumps(results)
+            self._checkpoint(db, distribution)
+            if not self._settled(results[i], resumed):
+                raise RuntimeError(f"Batch {batch_index} payment {i} failed with {results[i]}, resume to retry")
+
+        batch.status = 'submitted'
+        self._checkpoint(db, distribution)
+        self._await_validation(db, distribution, batch, blobs, results)
+        batch.status = 'validated'
+        distribution.batches_done = batch_index + 1
+        self._checkpoint(db, distribution)
+
+    @staticmethod
+    def _checkpoint(db: Session, distribution: RewardDistribution):
+        # Also the run's heartbeat, see claim()
+        distribution.updated_at = datetime.utcnow()
+        db.commit()
+
+    def _await_validation(self, db, distribution, batch, blobs, results):
+        """
+        Poll until every payment in the batch is in a validated ledger
+
+        Final results (tes or tec) replace the preliminary ones. A payment
+        that is not found once the validated ledger passes its
+        LastLedgerSequence can never apply; it is marked expired so a resume
+        signs it again.
+        """
+        # Imported here: routes/admin loads this module and xrpl-py stays out of startup
+        from xrpl.models.transactions.transaction import Transaction
+
+        transactions = [Transaction.from_blob(blob) for blob in blobs]
+        hashes = [transaction.get_hash() for transaction in transactions]
+        pending = set(range(len(blobs)))
+        deadline = time.monotonic() + self.validation_timeout
+        while True:
+            for i in sorted(pending):
+                final = self.xrpl_client.get_validated_result(hashes[i])
+                if final is not None:
+                    results[i] = final
+                    pending.discard(i)
+            expired = []
+            if pending:
+                validated_ledger = self.xrpl_client.get_validated_ledger_index()
+                expired = [i for i in pending if validated_ledger > transactions[i].last_ledger_sequence]
+                for i in expired:
+                    results[i] = 'tefMAX_LEDGER'
+            batch.engine_results = json.dumps(results)
+            self._checkpoint(db, distribution)
+            if expired:
+                raise RuntimeError(f"Batch {batch.batch_index}: {len(expired)} payments expired unvalidated, resume to re-sign them")
+            if not pending:
+                return
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Batch {batch.batch_index} not validated after {self.validation_timeout}s, resume to check again")
+            time.sleep(self.validation_poll)
+
+    @staticmethod
+    def _settled(engine_result: str, resumed: bool) -> bool:
+        if engine_result[:3] in _FINAL_PREFIXES or engine_result in _QUEUED:
+            return True
+        return resumed and engine_result in _ALREADY_APPLIED
+
+    def _sign(self, account: str, payments: List[Tuple[str, str]]) -> List[str]:
+        transactions = self.xrpl_client.prepare_payments(account, payments)
+        signed = self.signing.sign_batch([(self.key_id, transaction) for transaction in transactions])
+        return [transaction.tx_blob for transaction in signed]
+
+    def _complete(self, db: Session, distribution: RewardDistribution, recipients: RecipientSet, allocation: Allocation):
+        failed = np.zeros(len(recipients), dtype=np.int64)
+        payees = allocation.payees
+        for batch in db.execute(select(RewardBatch).where(RewardBatch.distribution_id == distribution.id)).scalars():
+            rows = payees[batch.batch_index * distribution.batch_size:(batch.batch_index + 1) * distribution.batch_size]
+            for row, result in zip(rows, json.loads(batch.engine_results or '[]')):
+                # tec results consumed the fee but delivered nothing: owe it again
+                if result and result.startswith('tec'):
+                    failed[row] = allocation.payouts[row]
+
+        self._store_carry(db, recipients.addresses, allocation.carry + failed)
+
+        delivered = allocation.distributed_drops - _exact_sum(failed)
+        if distribution.from_pool:
+            pool = PlatformStats.community_reward_pool_drops
+            db.execute(
+                update(PlatformStats)
+                .where(PlatformStats.id == STATS_ROW_ID)
+                .values(community_reward_pool_drops=case((pool > delivered, pool - delivered), else_=0))
+            )
+        distribution.delivered_drops = delivered
+        distribution.status = 'completed'
+        distribution.active = None
+        distribution.completed_at = datetime.utcnow()
+        db.commit()
+
+    @staticmethod
+    def _store_carry(db: Session, addresses: List[str], carry: np.ndarray):
+        existing = dict(db.execute(select(RewardCarry.address, RewardCarry.drops)).all())
+        inserts, updates, deletes = [], [], []
+        for address, drops in zip(addresses, carry.tolist()):
+            previous = existing.get(address)
+            if drops and previous is None:
+                inserts.append({'address': address, 'drops': drops})
+            elif drops and previous != drops:
+                updates.append({'address': address, 'drops': drops})
+            elif not drops and previous is not None:
+                deletes.append(address)
+        if inserts:
+            db.execute(insert(RewardCarry), inserts)
+        if updates:
+            db.execute(update(RewardCarry), updates)
+        for start in range(0, len(deletes), 1000):
+            db.execute(delete(RewardCarry).where(RewardCarry.address.in_(deletes[start:start + 1000])))
+
+def _reward_pool_subquery():
+    credited = select(func.coalesce(func.sum(RewardPoolCredit.drops), 0)).scalar_subquery()
+    delivered = select(func.coalesce(func.sum(RewardDistribution.delivered_drops), 0)).where(
+        RewardDistribution.from_pool.is_(True),
+        RewardDistribution.status == 'completed'
+    ).scalar_subquery()
+    return select(case((credited > delivered, credited - delivered), else_=0)).scalar_subquery()
+
+register_reconciler('community_reward_pool_drops', _reward_pool_subquery)
+
+def credit_reward_pool(db: Session, drops: int, note: Optional[str] = None) -> int:
+    """
+    Add funding to the community reward pool
+
+    :param drops: Amount to add, in drops
+    :param note: Free-form reference, e.g. the funding transaction
+    :return: Pool balance in drops after the credit
+    """
+    if drops <= 0:
+        raise ValueError("drops must be positive")
+    db.add(RewardPoolCredit(drops=drops, note=note))
+    record_stats_delta(db, community_reward_pool_drops=drops)
+    db.commit()
+    return db.execute(
+        select(PlatformStats.community_reward_pool_drops).where(PlatformStats.id == STATS_ROW_ID)
+    ).scalar_one()
+
+def active_distribution(db: Session) -> Optional[RewardDistribution]:
+    """
+    The distribution that is running or interrupted, if any
+    """
+    return db.execute(select(RewardDistribution).where(RewardDistribution.active.is_not(None))).scalar()
+
+def dry_run_report(db: Session, recipients: RecipientSet, pool_drops: int, min_payout_drops: int, batch_size: int) -> Dict[str, float]:
+    """
+    Totals a distribution would produce, without signing or submitting anything
+    """
+    check_batch_size(batch_size)
+    start = time.perf_counter()
+    allocation = RewardDistributor.plan(db, recipients, pool_drops, min_payout_drops)
+    report = allocation.summary(batch_size)
+    report['compute_seconds'] = time.perf_counter() - start
+    return report
@@ -0,0 +1,85 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.token import RegisteredToken
+from .platform_stats import DROPS_PER_XRP, register_reconciler
+
+SORT_ORDERS = ('recent',)
+MAX_PAGE_SIZE = 200
+
+# Tokens are registered (and counted in platform_stats) by the eon_xrp mint
+# workers; reconciliation repairs total_tokens if the two ever drift
+register_reconciler('total_tokens', lambda: select(func.count()).select_from(RegisteredToken).scalar_subquery())
+
+def _sort_columns(sort: str):
+    if sort == 'recent':
+        return RegisteredToken.created_at, RegisteredToken.id
+    raise ValueError(f"Unknown sort order: {sort} (expected one of {', '.join(SORT_ORDERS)})")
+
+def _cursor_for(token: RegisteredToken, sort: str) -> str:
+    return f"{token.created_at.isoformat()}:{token.id}"
+
+def parse_token_cursor(cursor: Optional[str], sort: str) -> Optional[Tuple[Any, int]]:
+    """
+    Parse a `<sort key>:<id>` keyset cursor
+
+    :param cursor: Cursor string returned with a previous row
+    :param sort: Sort order the cursor was issued for
+    :return: (sort key, id) tuple, or None for the first page
+    """
+    if not cursor:
+        return None
+    key, _, token_id = cursor.rpartition(':')
+    return datetime.fromisoformat(key), int(token_id)
+
+async def list_registered_tokens(
+    db: AsyncSession,
+    sort: str = 'recent',
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    creator: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    One page of registered tokens, newest first
+
+    Keyset pagination over (sort key, id), so every page is an index range
+    scan no matter how deep it is.
+
+    :param db: Async database session
+    :param sort: 'recent' (the only order until token trades record volume)
+    :param cursor: Resume strictly after this row's cursor
+    :param limit: Page size, capped at MAX_PAGE_SIZE
+    :param creator: Only tokens created by this address
+    :return: Token dicts, each carrying its own cursor
+    """
+    key_column, id_column = _sort_columns(sort)
+    after = parse_token_cursor(cursor, sort)
+    query = select(RegisteredToken)
+    if creator is not None:
+        query = query.where(RegisteredToken.creator == creator)
+    if after is not None:
+        key, token_id = after
+        query = query.where(or_(
+            key_column < key,
+            and_(key_column == key, id_column < token_id)
+        ))
+    query = query.order_by(key_column.desc(), id_column.desc()).limit(max(1, min(limit, MAX_PAGE_SIZE)))
+    return [
+        {
+            'cursor': _cursor_for(token, sort),
+            'id': token.id,
+            'kind': token.kind,
+            'symbol': token.symbol,
+            'name': token.name,
+            'creator': token.creator,
+            'tx_hash': token.tx_hash,
+            'uri_slug': token.uri_slug,
+            'ledger_index': token.ledger_index,
+            'volume': token.volume_drops / DROPS_PER_XRP,
+            'created_at': token.created_at.isoformat(),
+        }
+        for token in (await db.execute(query)).scalars()
+    ]
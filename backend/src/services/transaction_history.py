@@ -0,0 +1,150 @@
+import json
+import threading
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.transaction import AccountTransaction, AccountSyncState
+
+if TYPE_CHECKING:
+    # Importing the client pulls in xrpl-py, keep it off the import path
+    from ..integrations.xrpl_client import XRPLClient
+
+# Skip the rippled round trip when an account was synced this recently
+MIN_SYNC_INTERVAL = timedelta(seconds=5)
+# Largest page a client can ask for; full exports stream without a limit
+MAX_PAGE_SIZE = 1000
+
+_sync_locks: Dict[str, threading.Lock] = {}
+_sync_locks_guard = threading.Lock()
+
+def _account_lock(address: str) -> threading.Lock:
+    with _sync_locks_guard:
+        return _sync_locks.setdefault(address, threading.Lock())
+
+def _row_from_entry(address: str, entry: dict) -> Optional[AccountTransaction]:
+    tx = entry.get('tx') or entry.get('tx_json') or {}
+    meta = entry.get('meta') or {}
+    ledger_index = tx.get('ledger_index', entry.get('ledger_index'))
+    if ledger_index is None or not isinstance(meta, dict) or 'TransactionIndex' not in meta:
+        return None
+    return AccountTransaction(
+        account=address,
+        ledger_index=ledger_index,
+        tx_index=meta['TransactionIndex'],
+        tx_hash=tx.get('hash', entry.get('hash')),
+        tx_type=tx.get('TransactionType'),
+        tx_json=json.dumps({'tx': tx, 'meta': meta})
+    )
+
+def _store_page(db: Session, address: str, entries: list):
+    rows = [row for row in (_row_from_entry(address, entry) for entry in entries) if row]
+    if not rows:
+        return
+    # A crashed sync may have stored part of this range already
+    low = min(row.ledger_index for row in rows)
+    high = max(row.ledger_index for row in rows)
+    existing = set(
+        db.query(AccountTransaction.ledger_index, AccountTransaction.tx_index)
+        .filter(
+            AccountTransaction.account == address,
+            AccountTransaction.ledger_index.between(low, high)
+        )
+    )
+    db.add_all(row for row in rows if (row.ledger_index, row.tx_index) not in existing)
+    db.commit()
+
+def sync_transaction_history(db: Session, xrpl_client: 'XRPLClient', address: str, force: bool = False) -> int:
+    """
+    Fetch ledgers newer than the stored high-water mark into the local store
+
+    :param db: Database session
+    :param xrpl_client: Client used for account_tx
+    :param address: Account to sync
+    :param force: Sync even if the account was synced within MIN_SYNC_INTERVAL
+    :return: High-water ledger index after the sync
+    """
+    with _account_lock(address):
+        state = db.get(AccountSyncState, address)
+        if state is None:
+            state = AccountSyncState(account=address, high_water_ledger=0)
+            db.add(state)
+        elif not force and datetime.utcnow() - state.synced_at < MIN_SYNC_INTERVAL:
+            return state.high_water_ledger
+
+        ledger_index_min = state.high_water_ledger + 1 if state.high_water_ledger else -1
+        high_water = state.high_water_ledger
+        try:
+            for page in xrpl_client.get_transaction_history(address, ledger_index_min=ledger_index_min):
+                _store_page(db, address, page.get('transactions', []))
+                high_water = max(high_water, page.get('ledger_index_max', high_water))
+            state.high_water_ledger = high_water
+            state.synced_at = datetime.utcnow()
+            db.commit()
+        except IntegrityError:
+            # Another worker synced the same range, the next call resumes from its mark
+            db.rollback()
+        return high_water
+
+def parse_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Parse a `<ledger_index>:<tx_index>` keyset cursor
+
+    :param cursor: Cursor string returned with a previous row
+    :return: (ledger_index, tx_index) tuple, or None for the newest entry
+    """
+    if not cursor:
+        return None
+    ledger_index, tx_index = cursor.split(':', 1)
+    return int(ledger_index), int(tx_index)
+
+def iter_transaction_history(
+    db: Session,
+    address: str,
+    cursor: Optional[Tuple[int, int]] = None,
+    limit: Optional[int] = None,
+    batch_size: int = 500
+) -> Iterator[dict]:
+    """
+    Yield stored transactions newest-first using keyset pagination
+
+    :param db: Database session
+    :param address: Account whose history to read
+    :param cursor: Resume strictly after this (ledger_index, tx_index) key
+    :param limit: Maximum number of transactions to yield (None for all)
+    :param batch_size: Rows fetched per keyset query
+    :return: Iterator over transaction dicts, each carrying its own cursor
+    """
+    remaining = limit
+    while remaining is None or remaining > 0:
+        query = db.query(AccountTransaction).filter(AccountTransaction.account == address)
+        if cursor is not None:
+            ledger_index, tx_index = cursor
+            query = query.filter(or_(
+                AccountTransaction.ledger_index < ledger_index,
+                and_(AccountTransaction.ledger_index == ledger_index, AccountTransaction.tx_index < tx_index)
+            ))
+        size = batch_size if remaining is None else min(batch_size, remaining)
+        rows = (
+            query.order_by(AccountTransaction.ledger_index.desc(), AccountTransaction.tx_index.desc())
+            .limit(size)
+            .all()
+        )
+        for row in rows:
+            yield {
+                'cursor': f"{row.ledger_index}:{row.tx_index}",
+                'ledger_index': row.ledger_index,
+                'tx_index': row.tx_index,
+                'hash': row.tx_hash,
+                'type': row.tx_type,
+                **json.loads(row.tx_json)
+            }
+        if len(rows) < size:
+            break
+        cursor = (rows[-1].ledger_index, rows[-1].tx_index)
+        if remaining is not None:
+            remaining -= len(rows)
+        db.expunge_all()
@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a time-to-live
+
+    Each entry may carry its own absolute expiry, which is never extended
+    by reads; the least recently used entry is evicted once max_size is hit.
+    """
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 60.0, clock: Callable[[], float] = time.time):
+        """
+        :param max_size: Maximum number of entries
+        :param ttl: Default time-to-live in seconds
+        :param clock: Time source, seconds since the epoch
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return default
+            expires_at, value = entry
+            if self._clock() >= expires_at:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None):
+        """
+        Store a value
+
+        :param key: Cache key
+        :param value: Value to store
+        :param expires_at: Absolute expiry; capped at now + ttl
+        """
+        deadline = self._clock() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+        with self._lock:
+            self._entries[key] = (deadline, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.pop(key, _MISSING)
+        return default if entry is _MISSING else entry[1]
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]):
+        """
+        Remove every entry for which predicate(key, value) is true
+        """
+        with self._lock:
+            for key in [k for k, (_, v) in self._entries.items() if predicate(k, v)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,33 +1,162 @@
+import atexit
+import json
 import logging
+import os
+import queue
+import random
 import sys
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
 
-def setup_logger(name: str = 'eonxrp', log_level: str = 'INFO'):
-    # Create logger
+from .paths import REPO_ROOT
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+LOG_JSON = os.getenv('LOG_JSON', 'false').lower() in ('1', 'true', 'yes')
+# Records buffered for the writer thread; beyond this they are dropped, not waited on
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+# Comma-separated logger=rate pairs, e.g. "eonxrp.xrpl=0.01,eonxrp.db=0.1"
+LOG_SAMPLE_RATES = os.getenv('LOG_SAMPLE_RATES', '')
+# Directory of the rotating <name>.log files
+LOG_DIR = os.getenv('LOG_DIR', REPO_ROOT)
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listeners: Dict[str, QueueListener] = {}
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, including any extra= fields
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'location': f'{record.filename}:{record.lineno}',
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of low-severity records per logger
+
+    Rates apply to the named logger and its children, the most specific
+    name winning; records above max_level always pass.
+    """
+
+    def __init__(self, rates: Dict[str, float], max_level: int = logging.DEBUG):
+        super().__init__()
+        self.rates = rates
+        self.max_level = max_level
+
+    def _rate(self, name: str) -> float:
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition('.')[0]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller; records are dropped when the queue is full
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    rates = {}
+    for pair in filter(None, (part.strip() for part in spec.split(','))):
+        name, _, rate = pair.partition('=')
+        rates[name.strip()] = float(rate)
+    return rates
+
+def setup_logger(
+    name: str = 'eonxrp',
+    log_level: str = LOG_LEVEL,
+    json_output: bool = LOG_JSON,
+    sample_rates: Optional[Dict[str, float]] = None
+):
+    """
+    Configure a logger whose handlers run on a background thread
+
+    The request path only enqueues records; formatting, console writes and
+    file rotation happen in a QueueListener. Calling this again for the same
+    name only updates the level.
+
+    :param name: Logger name
+    :param log_level: Minimum level name
+    :param json_output: Emit JSON lines instead of plain text
+    :param sample_rates: Logger name -> fraction of DEBUG records to keep
+    """
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, log_level.upper()))
+    if name in _listeners:
+        return logger
 
     # Console Handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
 
     # File Handler with Rotation
     file_handler = RotatingFileHandler(
-        f'{name}.log', 
+        os.path.join(LOG_DIR, f'{name}.log'),
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
     file_handler.setLevel(logging.DEBUG)
-    file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s')
-    file_handler.setFormatter(file_formatter)
 
-    # Add handlers to logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    if json_output:
+        console_handler.setFormatter(JsonFormatter())
+        file_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'))
+
+    queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+    if sample_rates is None:
+        sample_rates = parse_sample_rates(LOG_SAMPLE_RATES)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    listener = QueueListener(queue_handler.queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
 
+    logger.addHandler(queue_handler)
     return logger
 
+def shutdown_logging():
+    """
+    Flush queued records and stop the writer threads
+    """
+    while _listeners:
+        _, listener = _listeners.popitem()
+        listener.stop()
+
+atexit.register(shutdown_logging)
+
 # Global logger instance
 logger = setup_logger()
@@ -0,0 +1,94 @@
+"""
+Prometheus collectors and route instrumentation, shared by the backend and
+the eon_xrp app (which imports it as backend.src.utils.metrics)
+"""
+import time
+from typing import Dict, Tuple
+
+from fastapi.routing import APIRoute
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from starlette.responses import Response
+
+# Sub-millisecond resolution for pool waits and queries
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'Route latency including the response body',
+    ['method', 'route']
+)
+HTTP_IN_FLIGHT = Gauge(
+    'http_requests_in_flight', 'Requests currently being handled',
+    ['method', 'route']
+)
+HTTP_EXCEPTIONS = Counter(
+    'http_request_exceptions_total', 'Requests that raised out of the route',
+    ['method', 'route']
+)
+XRPL_RPC_SECONDS = Histogram(
+    'xrpl_rpc_duration_seconds', 'rippled JSON-RPC round trip time',
+    ['method']
+)
+XRPL_RPC_ERRORS = Counter(
+    'xrpl_rpc_errors_total', 'Failed rippled JSON-RPC calls',
+    ['method', 'error']
+)
+DB_CHECKOUT_SECONDS = Histogram(
+    'db_pool_checkout_duration_seconds', 'Time spent waiting for a pooled connection',
+    ['pool'], buckets=DB_BUCKETS
+)
+DB_QUERY_SECONDS = Histogram(
+    'db_query_duration_seconds', 'Statement execution time',
+    ['pool'], buckets=DB_BUCKETS
+)
+DB_SESSION_SECONDS = Histogram(
+    'db_session_duration_seconds', 'Lifetime of request-scoped sessions',
+    ['kind']
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    'response_cache_lookups_total', 'Cached route lookups by outcome (hit, miss, coalesced)',
+    ['outcome']
+)
+RESPONSE_CACHE_NOT_MODIFIED = Counter(
+    'response_cache_not_modified_total', 'Responses answered with 304 Not Modified'
+)
+
+class InstrumentedRoute(APIRoute):
+    """
+    APIRoute that records latency and in-flight requests under its path template
+
+    Timing wraps Route.handle, so it covers dependencies, the endpoint and
+    sending the response, and unmatched paths never create label sets.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._children: Dict[str, Tuple[Histogram, Gauge]] = {}
+
+    def _metrics_for(self, method: str) -> Tuple[Histogram, Gauge]:
+        children = self._children.get(method)
+        if children is None:
+            children = (
+                HTTP_REQUEST_SECONDS.labels(method, self.path),
+                HTTP_IN_FLIGHT.labels(method, self.path),
+            )
+            self._children[method] = children
+        return children
+
+    async def handle(self, scope, receive, send):
+        latency, in_flight = self._metrics_for(scope['method'])
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await super().handle(scope, receive, send)
+        except Exception:
+            HTTP_EXCEPTIONS.labels(scope['method'], self.path).inc()
+            raise
+        finally:
+            latency.observe(time.perf_counter() - start)
+            in_flight.dec()
+
+def metrics_response() -> Response:
+    """
+    Current metrics in the Prometheus text exposition format
+    """
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,5 @@
+import os
+
+# Repository root. The backend runs from backend/ and the eon_xrp app from
+# the root, so files shared between them are located from here, not the cwd
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
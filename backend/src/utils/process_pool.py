@@ -0,0 +1,33 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Worker processes shared by CPU-bound jobs that keep no state between calls
+# (password hashing, wallet key generation). PASSWORD_HASH_WORKERS is the
+# older name of the setting, from when hashing had the pool to itself.
+CPU_POOL_WORKERS = int(os.getenv('CPU_POOL_WORKERS', os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 1))))
+
+_executor: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    The shared process pool, started on first use
+    """
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(max_workers=CPU_POOL_WORKERS)
+    return _executor
+
+def shutdown_process_pool():
+    """
+    Stop the shared worker processes; the next get_process_pool starts new ones
+    """
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Union
+
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .cache import TTLCache
+from .metrics import RESPONSE_CACHE_LOOKUPS, RESPONSE_CACHE_NOT_MODIFIED
+
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '10000'))
+# Larger bodies are still coalesced and tagged, just not kept
+RESPONSE_CACHE_MAX_BODY_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BODY_BYTES', str(256 * 1024)))
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', '5'))
+
+class CachedBody(NamedTuple):
+    etag: str
+    body: bytes
+    media_type: str
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one
+
+    The first caller starts the work; callers arriving before it finishes
+    await the same result (or exception). Nothing is remembered afterwards.
+    Keys are per event loop, i.e. per worker process.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._calls.pop(key) if self._calls.get(key) is done else None)
+        # A disconnecting caller must not cancel the work the others wait on
+        return await asyncio.shield(task)
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an entity tag (weak comparison)
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(','))
+    return etag in (tag[2:] if tag.startswith('W/') else tag for tag in candidates)
+
+def _encode(value: Union[bytes, Any]) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return json.dumps(jsonable_encoder(value), separators=(',', ':')).encode()
+
+class ResponseCache:
+    """
+    TTL+LRU cache of rendered response bodies for hot read routes
+
+    Identical concurrent requests share one computation, the result is kept
+    for a short TTL and every response carries an ETag, so clients that send
+    If-None-Match get an empty 304 whenever the body is unchanged.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_body_bytes: int = RESPONSE_CACHE_MAX_BODY_BYTES,
+        ttl: float = RESPONSE_CACHE_TTL
+    ):
+        """
+        :param max_entries: Maximum number of cached bodies
+        :param max_body_bytes: Bodies larger than this are served but not cached
+        :param ttl: Default time-to-live in seconds
+        """
+        self.max_body_bytes = max_body_bytes
+        self.ttl = ttl
+        # Expiry is set per entry from the route's ttl
+        self._bodies = TTLCache(max_size=max_entries, ttl=float('inf'))
+        self._flights = SingleFlight()
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        query = '&'.join(sorted(f'{k}={v}' for k, v in request.query_params.multi_items()))
+        return f'{request.url.path}?{query}'
+
+    async def serve(
+        self,
+        request: Request,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        media_type: str = 'application/json'
+    ) -> Response:
+        """
+        Answer a request from the cache, computing the body at most once
+
+        :param request: Incoming request; its path and query form the cache key
+        :param compute: Produces the body, as bytes or a JSON-encodable value;
+            may be sync (run in the threadpool) or async
+        :param ttl: Seconds to keep the body; the cache's default when omitted
+        :param media_type: Content type of the body
+        :return: 200 with the body, or 304 if If-None-Match still matches
+        """
+        key = self.key_for(request)
+        cached = self._bodies.get(key)
+        if cached is not None:
+            RESPONSE_CACHE_LOOKUPS.labels('hit').inc()
+        else:
+            RESPONSE_CACHE_LOOKUPS.labels('coalesced' if self._flights.in_flight(key) else 'miss').inc()
+            cached = await self._flights.do(key, lambda: self._compute(key, compute, ttl, media_type))
+        return self._respond(request, cached)
+
+    async def _compute(self, key: str, compute: Callable[[], Any], ttl: Optional[float], media_type: str) -> CachedBody:
+        if asyncio.iscoroutinefunction(compute):
+            value = await compute()
+        else:
+            value = await run_in_threadpool(compute)
+        body = _encode(value)
+        cached = CachedBody(make_etag(body), body, media_type)
+        if len(body) <= self.max_body_bytes:
+            self._bodies.set(key, cached, expires_at=time.time() + (self.ttl if ttl is None else ttl))
+        return cached
+
+    @staticmethod
+    def _respond(request: Request, cached: CachedBody) -> Response:
+        # no-cache: clients may store the body but revalidate each use, cheaply via 304
+        headers = {'ETag': cached.etag, 'Cache-Control': 'no-cache'}
+        if etag_matches(request.headers.get('if-none-match'), cached.etag):
+            RESPONSE_CACHE_NOT_MODIFIED.inc()
+            return Response(status_code=304, headers=headers)
+        return Response(cached.body, media_type=cached.media_type, headers=headers)
+
+    def invalidate(self, path: str):
+        """
+        Drop the cached bodies for a path, under any query string
+        """
+        self._bodies.discard_where(lambda key, _: key.partition('?')[0] == path)
+
+    def clear(self):
+        self._bodies.clear()
+
+response_cache = ResponseCache()
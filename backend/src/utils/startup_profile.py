@@ -0,0 +1,43 @@
+import os
+import subprocess
+import sys
+from typing import List, Tuple
+
+def profile_imports(module: str, cwd: str = '.') -> List[Tuple[str, int, int]]:
+    """
+    Import a module in a fresh interpreter under -X importtime
+
+    :param module: Dotted module name to import
+    :param cwd: Working directory for the child interpreter
+    :return: (module, self microseconds, cumulative microseconds), slowest cumulative first
+    """
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    )
+    timings = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        timings.append((name.strip(), int(self_us), int(cumulative_us)))
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return sorted(timings, key=lambda timing: timing[2], reverse=True)
+
+def print_startup_report(module: str, cwd: str = '.', top: int = 30):
+    """
+    Print the slowest imports triggered by importing a module
+    """
+    timings = profile_imports(module, cwd)
+    total_us = max((cumulative for _, _, cumulative in timings), default=0)
+    print(f"Import of {module}: {total_us / 1000:.1f} ms total")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for name, self_us, cumulative_us in timings[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+if __name__ == "__main__":
+    print_startup_report(sys.argv[1] if len(sys.argv) > 1 else 'main')
@@ -0,0 +1,67 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(BACKEND_DIR)
+
+# Tests import the backend as `backend.src.*`, the way the root app's
+# `src.eon_xrp` does, so both share one copy of every module
+sys.path.insert(0, REPO_ROOT)
+
+from backend.src.models.user import Base  # noqa: E402
+# Register every table on Base before create_all
+from backend.src.models import rewards, stats, token, transaction  # noqa: E402,F401
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _wait_for_port(port: int, timeout: float = 15.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port}")
+
+@pytest.fixture
+def db():
+    """
+    Sync session on a fresh in-memory SQLite database holding every backend table
+    """
+    engine = create_engine('sqlite://', connect_args={'check_same_thread': False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+@pytest.fixture(scope='session')
+def fake_rippled():
+    """
+    benchmarks/fake_rippled.py on free ports
+
+    :return: (JSON-RPC URL, WebSocket URL)
+    """
+    port, ws_port = _free_port(), _free_port()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(REPO_ROOT, 'benchmarks', 'fake_rippled.py'), '--port', str(port), '--ws-port', str(ws_port)],
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        _wait_for_port(port)
+        _wait_for_port(ws_port)
+        yield f'http://127.0.0.1:{port}/', f'ws://127.0.0.1:{ws_port}/'
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
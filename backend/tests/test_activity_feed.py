@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.src.models.user import Base
+from backend.src.services import activity_feed as activity_feed_module
+from backend.src.services.activity_feed import ActivityFeed
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """
+    Points the feed's sessions at a fresh database; returns its engine
+    """
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'activity.db'}")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(setup())
+    monkeypatch.setattr(activity_feed_module, 'AsyncSessionLocal', async_sessionmaker(engine, expire_on_commit=False))
+    return engine
+
+def _ids(events):
+    return [event['detail']['n'] for event in events]
+
+def test_ring_serves_newest_first_and_pages_back():
+    feed = ActivityFeed(capacity=3, max_pending=2)
+    events = [feed.publish('login', username='alice', n=n) for n in range(4)]
+    # The oldest fell out of the ring
+    assert _ids(feed.recent()) == [3, 2, 1]
+    assert _ids(feed.recent(limit=1, before=events[2]['id'])) == [1]
+    assert feed.recent(before=events[0]['id']) == []
+    # Past max_pending events are served but not persisted
+    assert feed.dropped == 2
+
+def test_pages_continue_from_the_table(database):
+    async def scenario():
+        feed = ActivityFeed(capacity=3)
+        for n in range(6):
+            feed.publish('transaction', n=n)
+        await feed._flush()
+        async with activity_feed_module.AsyncSessionLocal() as db:
+            first = await feed.page(db, limit=4)
+            second = await feed.page(db, limit=4, before=first[-1]['id'])
+        await database.dispose()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert _ids(first) == [5, 4, 3, 2]
+    assert _ids(second) == [1, 0]
+
+def test_workers_see_each_others_events(database):
+    async def scenario():
+        writer, reader = ActivityFeed(tail_interval=0), ActivityFeed(tail_interval=0)
+        await reader.start()
+        stream = reader.subscribe()
+        live = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+
+        local = reader.publish('register', username='bob', n=0)
+        first_live = await asyncio.wait_for(live, 5)
+        writer.publish('login', username='carol', n=1)
+        await writer._flush()
+        await reader._tail()
+        # Tailing again does not admit anything twice
+        await reader._tail()
+        recent = reader.recent()
+        # A reconnecting client is replayed what it missed
+        resumed = reader.subscribe(last_event_id=local['id'])
+        replayed = await resumed.__anext__()
+        await resumed.aclose()
+        await stream.aclose()
+        await reader.stop()
+        await database.dispose()
+        return first_live, recent, replayed
+
+    first_live, recent, replayed = asyncio.run(scenario())
+    assert first_live['detail'] == {'n': 0}
+    assert _ids(recent) == [1, 0]
+    assert replayed['detail'] == {'n': 1}
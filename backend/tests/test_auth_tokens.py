@@ -0,0 +1,112 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.src.models.user import Base, User
+from backend.src.services import auth
+from backend.src.services.auth import (
+    create_access_token,
+    get_current_user,
+    get_token_version,
+    revoke_token,
+    revoke_user_tokens,
+)
+from backend.src.utils.cache import TTLCache
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_ttl_cache_expires_and_evicts():
+    clock = Clock()
+    cache = TTLCache(max_size=2, ttl=60, clock=clock)
+    cache.set('a', 1)
+    # An entry's own expiry wins when it is sooner than the ttl
+    cache.set('b', 2, expires_at=clock.now + 10)
+    clock.now += 11
+    assert cache.get('b') is None
+    cache.set('c', 3)
+    cache.get('a')
+    cache.set('d', 4)
+    # 'c' was the least recently used
+    assert (cache.get('a'), cache.get('c'), cache.get('d')) == (1, None, 4)
+    cache.discard_where(lambda key, value: value == 4)
+    assert cache.get('d') is None
+    clock.now += 60
+    assert cache.get('a') is None and len(cache) == 0
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'auth.db'}")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with async_sessionmaker(engine)() as db:
+            db.add(User(username='alice', email='alice@example.com', hashed_password='-'))
+            await db.commit()
+
+    asyncio.run(setup())
+    auth._token_cache.clear()
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    auth._token_cache.clear()
+    asyncio.run(engine.dispose())
+
+async def _user(sessions, token):
+    async with sessions() as db:
+        try:
+            return (await get_current_user(token, db)).username
+        except HTTPException as e:
+            return e.status_code
+
+async def _token(sessions, **kwargs):
+    async with sessions() as db:
+        return create_access_token({'sub': 'alice', 'ver': await get_token_version(db, 'alice')}, **kwargs)
+
+def test_verified_tokens_are_served_from_the_cache(sessions):
+    async def scenario():
+        token = await _token(sessions)
+        first = await _user(sessions, token)
+        async with sessions() as db:
+            await db.execute(delete(User))
+            await db.commit()
+        cached = await _user(sessions, token)
+        # Another worker has no cache entry and sees the user is gone
+        auth._token_cache.clear()
+        return first, cached, await _user(sessions, token)
+
+    assert asyncio.run(scenario()) == ('alice', 'alice', 401)
+
+def test_invalid_and_expired_tokens_are_rejected(sessions):
+    async def scenario():
+        expired = await _token(sessions, expires_delta=timedelta(seconds=-1))
+        return await _user(sessions, expired), await _user(sessions, 'not-a-jwt')
+
+    assert asyncio.run(scenario()) == (401, 401)
+
+def test_revocations_apply_on_every_worker(sessions):
+    async def scenario():
+        single, other = await _token(sessions), await _token(sessions)
+        assert await _user(sessions, single) == await _user(sessions, other) == 'alice'
+        async with sessions() as db:
+            await revoke_token(db, single)
+        revoked_here = await _user(sessions, single)
+        # A worker that never cached it checks the database
+        auth._token_cache.clear()
+        revoked_elsewhere = await _user(sessions, single)
+        still_valid = await _user(sessions, other)
+
+        async with sessions() as db:
+            await revoke_user_tokens(db, 'alice')
+        logged_out = await _user(sessions, other)
+        fresh = await _user(sessions, await _token(sessions))
+        return revoked_here, revoked_elsewhere, still_valid, logged_out, fresh
+
+    assert asyncio.run(scenario()) == (401, 401, 'alice', 401, 'alice')
@@ -0,0 +1,96 @@
+import time
+
+import pytest
+from xrpl.account import get_balance
+from xrpl.clients import JsonRpcClient
+from xrpl.models.transactions import Payment
+from xrpl.transaction import autofill_and_sign, submit
+from xrpl.wallet import Wallet
+
+from backend.src.integrations.balance_cache import DROPS_PER_XRP, BalanceCache
+
+@pytest.fixture
+def rpc(fake_rippled):
+    return JsonRpcClient(fake_rippled[0])
+
+def _pay(rpc, sender: Wallet, destination: str, drops: str = '1000000'):
+    payment = Payment(account=sender.classic_address, destination=destination, amount=drops)
+    submit(autofill_and_sign(transaction=payment, wallet=sender, client=rpc), rpc)
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+def _streaming_cache(fetch, ws_url):
+    cache = BalanceCache(fetch, ws_url)
+    # Misses are only cached once the stream is up
+    cache._ensure_stream()
+    assert _wait_for(cache._connected.is_set)
+    return cache
+
+class CountingFetch:
+    def __init__(self, rpc):
+        self.rpc = rpc
+        self.calls = 0
+
+    def __call__(self, address):
+        self.calls += 1
+        return get_balance(address, self.rpc) / DROPS_PER_XRP
+
+def test_stream_keeps_cached_balance_fresh(fake_rippled, rpc):
+    sender, destination = Wallet.create(), Wallet.create().classic_address
+    fetch = CountingFetch(rpc)
+    cache = _streaming_cache(fetch, fake_rippled[1])
+    try:
+        before = cache.get(sender.classic_address)
+        assert cache.get(sender.classic_address) == before
+        assert (cache.hits, cache.misses, fetch.calls) == (1, 1, 1)
+
+        _pay(rpc, sender, destination)
+        actual = get_balance(sender.classic_address, rpc) / DROPS_PER_XRP
+        assert actual < before
+        assert _wait_for(lambda: cache.get(sender.classic_address) == actual)
+        assert fetch.calls == 1
+    finally:
+        cache.close()
+
+def test_payment_during_fetch_is_not_overwritten(fake_rippled, rpc):
+    sender, destination = Wallet.create(), Wallet.create().classic_address
+    fetch = CountingFetch(rpc)
+
+    def racing_fetch(address):
+        balance = fetch(address)
+        if fetch.calls == 1:
+            # Lands after the read but before the balance is cached
+            _pay(rpc, sender, destination)
+            _wait_for(lambda: cache._versions.get(address, 0) > 0)
+        return balance
+
+    cache = _streaming_cache(racing_fetch, fake_rippled[1])
+    try:
+        cache.get(sender.classic_address)
+        actual = get_balance(sender.classic_address, rpc) / DROPS_PER_XRP
+        assert cache.get(sender.classic_address) == actual
+        assert fetch.calls == 1
+    finally:
+        cache.close()
+
+def test_misses_fall_through_at_once_while_the_stream_is_down(rpc):
+    fetch = CountingFetch(rpc)
+    # Nothing listens there, so the stream never connects
+    cache = BalanceCache(fetch, 'ws://127.0.0.1:9/', subscribe_timeout=5)
+    try:
+        address = Wallet.create().classic_address
+        start = time.monotonic()
+        cache.get(address)
+        cache.get(address)
+        # Without waiting out subscribe_timeout, and nothing cached
+        assert time.monotonic() - start < 2
+        assert fetch.calls == 2
+        assert cache.hits == 0
+    finally:
+        cache.close()
@@ -0,0 +1,67 @@
+import pytest
+
+from scripts.community_onboarding import CommunityOnboardingEngine, TermVocabulary
+
+LEADER = 'rLeader'
+
+def test_bulk_ingest_adds_members_and_reports_conflicts():
+    engine = CommunityOnboardingEngine(LEADER)
+    result = engine.add_members_bulk([
+        {'wallet_address': 'rA', 'skills': ['rust'], 'interests': ['defi']},
+        ('rB', ['rust', 'python'], []),
+        {'wallet_address': 'rA', 'skills': ['go']},
+        {'wallet_address': LEADER},
+        {'skills': ['python']},
+    ], chunk_size=2)
+    assert result.added == 2
+    assert [(position, wallet) for position, wallet, _ in result.conflicts] == [(2, 'rA'), (3, LEADER), (4, None)]
+    assert engine.members['rB'].skills == ['rust', 'python']
+    assert {member.wallet_address for member in engine.match_potential_collaborators(['rust'], [])} == {'rA', 'rB'}
+
+@pytest.mark.parametrize('record', [
+    {'wallet_address': 'rBad', 'skills': [['x']]},
+    {'wallet_address': 'rBad', 'interests': [None]},
+    {'wallet_address': 'rBad', 'skills': 'rust'},
+    {'wallet_address': ['rBad']},
+])
+def test_malformed_terms_are_conflicts_not_reservations(record):
+    engine = CommunityOnboardingEngine(LEADER)
+    result = engine.add_members_bulk([{'wallet_address': 'rC', 'skills': ['rust']}, record, ('rD', ['go'], [])])
+    assert result.added == 2
+    assert [position for position, _, _ in result.conflicts] == [1]
+    assert sorted(engine.members) == sorted([LEADER, 'rC', 'rD'])
+    assert engine.members['rD'].skills == ['go']
+    # The bad record's wallet was never reserved
+    assert engine.add_member('rBad', ['go'], []).wallet_address == 'rBad'
+
+def test_failed_chunk_undoes_its_reservations(monkeypatch):
+    engine = CommunityOnboardingEngine(LEADER)
+    engine.add_members_bulk([('rA', ['rust'], [])])
+    encode = TermVocabulary.encode
+
+    def failing_encode(vocabulary, terms):
+        if 'explode' in terms:
+            raise MemoryError
+        return encode(vocabulary, terms)
+
+    monkeypatch.setattr(TermVocabulary, 'encode', failing_encode)
+    with pytest.raises(MemoryError):
+        engine.add_members_bulk([('rB', ['rust'], []), ('rC', ['explode'], [])])
+    monkeypatch.undo()
+
+    assert sorted(engine.members) == ['rA', LEADER]
+    assert len(engine._row_wallets) == 2
+    assert [member.wallet_address for member in engine.match_potential_collaborators(['rust'], [])] == ['rA']
+    assert engine.add_member('rB', ['rust'], []).wallet_address == 'rB'
+
+def test_failing_input_keeps_records_read_so_far():
+    def records():
+        yield ('rA', ['rust'], [])
+        yield ('rB', ['go'], [])
+        raise IOError("connection reset")
+
+    engine = CommunityOnboardingEngine(LEADER)
+    with pytest.raises(IOError):
+        engine.add_members_bulk(records())
+    assert sorted(engine.members) == sorted([LEADER, 'rA', 'rB'])
+    assert engine.members['rB'].skills == ['go']
@@ -0,0 +1,64 @@
+import gzip
+import json
+
+import pytest
+
+from scripts.community_onboarding import CommunityOnboardingEngine
+
+LEADER = 'rLeader'
+
+def _read(path):
+    opener = gzip.open if str(path).endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        header, *records = (json.loads(line) for line in f)
+    return header, records
+
+def _engine():
+    engine = CommunityOnboardingEngine(LEADER)
+    engine.add_member('rA', ['rust'], ['defi'])
+    engine.add_member('rB', ['python'], [])
+    return engine
+
+@pytest.mark.parametrize('name', ['community.ndjson', 'community.ndjson.gz'])
+def test_full_export_round_trips(tmp_path, name):
+    engine = _engine()
+    path = tmp_path / name
+    checkpoint = engine.export_community_ndjson(str(path))
+    header, records = _read(path)
+    assert header['checkpoint'] == checkpoint
+    assert header['total_members'] == header['exported_members'] == 3
+    assert [record['wallet_address'] for record in records] == [LEADER, 'rA', 'rB']
+
+    rebuilt = CommunityOnboardingEngine.from_ndjson(str(path))
+    assert dict(rebuilt.members) == dict(engine.members)
+    # The snapshot's checkpoint stays valid: nothing changed since
+    assert rebuilt.export_community_ndjson(str(tmp_path / 'delta.ndjson'), since=checkpoint) >= checkpoint
+    assert _read(tmp_path / 'delta.ndjson')[1] == []
+
+def test_delta_export_holds_only_changes(tmp_path):
+    engine = _engine()
+    checkpoint = engine.export_community_ndjson(str(tmp_path / 'full.ndjson'))
+    engine.update_member('rA', skills=['go'])
+    engine.add_member('rC', ['nft'], [])
+    next_checkpoint = engine.export_community_ndjson(str(tmp_path / 'delta.ndjson'), since=checkpoint)
+
+    header, records = _read(tmp_path / 'delta.ndjson')
+    assert header['since'] == checkpoint and header['exported_members'] == 2
+    assert [(record['wallet_address'], record['skills']) for record in records] == [('rA', ['go']), ('rC', ['nft'])]
+    assert engine.export_community_ndjson(str(tmp_path / 'empty.ndjson'), since=next_checkpoint) == next_checkpoint
+    assert _read(tmp_path / 'empty.ndjson')[1] == []
+
+def test_delta_applies_to_a_rebuilt_copy(tmp_path):
+    engine = _engine()
+    checkpoint = engine.export_community_ndjson(str(tmp_path / 'full.ndjson'))
+    replica = CommunityOnboardingEngine.from_ndjson(str(tmp_path / 'full.ndjson'))
+
+    engine.update_member('rB', interests=['gaming'])
+    engine.add_member('rC', ['nft'], [])
+    engine.export_community_ndjson(str(tmp_path / 'delta.ndjson'), since=checkpoint)
+    assert replica.import_community_ndjson(str(tmp_path / 'delta.ndjson'), preserve_versions=True) == 2
+
+    assert dict(replica.members) == dict(engine.members)
+    assert [member.wallet_address for member in replica.match_potential_collaborators([], ['gaming'])] == ['rB']
+    # The replica's next delta starts where the source's would
+    assert replica.change_version >= engine.change_version
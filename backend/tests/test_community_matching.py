@@ -0,0 +1,44 @@
+from scripts.community_onboarding import CommunityOnboardingEngine
+
+LEADER = 'rLeader'
+
+def _wallets(members):
+    return [member.wallet_address for member in members]
+
+def _engine():
+    engine = CommunityOnboardingEngine(LEADER)
+    engine.add_member('rA', ['rust'], ['defi'])
+    engine.add_member('rB', ['rust', 'python'], [])
+    engine.add_member('rC', ['python'], ['defi', 'nft'])
+    engine.add_member('rD', ['go'], ['gaming'])
+    return engine
+
+def test_ranked_by_shared_skills_then_join_order():
+    engine = _engine()
+    assert _wallets(engine.match_potential_collaborators(['rust', 'python'], ['defi'])) == ['rB', 'rA', 'rC']
+    assert _wallets(engine.match_potential_collaborators(['rust', 'python'], [], limit=2)) == ['rB', 'rA']
+    # Members sharing nothing are never scored
+    assert _wallets(engine.match_potential_collaborators(['haskell'], [])) == []
+
+def test_interest_weight_counts_shared_interests():
+    engine = _engine()
+    matches = engine.match_potential_collaborators(['python'], ['defi', 'nft'], interest_weight=1.0)
+    # rA (defi) and rB (python) tie, the earlier member first
+    assert _wallets(matches) == ['rC', 'rA', 'rB']
+
+def test_updates_move_members_between_index_entries():
+    engine = _engine()
+    engine.update_member('rA', skills=['go'])
+    assert _wallets(engine.match_potential_collaborators(['rust'], [])) == ['rB']
+    assert _wallets(engine.match_potential_collaborators(['go'], [])) == ['rA', 'rD']
+
+    # Moving back revives the tombstoned entry instead of indexing it twice
+    engine.update_member('rA', skills=['rust'])
+    assert _wallets(engine.match_potential_collaborators(['rust'], [])) == ['rA', 'rB']
+
+    # Enough removals compact the term's packed rows
+    for wallet in ('rA', 'rB'):
+        engine.update_member(wallet, skills=['go'])
+    assert 'rust' not in engine._skill_tombstones
+    assert list(engine.skill_index['rust']) == []
+    assert _wallets(engine.match_potential_collaborators(['go'], [])) == ['rA', 'rB', 'rD']
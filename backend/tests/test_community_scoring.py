@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from scripts.community_onboarding import CommunityOnboardingEngine
+
+LEADER = 'rLeader'
+
+def _engine(**kwargs):
+    engine = CommunityOnboardingEngine(LEADER, **kwargs)
+    engine.add_member('rA', ['rust'], ['defi'])
+    engine.add_member('rB', ['rust', 'python', 'go'], [])
+    engine.add_member('rC', [], ['defi', 'nft'])
+    return engine
+
+def test_batch_scores_match_the_weighted_features():
+    engine = _engine()
+    # The leader joins with three skills and three interests
+    assert engine.calculate_contribution_scores().tolist() == pytest.approx([2.4, 0.8, 1.5, 0.6])
+    assert engine.calculate_contribution_scores(['rC', 'rUnknown', 'rA']).tolist() == pytest.approx([0.6, 0.0, 0.8])
+    assert engine.calculate_contribution_score('rB') == pytest.approx(1.5)
+    assert engine.calculate_contribution_score('rUnknown') == 0.0
+    assert engine.members['rA'].contribution_score == pytest.approx(0.8)
+
+def test_updates_and_new_weights_rescore():
+    engine = _engine()
+    engine.calculate_contribution_scores()
+    engine.update_member('rC', skills=['python'])
+    assert engine.calculate_contribution_score('rC') == pytest.approx(1.1)
+
+    engine.set_score_weights({'interest_count': 1.0})
+    assert engine.calculate_contribution_scores().tolist() == [3.0, 1.0, 0.0, 2.0]
+    with pytest.raises(ValueError):
+        engine.set_score_weights({'tenure': 1.0})
+
+def test_leaderboard_is_best_first_with_stable_ties():
+    engine = _engine(score_weights={'skill_count': 1.0})
+    engine.add_member('rD', ['a', 'b', 'c'], [])
+    assert engine.contribution_leaderboard(top_n=3) == [(LEADER, 3.0), ('rB', 3.0), ('rD', 3.0)]
+    assert [wallet for wallet, _ in engine.contribution_leaderboard()] == [LEADER, 'rB', 'rD', 'rA', 'rC']
+    assert engine.contribution_leaderboard(top_n=0) == []
+
+def test_scores_survive_column_growth():
+    engine = CommunityOnboardingEngine(LEADER, score_weights={'skill_count': 1.0})
+    engine.add_members_bulk((f'r{i}', ['x'] * (i % 5), []) for i in range(3000))
+    scores = engine.calculate_contribution_scores()
+    assert scores.size == 3001
+    assert np.array_equal(scores[1:], np.arange(3000) % 5)
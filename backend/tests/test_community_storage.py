@@ -0,0 +1,51 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from scripts.community_onboarding import CommunityMember, CommunityOnboardingEngine, TermVocabulary
+
+LEADER = 'rLeader'
+
+def test_vocabulary_interns_each_term_once():
+    vocabulary = TermVocabulary()
+    first = vocabulary.encode(['rust', 'go', 'rust'])
+    second = vocabulary.encode(['go', 'python'])
+    assert vocabulary.terms == ['rust', 'go', 'python']
+    # Packed uint32 ids, order and repeats kept
+    assert len(first) == 12
+    assert vocabulary.decode(first) == ['rust', 'go', 'rust']
+    assert vocabulary.decode(second) == ['go', 'python']
+    assert vocabulary.decode(vocabulary.encode([])) == []
+
+def test_members_materialize_from_the_columns():
+    engine = CommunityOnboardingEngine(LEADER)
+    before = datetime.now()
+    added = engine.add_member('rA', ['rust', 'go'], ['defi'])
+    member = engine.members['rA']
+    assert isinstance(member, CommunityMember)
+    assert member == added
+    assert (member.skills, member.interests) == (['rust', 'go'], ['defi'])
+    assert uuid.UUID(member.id)
+    assert before <= datetime.fromisoformat(member.joined_at) <= datetime.now()
+
+    # Identity and join date survive updates; only the changed column moves
+    updated = engine.update_member('rA', interests=['nft'])
+    assert (updated.id, updated.joined_at, updated.skills, updated.interests) == (member.id, member.joined_at, ['rust', 'go'], ['nft'])
+
+def test_member_view_is_a_read_only_mapping():
+    engine = CommunityOnboardingEngine(LEADER)
+    for i in range(2000):
+        engine.add_member(f'r{i}', ['shared'], [])
+    assert len(engine.members) == 2001
+    assert list(engine.members)[:3] == [LEADER, 'r0', 'r1']
+    assert 'r1999' in engine.members and 'rMissing' not in engine.members
+    assert engine.members['r1999'].skills == ['shared']
+    # Two thousand members, one interned copy of the term
+    assert engine.skill_vocabulary.terms.count('shared') == 1
+    with pytest.raises(KeyError):
+        engine.members['rMissing']
+    with pytest.raises(TypeError):
+        engine.members['rNew'] = None
+    with pytest.raises(ValueError):
+        engine.update_member('rMissing', skills=['go'])
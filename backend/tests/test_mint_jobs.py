@@ -0,0 +1,124 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+from src.eon_xrp.jobs import FAILED, QUEUED, SUCCEEDED, MintJob, MintJobQueue
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(BACKEND_DIR)
+
+def _queue(tmp_path, handlers, **kwargs):
+    options = dict(concurrency=2, max_attempts=2, backoff_seconds=0, poll_seconds=0.05, lease_seconds=3)
+    options.update(kwargs)
+    return MintJobQueue(handlers, database_url=f"sqlite:///{tmp_path / 'jobs.db'}", **options)
+
+async def _until_finished(queue, job_id, timeout=5.0):
+    async def poll():
+        while True:
+            job = await queue.get(job_id)
+            if job['status'] in (SUCCEEDED, FAILED):
+                return job
+            await asyncio.sleep(0.02)
+    return await asyncio.wait_for(poll(), timeout)
+
+async def _row(queue, job_id):
+    async with queue._sessions() as db:
+        return await db.get(MintJob, job_id)
+
+def test_failed_attempt_is_retried(tmp_path):
+    attempts = []
+
+    async def flaky(payload, state):
+        attempts.append(payload)
+        if len(attempts) == 1:
+            raise ConnectionError("node unreachable")
+        return {'status': 'success', 'name': payload['name']}
+
+    async def scenario():
+        queue = _queue(tmp_path, {'nft_collection': flaky})
+        await queue.start()
+        try:
+            job = await queue.enqueue('nft_collection', {'name': 'Eon'})
+            assert job['status'] == QUEUED
+            return await _until_finished(queue, job['job_id'])
+        finally:
+            await queue.stop()
+
+    job = asyncio.run(scenario())
+    assert job['status'] == SUCCEEDED
+    assert job['attempts'] == 2
+    assert job['result'] == {'status': 'success', 'name': 'Eon'}
+
+def test_recorder_failure_releases_the_job(tmp_path):
+    recorded = []
+
+    async def mint(payload, state):
+        return {'status': 'success'}
+
+    async def recorder(db, kind, payload, result):
+        recorded.append(kind)
+        raise RuntimeError("UNIQUE constraint failed: token_registry.tx_hash")
+
+    async def scenario():
+        queue = _queue(tmp_path, {'nft_collection': mint}, recorders={'nft_collection': recorder})
+        await queue.start()
+        try:
+            job = await queue.enqueue('nft_collection', {})
+            finished = await _until_finished(queue, job['job_id'])
+            return finished, await _row(queue, job['job_id']), set(queue._running)
+        finally:
+            await queue.stop()
+
+    job, row, running = asyncio.run(scenario())
+    # Retried, then failed; never left running under this process's lease
+    assert job['status'] == FAILED
+    assert job['attempts'] == 2
+    assert 'UNIQUE constraint failed' in job['error']
+    assert row.locked_by is None and row.lease_expires_at is None
+    assert recorded == ['nft_collection', 'nft_collection']
+    assert running == set()
+
+def test_watch_follows_a_job_run_by_another_process(tmp_path):
+    async def slow_mint(payload, state):
+        await asyncio.sleep(0.5)
+        return {'status': 'success'}
+
+    async def scenario():
+        # Shares the database but runs no workers, like a second app process
+        watcher = _queue(tmp_path, {'nft_collection': slow_mint}, concurrency=0, watch_poll_seconds=0.05)
+        runner = _queue(tmp_path, {'nft_collection': slow_mint})
+        await watcher.start()
+        await runner.start()
+        try:
+            job = await watcher.enqueue('nft_collection', {})
+            updates = []
+            async for update in watcher.watch(job['job_id'], heartbeat_seconds=0.1):
+                updates.append(update)
+            return updates
+        finally:
+            await runner.stop()
+            await watcher.stop()
+
+    updates = asyncio.run(asyncio.wait_for(scenario(), 10))
+    statuses = [update['status'] for update in updates if update is not None]
+    # Ends by itself once the other process finishes the job
+    assert statuses[0] == QUEUED and statuses[-1] == SUCCEEDED
+    assert 'running' in statuses
+    assert None in updates
+
+def test_both_apps_default_to_the_same_database(tmp_path):
+    env = {key: value for key, value in os.environ.items() if key not in ('DATABASE_URL', 'MINT_JOBS_DATABASE_URL')}
+    env.update(PYTHONPATH='', LOG_DIR=str(tmp_path))
+
+    def url(cwd, statement):
+        # Each app started the way it is deployed: the backend from backend/, eon_xrp from the root
+        printed = subprocess.run([sys.executable, '-c', statement], cwd=cwd, env=env, capture_output=True, text=True, timeout=120)
+        assert printed.returncode == 0, printed.stderr
+        return printed.stdout.strip().splitlines()[-1]
+
+    backend = url(BACKEND_DIR, "import src.database as d; print(d.DATABASE_URL)")
+    jobs = url(REPO_ROOT, "import src.eon_xrp.jobs as j; print(j.MINT_JOBS_DATABASE_URL)")
+    assert backend == jobs == f"sqlite:///{os.path.join(REPO_ROOT, 'eonxrp.db')}"
+    # Logs land in LOG_DIR, not in whichever directory the app started from
+    assert sorted(os.listdir(tmp_path)) == ['eonxrp.log']
@@ -0,0 +1,95 @@
+import asyncio
+import socket
+import time
+
+import httpx
+import pytest
+from xrpl.models.requests import ServerInfo
+from xrpl.models.transactions import Payment
+from xrpl.wallet import Wallet
+
+from backend.src.integrations.node_pool import NodePool
+from src.eon_xrp.async_client import PooledAsyncJsonRpcClient
+from src.eon_xrp.main import XRPL_LOOKUP_TIMEOUT, EONXRPPlatform
+
+class Checkpoint:
+    def __init__(self):
+        self.data = {}
+        self.saves = 0
+
+    async def save(self):
+        self.saves += 1
+
+@pytest.fixture
+def platform(fake_rippled, monkeypatch):
+    monkeypatch.setenv('XRPL_RPC_URL', fake_rippled[0])
+    return EONXRPPlatform()
+
+def test_mint_succeeds_once_validated(platform):
+    async def scenario():
+        try:
+            return await platform.create_nft_collection(Wallet.create(), 'Eon Genesis', 'First drop', checkpoint=Checkpoint())
+        finally:
+            await platform.close()
+
+    result = asyncio.run(scenario())
+    assert result['status'] == 'success', result
+    assert result['uri_slug'] == 'eon-genesis'
+    assert isinstance(result['ledger_index'], int)
+
+def test_tec_result_is_a_failure(platform):
+    wallet = Wallet.create()
+    checkpoint = Checkpoint()
+    # More than the account holds: applied with tecUNFUNDED_PAYMENT, fee taken
+    payment = Payment(account=wallet.classic_address, destination=Wallet.create().classic_address, amount=str(10**17))
+
+    async def scenario():
+        try:
+            await platform._sign_and_submit(payment, wallet, checkpoint)
+        finally:
+            await platform.close()
+
+    with pytest.raises(RuntimeError, match='tecUNFUNDED_PAYMENT'):
+        asyncio.run(scenario())
+    # A retry signs a new transaction instead of reporting the old one
+    assert checkpoint.data == {}
+
+def test_request_timeout_overrides_the_client_default():
+    # Accepts connections but never answers
+    with socket.socket() as silent:
+        silent.bind(('127.0.0.1', 0))
+        silent.listen()
+        client = PooledAsyncJsonRpcClient(NodePool([f"http://127.0.0.1:{silent.getsockname()[1]}/"]), timeout=30)
+
+        async def scenario():
+            try:
+                await client.request_with_timeout(ServerInfo(), 0.2)
+            finally:
+                await client.aclose()
+
+        start = time.monotonic()
+        with pytest.raises(httpx.TimeoutException):
+            asyncio.run(scenario())
+    assert time.monotonic() - start < 5
+
+def test_slow_validation_lookup_is_polled_again(platform, monkeypatch):
+    timeouts = []
+    lookup = platform.client.request_with_timeout
+
+    async def slow_once(request, timeout):
+        timeouts.append(timeout)
+        if len(timeouts) == 1:
+            raise httpx.ReadTimeout("node too slow")
+        return await lookup(request, timeout)
+
+    monkeypatch.setattr(platform.client, 'request_with_timeout', slow_once)
+
+    async def scenario():
+        try:
+            return await platform.create_nft_collection(Wallet.create(), 'Eon Patience', 'Second drop', checkpoint=Checkpoint())
+        finally:
+            await platform.close()
+
+    result = asyncio.run(scenario())
+    assert result['status'] == 'success', result
+    assert len(timeouts) > 1 and set(timeouts) == {XRPL_LOOKUP_TIMEOUT}
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.src.models.token import RegisteredToken
+from backend.src.models.transaction import AccountTransaction
+from backend.src.models.user import Base
+from backend.src.services.token_registry import list_registered_tokens
+from backend.src.services.transaction_history import MAX_PAGE_SIZE, iter_transaction_history, parse_cursor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ADDRESS = 'rHistory'
+
+def _pages(fetch_page):
+    rows, cursor = [], None
+    while True:
+        page = fetch_page(cursor)
+        if not page:
+            return rows
+        rows.extend(page)
+        cursor = page[-1]['cursor']
+
+def test_transaction_history_pages_cover_every_row_once(db):
+    keys = [(ledger, index) for ledger in range(100, 110) for index in range(3)]
+    db.add_all(
+        AccountTransaction(account=ADDRESS, ledger_index=ledger, tx_index=index, tx_hash=f'{ledger}-{index}', tx_type='Payment', tx_json='{}')
+        for ledger, index in keys
+    )
+    db.add(AccountTransaction(account='rOther', ledger_index=105, tx_index=9, tx_json='{}'))
+    db.commit()
+
+    rows = _pages(lambda cursor: list(iter_transaction_history(db, ADDRESS, cursor=parse_cursor(cursor), limit=4, batch_size=3)))
+    assert [(row['ledger_index'], row['tx_index']) for row in rows] == sorted(keys, reverse=True)
+
+def test_transaction_history_full_export_crosses_batches(db):
+    db.add_all(
+        AccountTransaction(account=ADDRESS, ledger_index=ledger, tx_index=0, tx_json='{}')
+        for ledger in range(1, 8)
+    )
+    db.commit()
+    rows = list(iter_transaction_history(db, ADDRESS, batch_size=2))
+    assert [row['ledger_index'] for row in rows] == list(range(7, 0, -1))
+
+def test_malformed_history_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        parse_cursor('not-a-cursor')
+
+def test_token_registry_pages_cover_every_token_once(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'tokens.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        start = datetime(2024, 1, 1)
+        async with sessions() as db:
+            # Pairs share a created_at, so ties are broken by id
+            db.add_all(
+                RegisteredToken(kind='meme_token', symbol=f'T{i}', name=f'Token {i}', creator='rA' if i % 2 else 'rB', uri_slug=f't{i}', created_at=start + timedelta(seconds=i // 2))
+                for i in range(11)
+            )
+            await db.commit()
+
+        async def all_pages(**filters):
+            rows, cursor = [], None
+            async with sessions() as db:
+                while True:
+                    page = await list_registered_tokens(db, cursor=cursor, limit=3, **filters)
+                    if not page:
+                        return rows
+                    rows.extend(page)
+                    cursor = page[-1]['cursor']
+
+        everything = await all_pages()
+        by_creator = await all_pages(creator='rA')
+        async with sessions() as db:
+            with pytest.raises(ValueError):
+                await list_registered_tokens(db, sort='volume')
+        await engine.dispose()
+        return everything, by_creator
+
+    everything, by_creator = asyncio.run(scenario())
+    assert [row['symbol'] for row in everything] == [f'T{i}' for i in range(10, -1, -1)]
+    assert [row['symbol'] for row in by_creator] == [f'T{i}' for i in range(9, 0, -2)]
+
+@pytest.mark.parametrize('limit', [0, MAX_PAGE_SIZE + 1])
+def test_transaction_history_limit_is_bounded(limit):
+    # Served by the backend app itself, in a fresh interpreter started from backend/
+    script = (
+        "from fastapi.testclient import TestClient; import main; "
+        f"print(TestClient(main.app).get('/transaction/history/{ADDRESS}?limit={limit}').status_code)"
+    )
+    served = subprocess.run(
+        [sys.executable, '-c', script],
+        cwd=BACKEND_DIR,
+        env={**os.environ, 'PYTHONPATH': ''},
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert served.returncode == 0, served.stderr
+    assert served.stdout.strip().splitlines()[-1] == '422'
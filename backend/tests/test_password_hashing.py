@@ -0,0 +1,70 @@
+import asyncio
+
+from passlib.context import CryptContext
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from backend.src.models.stats import STATS_ROW_ID, PlatformStats
+from backend.src.models.user import Base, User
+from backend.src.schemas.user import UserCreate
+from backend.src.services.auth import authenticate_user, authenticate_user_async, create_user_async
+from backend.src.services.password_hashing import BCRYPT_ROUNDS, shutdown_hash_pool
+
+PASSWORD = 'correct horse battery'
+
+def _legacy_hash(password):
+    # A cost below BCRYPT_ROUNDS, as stored before the cost was raised
+    return CryptContext(schemes=['bcrypt'], bcrypt__default_rounds=4).hash(password)
+
+def _rounds(hashed_password):
+    return int(hashed_password.split('$')[2])
+
+def test_login_upgrades_an_outdated_cost(db):
+    db.add(User(username='alice', email='alice@example.com', hashed_password=_legacy_hash(PASSWORD)))
+    db.commit()
+
+    assert authenticate_user(db, 'alice', 'wrong password') is False
+    assert _rounds(db.query(User).one().hashed_password) == 4
+
+    user = authenticate_user(db, 'alice', PASSWORD)
+    upgraded = user.hashed_password
+    assert _rounds(upgraded) == BCRYPT_ROUNDS
+    # Current hashes are left alone
+    assert authenticate_user(db, 'alice', PASSWORD).hashed_password == upgraded
+
+def test_pool_hashing_creates_verifies_and_upgrades(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'users.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def login(username, password):
+            async with sessions() as db:
+                return await authenticate_user_async(db, username, password)
+
+        try:
+            async with sessions() as db:
+                created = await create_user_async(db, UserCreate(username='bob', email='bob@example.com', password=PASSWORD))
+                db.add(User(username='carol', email='carol@example.com', hashed_password=_legacy_hash(PASSWORD)))
+                await db.commit()
+            # Concurrent logins share the bounded pool
+            logins = await asyncio.gather(
+                login('bob', PASSWORD),
+                login('bob', 'wrong password'),
+                login('nobody', PASSWORD),
+                login('carol', PASSWORD),
+            )
+            async with sessions() as db:
+                users = await db.get(PlatformStats, STATS_ROW_ID)
+                stored = (await db.execute(select(User.hashed_password).where(User.username == 'carol'))).scalar_one()
+            return created, logins, users.total_users, stored
+        finally:
+            shutdown_hash_pool()
+            await engine.dispose()
+
+    created, logins, total_users, stored = asyncio.run(scenario())
+    assert _rounds(created.hashed_password) == BCRYPT_ROUNDS
+    assert logins[0].username == 'bob' and logins[1:3] == [False, False]
+    assert logins[3].username == 'carol' and _rounds(stored) == BCRYPT_ROUNDS
+    assert total_users == 1
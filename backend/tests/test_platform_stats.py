@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from sqlalchemy import null
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from xrpl.wallet import Wallet
+
+from backend.src.models.rewards import RewardDistribution, RewardPoolCredit
+from backend.src.models.stats import STATS_ROW_ID, PlatformPayment, PlatformStats
+from backend.src.models.user import Base
+from backend.src.services import platform_stats
+from backend.src.services.platform_stats import (
+    EXPIRED_RESULT,
+    confirm_payments,
+    reconcile_platform_stats,
+    record_payment,
+    settle_payment,
+)
+# Registers the community pool reconciler
+from backend.src.services import reward_distribution  # noqa: F401
+
+class StubLedger:
+    def __init__(self, results, validated_ledger):
+        self.results = results
+        self.validated_ledger = validated_ledger
+
+    def get_validated_result(self, tx_hash):
+        return self.results.get(tx_hash)
+
+    def get_validated_ledger_index(self):
+        return self.validated_ledger
+
+@pytest.fixture
+def sessions(db, monkeypatch):
+    # confirm_payments opens its own sessions; point them at the test database
+    monkeypatch.setattr(platform_stats, 'SessionLocal', sessionmaker(bind=db.get_bind()))
+
+def _volume(db):
+    db.expire_all()
+    stats = db.get(PlatformStats, STATS_ROW_ID)
+    return stats.total_volume_drops if stats else 0
+
+def test_only_validated_successful_payments_add_volume(db, sessions):
+    for tx_hash, last_ledger_sequence in (('OK', 10), ('TEC', 10), ('EXPIRED', 10), ('PENDING', 20)):
+        record_payment(db, tx_hash, 'rSender', 'rRecipient', 570_000, last_ledger_sequence)
+    db.commit()
+
+    ledger = StubLedger({'OK': 'tesSUCCESS', 'TEC': 'tecUNFUNDED_PAYMENT'}, validated_ledger=11)
+    confirm_payments(ledger, ['OK', 'TEC', 'EXPIRED', 'PENDING'], timeout=0)
+    assert _volume(db) == 570_000
+    assert dict(db.query(PlatformPayment.tx_hash, PlatformPayment.result)) == {
+        'OK': 'tesSUCCESS',
+        'TEC': 'tecUNFUNDED_PAYMENT',
+        'EXPIRED': EXPIRED_RESULT,
+        'PENDING': None,
+    }
+
+    # A second confirmer of the same payment does not count it again
+    assert not settle_payment(db, 'OK', 'tesSUCCESS')
+    assert _volume(db) == 570_000
+
+def test_reconciliation_recomputes_volume_and_pool(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'stats.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions() as db:
+            db.add(PlatformStats(id=STATS_ROW_ID, total_volume_drops=123, community_reward_pool_drops=456))
+            db.add_all([
+                PlatformPayment(tx_hash='A', sender='rS', recipient='rR', drops=2_010_000, result='tesSUCCESS'),
+                PlatformPayment(tx_hash='B', sender='rS', recipient='rR', drops=5_000_000, result='tecUNFUNDED_PAYMENT'),
+                PlatformPayment(tx_hash='C', sender='rS', recipient='rR', drops=7_000_000),
+                RewardPoolCredit(drops=10_000_000),
+                RewardPoolCredit(drops=5_000_000),
+            ])
+            common = dict(input_digest='', min_payout_drops=1, batch_size=1, recipients=1, active=null())
+            db.add_all([
+                RewardDistribution(id='pool', status='completed', pool_drops=10_000_000, from_pool=True, delivered_drops=9_000_000, **common),
+                RewardDistribution(id='explicit', status='completed', pool_drops=4_000_000, from_pool=False, delivered_drops=4_000_000, **common),
+            ])
+            await db.commit()
+            await reconcile_platform_stats(db)
+            stats = await db.get(PlatformStats, STATS_ROW_ID)
+            await db.refresh(stats)
+        await engine.dispose()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert stats.total_volume_drops == 2_010_000
+    assert stats.community_reward_pool_drops == 6_000_000
+
+def test_send_transaction_counts_exact_drops_once_validated(db, sessions, fake_rippled, monkeypatch):
+    monkeypatch.setenv('XRPL_RPC_URL', fake_rippled[0])
+    monkeypatch.setenv('XRPL_WS_URL', fake_rippled[1])
+    from backend.src.integrations.xrpl_client import XRPLClient
+
+    client = XRPLClient()
+    try:
+        sender, recipient = Wallet.create(), Wallet.create().classic_address
+        # int(2.01 * 1_000_000) would be 2009999
+        sent = client.send_transaction(sender, recipient, 2.01)
+        # Accepted for consensus, but more than the account holds
+        unfunded = client.send_transaction(sender, recipient, 10**11)
+        # Below one drop: refused before anything is signed
+        assert client.send_transaction(sender, recipient, 1e-7)['status'] == 'error'
+
+        assert sent['status'] == 'success' and sent['amount_drops'] == 2_010_000
+        assert unfunded['status'] == 'success' and unfunded['engine_result'] == 'tecUNFUNDED_PAYMENT'
+        for result in (sent, unfunded):
+            record_payment(db, result['transaction_hash'], sender.classic_address, recipient, result['amount_drops'], result['last_ledger_sequence'])
+        db.commit()
+        confirm_payments(client, [sent['transaction_hash'], unfunded['transaction_hash']], timeout=30, poll=0.5)
+    finally:
+        client.close()
+
+    assert dict(db.query(PlatformPayment.tx_hash, PlatformPayment.result)) == {
+        sent['transaction_hash']: 'tesSUCCESS',
+        unfunded['transaction_hash']: 'tecUNFUNDED_PAYMENT',
+    }
+    assert _volume(db) == 2_010_000
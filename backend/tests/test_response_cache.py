@@ -0,0 +1,72 @@
+import asyncio
+
+from starlette.requests import Request
+
+from backend.src.utils.response_cache import ResponseCache, etag_matches
+
+def _request(path='/admin/tokens', query='', if_none_match=None):
+    headers = [(b'if-none-match', if_none_match.encode())] if if_none_match else []
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'path': path,
+        'query_string': query.encode(),
+        'headers': headers,
+    })
+
+def test_etag_revalidation_answers_304():
+    async def scenario():
+        cache = ResponseCache()
+        first = await cache.serve(_request(), lambda: {'tokens': [1, 2]})
+        etag = first.headers['etag']
+        repeat = await cache.serve(_request(if_none_match=etag), lambda: {'tokens': [1, 2]})
+        stale = await cache.serve(_request(if_none_match='"other"'), lambda: {'tokens': [1, 2]})
+        return first, repeat, stale
+
+    first, repeat, stale = asyncio.run(scenario())
+    assert first.status_code == 200 and first.body == b'{"tokens":[1,2]}'
+    assert repeat.status_code == 304 and repeat.body == b''
+    assert repeat.headers['etag'] == first.headers['etag']
+    assert stale.status_code == 200
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches('*', '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+
+def test_concurrent_misses_share_one_computation():
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {'calls': calls}
+
+    async def scenario():
+        cache = ResponseCache()
+        responses = await asyncio.gather(*(cache.serve(_request(query='limit=5'), compute) for _ in range(20)))
+        # Same path, different query: a separate entry
+        other = await cache.serve(_request(query='limit=6'), compute)
+        return responses, other
+
+    responses, other = asyncio.run(scenario())
+    assert {response.body for response in responses} == {b'{"calls":1}'}
+    assert other.body == b'{"calls":2}'
+    assert calls == 2
+
+def test_entries_expire_and_can_be_invalidated():
+    bodies = iter([b'one', b'two', b'three'])
+
+    async def scenario():
+        cache = ResponseCache()
+        first = await cache.serve(_request(), lambda: next(bodies), ttl=60)
+        cached = await cache.serve(_request(), lambda: next(bodies), ttl=60)
+        cache.invalidate('/admin/tokens')
+        refreshed = await cache.serve(_request(), lambda: next(bodies), ttl=0)
+        expired = await cache.serve(_request(), lambda: next(bodies), ttl=0)
+        return first, cached, refreshed, expired
+
+    first, cached, refreshed, expired = asyncio.run(scenario())
+    assert (first.body, cached.body, refreshed.body, expired.body) == (b'one', b'one', b'two', b'three')
@@ -0,0 +1,235 @@
+import json
+from collections import Counter
+from fractions import Fraction
+
+import numpy as np
+import pytest
+from xrpl.core.binarycodec import decode
+from xrpl.models.transactions import Payment
+from xrpl.models.transactions.transaction import Transaction
+from xrpl.transaction import sign
+from xrpl.wallet import Wallet
+
+from backend.src.integrations.signing_service import SignedTransaction
+from backend.src.models.rewards import RewardBatch, RewardCarry, RewardDistribution
+from backend.src.models.stats import STATS_ROW_ID, PlatformStats
+from backend.src.services.reward_distribution import (
+    RewardDistributor,
+    allocate,
+    check_batch_size,
+    credit_reward_pool,
+    pro_rata_shares,
+    recipients_from_pairs,
+)
+
+class _Response:
+    def __init__(self, **result):
+        self.result = result
+
+class StubLedger:
+    """
+    XRPLClient stand-in: applies each payment once, keyed by its hash
+    """
+
+    def __init__(self, lose_response_on=None):
+        self.sequence = 1
+        self.applied = {}  # hash -> decoded payment
+        self.submissions = 0
+        self.lose_response_on = lose_response_on
+
+    def prepare_payments(self, account, payments):
+        prepared = []
+        for destination, drops in payments:
+            prepared.append(Payment(
+                account=account,
+                destination=destination,
+                amount=drops,
+                sequence=self.sequence,
+                fee='10',
+                last_ledger_sequence=100
+            ))
+            self.sequence += 1
+        return prepared
+
+    def submit_blob(self, tx_blob, account=None):
+        self.submissions += 1
+        tx_hash = _hash(tx_blob)
+        if tx_hash in self.applied:
+            return _Response(engine_result='tefALREADY')
+        self.applied[tx_hash] = decode(tx_blob)
+        if self.submissions == self.lose_response_on:
+            # Applied, but the caller never hears about it
+            raise ConnectionError("connection reset")
+        return _Response(engine_result='tesSUCCESS')
+
+    def get_validated_result(self, tx_hash):
+        return 'tesSUCCESS' if tx_hash in self.applied else None
+
+    def get_validated_ledger_index(self):
+        return 1
+
+    def paid(self):
+        return Counter(tx['Destination'] for tx in self.applied.values())
+
+class StubSigning:
+    def __init__(self):
+        self.wallet = Wallet.create()
+
+    def key_addresses(self):
+        return {'reward_pool': self.wallet.classic_address}
+
+    def sign_batch(self, items):
+        signed = []
+        for key_id, transaction in items:
+            transaction = sign(transaction, self.wallet)
+            signed.append(SignedTransaction(key_id, transaction.blob(), transaction.get_hash()))
+        return signed
+
+def _hash(tx_blob):
+    return Transaction.from_blob(tx_blob).get_hash()
+
+def _addresses(count):
+    return [Wallet.create().classic_address for _ in range(count)]
+
+def test_pro_rata_shares_are_exact_floors():
+    weights = np.array([2**62, 2**62 - 1, 3, 0], dtype=np.int64)
+    pool = 10**17 + 7
+    total = sum(int(w) for w in weights)
+    expected = [int(Fraction(pool * int(w), total)) for w in weights]
+    assert pro_rata_shares(weights, pool).tolist() == expected
+
+def test_remainder_stays_in_pool_and_small_shares_carry():
+    allocation = allocate(np.array([1, 1, 1], dtype=np.int64), 100, np.zeros(3, dtype=np.int64), min_payout_drops=1)
+    assert allocation.payouts.tolist() == [33, 33, 33]
+    assert allocation.remainder_drops == 1
+    assert allocation.distributed_drops + allocation.carried_drops + allocation.remainder_drops == 100
+
+    carried = allocate(np.array([1, 1, 1], dtype=np.int64), 100, np.zeros(3, dtype=np.int64), min_payout_drops=50)
+    assert carried.payouts.tolist() == [0, 0, 0]
+    assert carried.carry.tolist() == [33, 33, 33]
+
+    # Carried drops are owed on top of the next share
+    paid = allocate(np.array([1, 1, 1], dtype=np.int64), 100, carried.carry, min_payout_drops=50)
+    assert paid.payouts.tolist() == [66, 66, 66]
+    assert paid.carry.tolist() == [0, 0, 0]
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        check_batch_size(0)
+
+def test_resume_does_not_pay_twice(db):
+    addresses = _addresses(5)
+    recipients = recipients_from_pairs(zip(addresses, [1, 2, 3, 4, 5]))
+    # The first payment of the second batch lands, but its response is lost
+    ledger = StubLedger(lose_response_on=3)
+    distributor = RewardDistributor(ledger, StubSigning(), validation_timeout=1, validation_poll=0)
+
+    allocation = distributor.plan(db, recipients, pool_drops=15_000_000, min_payout_drops=1)
+    distribution = distributor.create(db, recipients, allocation, min_payout_drops=1, batch_size=2)
+    distribution = distributor.run(db, distribution.id, recipients)
+    assert distribution.status == 'interrupted'
+    assert distribution.batches_done == 1
+
+    assert distributor.claim(db, distribution.id)
+    # Held by this run now
+    assert not distributor.claim(db, distribution.id)
+    distribution = distributor.run(db, distribution.id, recipients)
+    assert distribution.status == 'completed'
+    assert distribution.batches_done == 3
+
+    assert ledger.paid() == Counter(addresses)
+    amounts = {tx['Destination']: int(tx['Amount']) for tx in ledger.applied.values()}
+    assert [amounts[address] for address in addresses] == allocation.payouts.tolist()
+    assert db.query(RewardCarry).count() == 0
+
+def test_resume_with_different_recipients_is_interrupted(db):
+    addresses = _addresses(2)
+    recipients = recipients_from_pairs(zip(addresses, [1, 1]))
+    ledger = StubLedger()
+    distributor = RewardDistributor(ledger, StubSigning(), validation_timeout=1, validation_poll=0)
+    allocation = distributor.plan(db, recipients, pool_drops=2_000_000, min_payout_drops=1)
+    distribution = distributor.create(db, recipients, allocation, min_payout_drops=1, batch_size=2)
+    distribution = distributor.run(db, distribution.id, recipients_from_pairs(zip(addresses, [1, 2])))
+    # Not left 'running', so it can be claimed again with the right input
+    assert distribution.status == 'interrupted'
+    assert 'Recipients differ' in distribution.error
+    assert ledger.submissions == 0
+    assert distributor.claim(db, distribution.id)
+
+def test_missing_signing_key_is_interrupted(db):
+    recipients = recipients_from_pairs(zip(_addresses(1), [1]))
+    distributor = RewardDistributor(StubLedger(), StubSigning(), key_id='unknown', validation_timeout=1, validation_poll=0)
+    allocation = distributor.plan(db, recipients, pool_drops=1_000_000, min_payout_drops=1)
+    distribution = distributor.run(db, distributor.create(db, recipients, allocation, 1, batch_size=1).id, recipients)
+    assert distribution.status == 'interrupted'
+    assert "'unknown' is not loaded" in distribution.error
+
+def test_one_unfinished_distribution_at_a_time(db):
+    addresses = _addresses(2)
+    recipients = recipients_from_pairs(zip(addresses, [1, 1]))
+    db.add(RewardCarry(address=addresses[0], drops=500))
+    db.commit()
+    ledger = StubLedger(lose_response_on=1)
+    distributor = RewardDistributor(ledger, StubSigning(), validation_timeout=1, validation_poll=0)
+    allocation = distributor.plan(db, recipients, pool_drops=2_000_000, min_payout_drops=1)
+    first = distributor.create(db, recipients, allocation, min_payout_drops=1, batch_size=2)
+    assert distributor.run(db, first.id, recipients).status == 'interrupted'
+
+    # The carry above is in the interrupted run's signed payments
+    with pytest.raises(RuntimeError):
+        distributor.create(db, recipients, allocation, min_payout_drops=1, batch_size=2)
+    # ...so it cannot be dropped either, only finished
+    assert not distributor.cancel(db, first.id)
+    assert distributor.claim(db, first.id)
+    assert distributor.run(db, first.id, recipients).status == 'completed'
+    assert ledger.paid() == Counter(addresses)
+    assert db.query(RewardCarry).count() == 0
+
+    second = distributor.create(db, recipients, distributor.plan(db, recipients, 2_000_000, 1), min_payout_drops=1, batch_size=2)
+    assert second.status == 'running'
+
+def test_cancel_frees_an_unsigned_distribution(db):
+    recipients = recipients_from_pairs(zip(_addresses(1), [1]))
+    distributor = RewardDistributor(StubLedger(), StubSigning(), key_id='unknown', validation_timeout=1, validation_poll=0)
+    allocation = distributor.plan(db, recipients, pool_drops=1_000_000, min_payout_drops=1)
+    first = distributor.create(db, recipients, allocation, 1, batch_size=1)
+    # Still running: neither cancellable nor replaceable
+    assert not distributor.cancel(db, first.id)
+    distributor.run(db, first.id, recipients)
+    assert distributor.cancel(db, first.id)
+    assert db.get(RewardDistribution, first.id).status == 'cancelled'
+    assert distributor.create(db, recipients, allocation, 1, batch_size=1).status == 'running'
+
+def test_batches_record_validated_results(db):
+    addresses = _addresses(3)
+    recipients = recipients_from_pairs(zip(addresses, [1, 1, 1]))
+    ledger = StubLedger()
+    distributor = RewardDistributor(ledger, StubSigning(), validation_timeout=1, validation_poll=0)
+    allocation = distributor.plan(db, recipients, pool_drops=3_000_000, min_payout_drops=1)
+    distribution = distributor.run(db, distributor.create(db, recipients, allocation, 1, batch_size=2).id, recipients)
+    assert distribution.status == 'completed'
+    batches = db.query(RewardBatch).order_by(RewardBatch.batch_index).all()
+    assert [batch.status for batch in batches] == ['validated', 'validated']
+    assert all(result == 'tesSUCCESS' for batch in batches for result in json.loads(batch.engine_results))
+
+def test_pool_distributions_debit_what_they_deliver(db):
+    with pytest.raises(ValueError):
+        credit_reward_pool(db, 0)
+    assert credit_reward_pool(db, 5_000_000, note='grant') == 5_000_000
+    recipients = recipients_from_pairs(zip(_addresses(2), [1, 1]))
+    distributor = RewardDistributor(StubLedger(), StubSigning(), validation_timeout=1, validation_poll=0)
+
+    pool = db.get(PlatformStats, STATS_ROW_ID)
+    allocation = distributor.plan(db, recipients, pool.community_reward_pool_drops, min_payout_drops=1)
+    distribution = distributor.create(db, recipients, allocation, 1, batch_size=2, from_pool=True)
+    distribution = distributor.run(db, distribution.id, recipients)
+    assert distribution.delivered_drops == 5_000_000
+    db.refresh(pool)
+    assert pool.community_reward_pool_drops == 0
+
+    # An explicit pool_drops is funded elsewhere and leaves the pool alone
+    credit_reward_pool(db, 1_000_000)
+    explicit = distributor.create(db, recipients, distributor.plan(db, recipients, 2_000_000, 1), 1, batch_size=2)
+    assert distributor.run(db, explicit.id, recipients).status == 'completed'
+    db.refresh(pool)
+    assert pool.community_reward_pool_drops == 1_000_000
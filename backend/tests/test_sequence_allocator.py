@@ -0,0 +1,58 @@
+import threading
+
+from backend.src.integrations.sequence_allocator import SequenceAllocator
+
+ACCOUNT = 'rSender'
+
+class LedgerSequence:
+    def __init__(self, next_sequence):
+        self.next_sequence = next_sequence
+        self.fetches = 0
+
+    def __call__(self, account):
+        self.fetches += 1
+        return self.next_sequence
+
+def test_allocates_locally_after_one_fetch():
+    ledger = LedgerSequence(10)
+    allocator = SequenceAllocator(ledger)
+    assert [allocator.allocate(ACCOUNT) for _ in range(3)] == [10, 11, 12]
+    assert ledger.fetches == 1
+
+def test_release_returns_only_the_latest_sequence():
+    allocator = SequenceAllocator(LedgerSequence(10))
+    first, second = allocator.allocate(ACCOUNT), allocator.allocate(ACCOUNT)
+    # An older number would leave a gap; it is not handed out again
+    allocator.release(ACCOUNT, first)
+    assert allocator.allocate(ACCOUNT) == 12
+    allocator.release(ACCOUNT, 12)
+    assert allocator.allocate(ACCOUNT) == 12
+    assert second == 11
+
+def test_resync_refetches_from_the_ledger():
+    ledger = LedgerSequence(10)
+    allocator = SequenceAllocator(ledger)
+    allocator.allocate(ACCOUNT)
+    allocator.allocate(ACCOUNT)
+    ledger.next_sequence = 20
+    allocator.resync(ACCOUNT)
+    assert allocator.allocate(ACCOUNT) == 20
+    assert ledger.fetches == 2
+
+def test_concurrent_senders_get_distinct_sequences():
+    allocator = SequenceAllocator(LedgerSequence(1))
+    allocated = []
+    lock = threading.Lock()
+
+    def send():
+        for _ in range(200):
+            sequence = allocator.allocate(ACCOUNT)
+            with lock:
+                allocated.append(sequence)
+
+    threads = [threading.Thread(target=send) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(allocated) == list(range(1, 1601))
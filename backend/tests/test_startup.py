@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.mark.parametrize('module', ['main', 'routes.wallet'])
+def test_backend_import_does_not_load_xrpl(module):
+    # A fresh interpreter, started the way the server is: from backend/
+    loaded = subprocess.run(
+        [sys.executable, '-c', f"import sys, {module}; print(sorted({{m.split('.')[0] for m in sys.modules}} & {{'xrpl'}}))"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, 'PYTHONPATH': ''},
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+    assert loaded.returncode == 0, loaded.stderr
+    assert loaded.stdout.strip().splitlines()[-1] == '[]'
@@ -0,0 +1,58 @@
+"""
+Stored-baseline comparison shared by the micro-benchmarks and the load runner
+
+A baseline is a JSON object of benchmark name -> {metric: value}. Metrics
+ending in '_per_s' are higher-is-better; everything else (latencies) is
+lower-is-better.
+"""
+import json
+from typing import Dict, List
+
+Results = Dict[str, Dict[str, float]]
+
+def save_baseline(path: str, results: Results):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def load_baseline(path: str) -> Results:
+    with open(path) as f:
+        return json.load(f)
+
+def compare(results: Results, baseline: Results, tolerance: float = 0.10) -> List[str]:
+    """
+    Describe every metric that regressed beyond tolerance
+
+    :param results: Current run
+    :param baseline: Stored run to compare against
+    :param tolerance: Allowed relative change, e.g. 0.10 for 10%
+    :return: One line per regression; empty if none
+    """
+    regressions = []
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(name, {}).get(metric)
+            if not reference:
+                continue
+            change = (value - reference) / reference
+            worse = -change if metric.endswith('_per_s') else change
+            if worse > tolerance:
+                regressions.append(f"{name} {metric}: {reference:.4g} -> {value:.4g} ({change:+.1%})")
+    return regressions
+
+def report(results: Results, baseline_path: str = None, save_path: str = None, tolerance: float = 0.10) -> int:
+    """
+    Save and/or compare a run, printing any regressions
+
+    :return: Process exit code, 1 if anything regressed
+    """
+    if save_path:
+        save_baseline(save_path, results)
+        print(f"Baseline written to {save_path}")
+    if not baseline_path:
+        return 0
+    regressions = compare(results, load_baseline(baseline_path), tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions beyond {tolerance:.0%} against {baseline_path}")
+    return 1 if regressions else 0
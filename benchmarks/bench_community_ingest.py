@@ -0,0 +1,60 @@
+"""
+Bulk member ingestion throughput for CommunityOnboardingEngine
+
+Usage: python benchmarks/bench_community_ingest.py [members]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from community_onboarding import CommunityOnboardingEngine
+
+SKILLS = [f'skill_{i}' for i in range(200)]
+INTERESTS = [f'interest_{i}' for i in range(100)]
+
+def generate_records(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for i in range(count):
+        yield (f'r{i:033d}', rng.sample(SKILLS, 3), rng.sample(INTERESTS, 3))
+
+def bench_add_member(count: int) -> float:
+    engine = CommunityOnboardingEngine('rLeader')
+    records = list(generate_records(count))
+    start = time.perf_counter()
+    for wallet_address, skills, interests in records:
+        engine.add_member(wallet_address, skills, interests)
+    return time.perf_counter() - start
+
+def bench_add_members_bulk(count: int) -> float:
+    engine = CommunityOnboardingEngine('rLeader')
+    records = list(generate_records(count))
+    start = time.perf_counter()
+    result = engine.add_members_bulk(records)
+    elapsed = time.perf_counter() - start
+    assert result.added == count and not result.conflicts
+    return elapsed
+
+def bench_bulk_conflicts(count: int) -> float:
+    engine = CommunityOnboardingEngine('rLeader')
+    records = list(generate_records(count))
+    engine.add_members_bulk(records)
+    start = time.perf_counter()
+    result = engine.add_members_bulk(records)
+    elapsed = time.perf_counter() - start
+    assert result.added == 0 and len(result.conflicts) == count
+    return elapsed
+
+def main(count: int):
+    for name, bench in (
+        ('add_member loop', bench_add_member),
+        ('add_members_bulk', bench_add_members_bulk),
+        ('add_members_bulk (all conflicts)', bench_bulk_conflicts),
+    ):
+        elapsed = bench(count)
+        print(f"{name:<34} {count:>9,} members  {elapsed:7.2f} s  {count / elapsed:>12,.0f} members/s")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,60 @@
+"""
+Offline signing throughput of SigningService as worker count grows
+
+Usage: python benchmarks/bench_signing.py [transactions]
+"""
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from xrpl.models.transactions import Payment
+from xrpl.wallet import Wallet
+
+from src.integrations.signing_service import SigningService
+
+def generate_payments(account: str, count: int):
+    destination = Wallet.create().classic_address
+    return [
+        ('bench', Payment(
+            account=account,
+            destination=destination,
+            amount=str(1_000 + i),
+            sequence=i + 1,
+            fee='12',
+            last_ledger_sequence=100_000
+        ))
+        for i in range(count)
+    ]
+
+def bench_workers(items, workers: int) -> float:
+    service = SigningService(workers=workers)
+    try:
+        # Spin up the processes and load keys outside the timed region
+        service.key_addresses()
+        start = time.perf_counter()
+        signed = service.sign_batch(items)
+        elapsed = time.perf_counter() - start
+    finally:
+        service.close()
+    assert len(signed) == len(items)
+    return elapsed
+
+def main(count: int):
+    wallet = Wallet.create()
+    # Workers read the seed from the environment they inherit
+    os.environ['SIGNING_KEYS'] = json.dumps({'bench': wallet.seed})
+    items = generate_payments(wallet.classic_address, count)
+
+    workers = 1
+    baseline = None
+    while workers <= (os.cpu_count() or 1):
+        elapsed = bench_workers(items, workers)
+        baseline = baseline or elapsed
+        print(f"{workers:>3} workers  {count:>8,} txs  {elapsed:7.2f} s  {count / elapsed:>10,.0f} tx/s  x{baseline / elapsed:.2f}")
+        workers *= 2
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,298 @@
+"""
+Local stand-in for rippled's JSON-RPC and WebSocket APIs
+
+Answers the handful of methods the apps use (account_info, fee, ledger,
+submit, tx, account_tx, subscribe, ...) from in-memory state, with optional
+latency, jitter and error injection. Point the apps at it with
+XRPL_RPC_URL / XRPL_WS_URL.
+
+Usage: python benchmarks/fake_rippled.py [--port 5005] [--ws-port 6006]
+           [--latency-ms 0] [--jitter-ms 0] [--error-rate 0]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Set, Tuple
+
+from xrpl.core.binarycodec import decode
+
+STARTING_BALANCE_DROPS = 10_000 * 1_000_000
+
+@dataclass
+class FaultProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+
+    async def delay(self):
+        seconds = (self.latency_ms + random.uniform(0, self.jitter_ms)) / 1000
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+@dataclass
+class Ledger:
+    """
+    In-memory ledger state: balances, sequences and a ledger index that
+    closes every close_interval seconds
+    """
+    close_interval: float = 3.0
+    ledger_index: int = 1000
+    balances: Dict[str, int] = field(default_factory=dict)
+    sequences: Dict[str, int] = field(default_factory=dict)
+    # hash -> (result, ledger the transaction is validated in)
+    transactions: Dict[str, Tuple[str, int]] = field(default_factory=dict)
+    submitted: int = 0
+
+    def account(self, address: str):
+        self.balances.setdefault(address, STARTING_BALANCE_DROPS)
+        self.sequences.setdefault(address, 1)
+
+    def account_root(self, address: str) -> Dict[str, Any]:
+        return {'ModifiedNode': {
+            'LedgerEntryType': 'AccountRoot',
+            'FinalFields': {'Account': address, 'Balance': str(self.balances[address]), 'Sequence': self.sequences[address]},
+        }}
+
+    def apply(self, tx: Dict[str, Any]) -> str:
+        account = tx['Account']
+        self.account(account)
+        expected = self.sequences[account]
+        sequence = tx.get('Sequence', 0)
+        if sequence < expected:
+            return 'tefPAST_SEQ'
+        if sequence > expected:
+            return 'terPRE_SEQ'
+        self.sequences[account] += 1
+        fee = int(tx.get('Fee', '10'))
+        amount = tx.get('Amount')
+        drops = int(amount) if tx.get('TransactionType') == 'Payment' and isinstance(amount, str) else 0
+        if self.balances[account] < fee + drops:
+            return 'tecUNFUNDED_PAYMENT'
+        self.balances[account] -= fee + drops
+        if drops:
+            self.account(tx['Destination'])
+            self.balances[tx['Destination']] += drops
+        self.submitted += 1
+        return 'tesSUCCESS'
+
+class FakeRippled:
+    def __init__(self, faults: Optional[FaultProfile] = None, ledger: Optional[Ledger] = None):
+        self.faults = faults or FaultProfile()
+        self.ledger = ledger or Ledger()
+        self._subscribers: Dict[Any, Set[str]] = {}
+
+    def handle(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Result body for one request, in rippled's JSON-RPC shape
+        """
+        handler = getattr(self, f'_{method}', None)
+        if handler is None:
+            return {'status': 'error', 'error': 'unknownCmd'}
+        if self.faults.should_fail():
+            return {'status': 'error', 'error': 'tooBusy'}
+        result = handler(params)
+        result.setdefault('status', 'success')
+        return result
+
+    def _account_info(self, params):
+        address = params['account']
+        self.ledger.account(address)
+        return {
+            'account_data': {
+                'Account': address,
+                'Balance': str(self.ledger.balances[address]),
+                'Sequence': self.ledger.sequences[address],
+                'Flags': 0,
+                'OwnerCount': 0,
+            },
+            'ledger_current_index': self.ledger.ledger_index + 1,
+            'validated': False,
+        }
+
+    def _fee(self, params):
+        return {
+            'current_ledger_size': '10',
+            'current_queue_size': '0',
+            'drops': {'base_fee': '10', 'median_fee': '5000', 'minimum_fee': '10', 'open_ledger_fee': '10'},
+            'expected_ledger_size': '100',
+            'ledger_current_index': self.ledger.ledger_index + 1,
+            'levels': {'median_level': '128000', 'minimum_level': '256', 'open_ledger_level': '256', 'reference_level': '256'},
+            'max_queue_size': '2000',
+        }
+
+    def _ledger(self, params):
+        return {
+            'ledger_index': self.ledger.ledger_index,
+            'ledger_hash': hashlib.sha256(str(self.ledger.ledger_index).encode()).hexdigest().upper(),
+            'ledger': {'ledger_index': str(self.ledger.ledger_index), 'closed': True},
+            'validated': True,
+        }
+
+    def _ledger_current(self, params):
+        return {'ledger_current_index': self.ledger.ledger_index + 1}
+
+    def _server_info(self, params):
+        return {'info': {
+            'build_version': 'fake',
+            'server_state': 'full',
+            'validated_ledger': {'seq': self.ledger.ledger_index, 'base_fee_xrp': 0.00001, 'reserve_base_xrp': 10, 'reserve_inc_xrp': 2},
+        }}
+
+    def _submit(self, params):
+        blob = params['tx_blob']
+        tx = decode(blob)
+        engine_result = self.ledger.apply(tx)
+        # rippled's transaction id: SHA-512Half of the "TXN\0" prefix and the blob
+        tx['hash'] = hashlib.sha512(b'TXN\x00' + bytes.fromhex(blob)).hexdigest()[:64].upper()
+        if engine_result == 'tesSUCCESS' or engine_result.startswith('tec'):
+            self.ledger.transactions[tx['hash']] = (engine_result, self.ledger.ledger_index + 1)
+        if engine_result == 'tesSUCCESS':
+            asyncio.get_running_loop().create_task(self._publish(tx))
+        return {
+            'engine_result': engine_result,
+            'engine_result_code': 0 if engine_result == 'tesSUCCESS' else -1,
+            'engine_result_message': engine_result,
+            'tx_blob': blob,
+            'tx_json': tx,
+            'accepted': engine_result == 'tesSUCCESS',
+        }
+
+    def _tx(self, params):
+        entry = self.ledger.transactions.get(params.get('transaction', '').upper())
+        if entry is None:
+            return {'status': 'error', 'error': 'txnNotFound'}
+        engine_result, ledger_index = entry
+        return {
+            'hash': params['transaction'].upper(),
+            'ledger_index': ledger_index,
+            'validated': self.ledger.ledger_index >= ledger_index,
+            'meta': {'TransactionResult': engine_result},
+        }
+
+    def _account_tx(self, params):
+        return {
+            'account': params['account'],
+            'ledger_index_min': 1,
+            'ledger_index_max': self.ledger.ledger_index,
+            'transactions': [],
+            'validated': True,
+        }
+
+    def _subscribe(self, params):
+        return {}
+
+    def _unsubscribe(self, params):
+        return {}
+
+    async def _publish(self, tx: Dict[str, Any]):
+        # Stream the transaction to sockets subscribed to either party, as
+        # rippled does once it validates
+        accounts = {tx['Account'], tx.get('Destination')} - {None}
+        message = json.dumps({
+            'type': 'transaction',
+            'validated': True,
+            'ledger_index': self.ledger.ledger_index + 1,
+            'transaction': tx,
+            'meta': {
+                'TransactionResult': 'tesSUCCESS',
+                'AffectedNodes': [self.ledger.account_root(account) for account in accounts],
+            },
+        })
+        for websocket, watched in list(self._subscribers.items()):
+            if watched & accounts:
+                try:
+                    await websocket.send(message)
+                except Exception:
+                    self._subscribers.pop(websocket, None)
+
+    async def close_ledgers(self):
+        while True:
+            await asyncio.sleep(self.ledger.close_interval)
+            self.ledger.ledger_index += 1
+
+    async def serve_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        # Minimal HTTP/1.1 with keep-alive; enough for httpx and requests
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                content_length = 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode().partition(':')
+                    if name.strip().lower() == 'content-length':
+                        content_length = int(value.strip())
+                body = json.loads(await reader.readexactly(content_length) or b'{}')
+                await self.faults.delay()
+                params = (body.get('params') or [{}])[0]
+                payload = json.dumps({'result': self.handle(body.get('method', ''), params)}).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                    + f'Content-Length: {len(payload)}\r\n\r\n'.encode()
+                    + payload
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_websocket(self, websocket, path=None):
+        watched = self._subscribers.setdefault(websocket, set())
+        try:
+            async for message in websocket:
+                request = json.loads(message)
+                await self.faults.delay()
+                command = request.get('command', '')
+                params = {key: value for key, value in request.items() if key not in ('id', 'command')}
+                result = self.handle(command, params)
+                response = {'id': request.get('id'), 'type': 'response', 'status': result.pop('status')}
+                if response['status'] == 'success':
+                    response['result'] = result
+                    if command == 'subscribe':
+                        watched.update(params.get('accounts', []))
+                    elif command == 'unsubscribe':
+                        watched.difference_update(params.get('accounts', []))
+                else:
+                    response['error'] = result.get('error')
+                await websocket.send(json.dumps(response))
+        except Exception:
+            # Clients drop the socket without a close frame on shutdown
+            pass
+        finally:
+            self._subscribers.pop(websocket, None)
+
+async def serve(port: int, ws_port: int, faults: FaultProfile):
+    import websockets
+
+    rippled = FakeRippled(faults)
+    http_server = await asyncio.start_server(rippled.serve_http, '127.0.0.1', port)
+    async with http_server, websockets.serve(rippled.serve_websocket, '127.0.0.1', ws_port):
+        print(f"fake rippled: http://127.0.0.1:{port}/ ws://127.0.0.1:{ws_port}/")
+        await rippled.close_ledgers()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=5005)
+    parser.add_argument('--ws-port', type=int, default=6006)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    faults = FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate)
+    try:
+        asyncio.run(serve(args.port, args.ws_port, faults))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
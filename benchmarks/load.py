@@ -0,0 +1,161 @@
+"""
+Load scenarios against running instances of the backend and eon_xrp apps
+
+Start the apps against the local rippled stand-in first, e.g.
+
+    python benchmarks/fake_rippled.py --latency-ms 20 &
+    cd backend && XRPL_RPC_URL=http://127.0.0.1:5005/ XRPL_WS_URL=ws://127.0.0.1:6006/ uvicorn main:app --port 8000 &
+    XRPL_RPC_URL=http://127.0.0.1:5005/ uvicorn src.eon_xrp.main:app --port 8001 &
+
+Mint scenarios time a job from enqueue until it succeeds or fails, polling
+/jobs/{job_id}; failed jobs count as errors.
+
+Usage: python benchmarks/load.py [--scenarios register,token,...] [--requests 500]
+           [--concurrency 20] [--backend-url URL] [--eon-url URL]
+           [--baseline FILE] [--save-baseline FILE] [--tolerance 0.1]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from baseline import report
+
+BENCH_PASSWORD = 'benchmark-password'
+MINT_POLL_SECONDS = 0.05
+
+@dataclass
+class ScenarioResult:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> Dict[str, float]:
+        completed = len(self.latencies)
+        cuts = statistics.quantiles(self.latencies, n=100) if completed > 1 else [0.0] * 99
+        return {
+            'requests_per_s': completed / self.elapsed if self.elapsed else 0.0,
+            'p50_ms': cuts[49] * 1000,
+            'p95_ms': cuts[94] * 1000,
+            'p99_ms': cuts[98] * 1000,
+            'error_rate': self.errors / max(1, completed + self.errors),
+        }
+
+# Performs one operation, returning whether it succeeded
+Request = Callable[[], Awaitable[bool]]
+
+async def _ok(pending: Awaitable[httpx.Response]) -> bool:
+    return (await pending).status_code < 400
+
+async def _mint(eon: httpx.AsyncClient, path: str, details: Dict[str, str]) -> bool:
+    response = await eon.post(path, json=details)
+    if response.status_code >= 400:
+        return False
+    job_id = response.json()['job_id']
+    while True:
+        job = (await eon.get(f'/jobs/{job_id}')).json()
+        if job['status'] in ('succeeded', 'failed'):
+            return job['status'] == 'succeeded'
+        await asyncio.sleep(MINT_POLL_SECONDS)
+
+async def _setup_user(client: httpx.AsyncClient) -> str:
+    username = f'bench_{uuid.uuid4().hex[:12]}'
+    response = await client.post('/register', json={
+        'username': username, 'email': f'{username}@example.com', 'password': BENCH_PASSWORD
+    })
+    response.raise_for_status()
+    return username
+
+async def _setup_sender(client: httpx.AsyncClient) -> Dict[str, str]:
+    # The stand-in funds every account it has not seen before
+    sender = (await client.post('/wallet/create')).json()
+    recipient = (await client.post('/wallet/create')).json()
+    return {'sender_seed': sender['seed'], 'recipient': recipient['address'], 'amount': '0.000001'}
+
+async def build_scenarios(backend: httpx.AsyncClient, eon: httpx.AsyncClient, names: List[str]) -> Dict[str, Request]:
+    """
+    One request factory per scenario, after any setup it needs
+    """
+    scenarios: Dict[str, Request] = {}
+    if 'register' in names:
+        def register():
+            username = f'bench_{uuid.uuid4().hex[:12]}'
+            return _ok(backend.post('/register', json={
+                'username': username, 'email': f'{username}@example.com', 'password': BENCH_PASSWORD
+            }))
+        scenarios['register'] = register
+    if 'token' in names:
+        username = await _setup_user(backend)
+        scenarios['token'] = lambda: _ok(backend.post('/token', data={'username': username, 'password': BENCH_PASSWORD}))
+    if 'wallet_create' in names:
+        scenarios['wallet_create'] = lambda: _ok(backend.post('/wallet/create'))
+    if 'transaction_send' in names:
+        params = await _setup_sender(backend)
+        scenarios['transaction_send'] = lambda: _ok(backend.post('/transaction/send', params=params))
+    if 'meme_token' in names:
+        scenarios['meme_token'] = lambda: _mint(eon, '/create-meme-token', {'name': 'Bench Meme'})
+    if 'nft_collection' in names:
+        scenarios['nft_collection'] = lambda: _mint(eon, '/create-nft-collection', {'name': 'Bench NFTs'})
+    return scenarios
+
+async def run_scenario(request: Request, requests: int, concurrency: int) -> ScenarioResult:
+    result = ScenarioResult()
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            try:
+                ok = await request()
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                result.latencies.append(time.perf_counter() - start)
+            else:
+                result.errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - start
+    return result
+
+async def run(args) -> Dict[str, Dict[str, float]]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.backend_url, limits=limits, timeout=60) as backend, \
+            httpx.AsyncClient(base_url=args.eon_url, limits=limits, timeout=60) as eon:
+        names = [name.strip() for name in args.scenarios.split(',')]
+        scenarios = await build_scenarios(backend, eon, names)
+        results = {}
+        for name in names:
+            summary = (await run_scenario(scenarios[name], args.requests, args.concurrency)).summary()
+            results[name] = summary
+            print(
+                f"{name:<18} {summary['requests_per_s']:>9,.1f} req/s  p50 {summary['p50_ms']:>8.1f} ms  "
+                f"p95 {summary['p95_ms']:>8.1f} ms  p99 {summary['p99_ms']:>8.1f} ms  errors {summary['error_rate']:.1%}"
+            )
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', default='register,token,wallet_create,transaction_send,meme_token,nft_collection')
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--backend-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--eon-url', default='http://127.0.0.1:8001')
+    parser.add_argument('--baseline')
+    parser.add_argument('--save-baseline')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+    results = asyncio.run(run(args))
+    # Error rate is informational; a rise in it shows up as lost throughput
+    comparable = {name: {k: v for k, v in summary.items() if k != 'error_rate'} for name, summary in results.items()}
+    sys.exit(report(comparable, args.baseline, args.save_baseline, args.tolerance))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Micro-benchmarks for the CPU-bound hot spots: password hashing,
+transaction signing and collaborator matching
+
+Usage: python benchmarks/microbench.py [--only hashing,signing,matching]
+           [--members 100000] [--baseline FILE] [--save-baseline FILE] [--tolerance 0.1]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from typing import Callable, Dict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'backend'))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'scripts'))
+
+from baseline import report
+from bench_community_ingest import INTERESTS, SKILLS, generate_records
+
+def measure(func: Callable[[], object], min_seconds: float = 1.0, min_ops: int = 3) -> Dict[str, float]:
+    """
+    Call func until min_seconds and min_ops are both reached
+    """
+    func()  # warm-up
+    ops = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        ops += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds and ops >= min_ops:
+            break
+    return {'ops_per_s': ops / elapsed, 'us_per_op': elapsed / ops * 1e6}
+
+def bench_hashing() -> Dict[str, Dict[str, float]]:
+    from src.services.password_hashing import BCRYPT_ROUNDS, get_password_hash, verify_password
+
+    hashed = get_password_hash('benchmark-password')
+    return {
+        f'bcrypt_hash_rounds_{BCRYPT_ROUNDS}': measure(lambda: get_password_hash('benchmark-password')),
+        f'bcrypt_verify_rounds_{BCRYPT_ROUNDS}': measure(lambda: verify_password('benchmark-password', hashed)),
+    }
+
+def bench_signing() -> Dict[str, Dict[str, float]]:
+    from xrpl.constants import CryptoAlgorithm
+    from xrpl.models.transactions import Payment
+    from xrpl.transaction import sign
+    from xrpl.wallet import Wallet
+
+    results = {}
+    destination = Wallet.create().classic_address
+    for algorithm in CryptoAlgorithm:
+        wallet = Wallet.create(algorithm=algorithm)
+        payment = Payment(
+            account=wallet.classic_address,
+            destination=destination,
+            amount='1000',
+            sequence=1,
+            fee='12',
+            last_ledger_sequence=100_000
+        )
+        results[f'sign_payment_{algorithm.value}'] = measure(lambda: sign(payment, wallet))
+    return results
+
+def bench_matching(members: int) -> Dict[str, Dict[str, float]]:
+    from community_onboarding import CommunityOnboardingEngine
+
+    engine = CommunityOnboardingEngine('rLeader')
+    engine.add_members_bulk(generate_records(members))
+    rng = random.Random(7)
+
+    def project():
+        return rng.sample(SKILLS, 4), rng.sample(INTERESTS, 2)
+
+    return {
+        f'match_top10_{members}_members': measure(
+            lambda: engine.match_potential_collaborators(*project(), limit=10)
+        ),
+        f'match_top10_interests_{members}_members': measure(
+            lambda: engine.match_potential_collaborators(*project(), limit=10, interest_weight=0.5)
+        ),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', default='hashing,signing,matching')
+    parser.add_argument('--members', type=int, default=100_000)
+    parser.add_argument('--baseline')
+    parser.add_argument('--save-baseline')
+    parser.add_argument('--tolerance', type=float, default=0.10)
+    args = parser.parse_args()
+
+    suites = {
+        'hashing': bench_hashing,
+        'signing': bench_signing,
+        'matching': lambda: bench_matching(args.members),
+    }
+    results = {}
+    for name in args.only.split(','):
+        for bench, metrics in suites[name.strip()]().items():
+            results[bench] = metrics
+            print(f"{bench:<40} {metrics['ops_per_s']:>12,.1f} ops/s {metrics['us_per_op']:>14,.1f} us/op")
+    sys.exit(report(results, args.baseline, args.save_baseline, args.tolerance))
+
+if __name__ == "__main__":
+    main()
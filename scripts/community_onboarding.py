@@ -1,9 +1,26 @@
 import os
 import uuid
-from typing import Dict, List
-from dataclasses import dataclass, asdict
+import gzip
+import heapq
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass, field, asdict
 import json
 
+import numpy as np
+
+# Columnar features used for contribution scoring, in column order
+SCORE_FEATURES = ('skill_count', 'interest_count')
+DEFAULT_SCORE_WEIGHTS = {'skill_count': 0.5, 'interest_count': 0.3}
+
+# joined_at is stored as integer microseconds since this (naive) epoch
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_TIMESTAMP = np.iinfo(np.int64).min
+
 @dataclass
 class CommunityMember:
     id: str
@@ -13,16 +30,146 @@ class CommunityMember:
     contribution_score: float = 0.0
     joined_at: str = None
 
+@dataclass
+class BulkIngestResult:
+    added: int = 0
+    # (record position in the input, wallet address or None, reason)
+    conflicts: List[Tuple[int, Optional[str], str]] = field(default_factory=list)
+
+class TermVocabulary:
+    """
+    Interns skill or interest strings to small integer ids
+    
+    Each member stores its terms as packed uint32 ids, so a term shared by
+    a million members is kept in memory once.
+    """
+    __slots__ = ('_ids', 'terms')
+    
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+    
+    def encode(self, terms: Iterable[str]) -> bytes:
+        ids = array('I')
+        for term in terms:
+            term_id = self._ids.get(term)
+            if term_id is None:
+                term_id = self._ids[term] = len(self.terms)
+                self.terms.append(term)
+            ids.append(term_id)
+        return ids.tobytes()
+    
+    def decode(self, packed: bytes) -> List[str]:
+        ids = array('I')
+        ids.frombytes(packed)
+        terms = self.terms
+        return [terms[term_id] for term_id in ids]
+
+class _MemberView(Mapping):
+    """
+    Read-only wallet -> CommunityMember mapping over the engine's columnar store
+    
+    Members are materialized on access; changes go through the engine's
+    add_member/update_member.
+    """
+    __slots__ = ('_engine',)
+    
+    def __init__(self, engine: 'CommunityOnboardingEngine'):
+        self._engine = engine
+    
+    def __getitem__(self, wallet_address: str) -> CommunityMember:
+        return self._engine._member_at(self._engine._member_rows[wallet_address])
+    
+    def __contains__(self, wallet_address) -> bool:
+        return wallet_address in self._engine._member_rows
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._engine._member_rows)
+    
+    def __len__(self) -> int:
+        return len(self._engine._member_rows)
+
+def _to_epoch_us(joined_at: Optional[str]) -> int:
+    if not joined_at:
+        return _NO_TIMESTAMP
+    return (datetime.fromisoformat(joined_at) - _EPOCH) // _MICROSECOND
+
+def _from_epoch_us(joined_at_us: int) -> Optional[str]:
+    if joined_at_us == _NO_TIMESTAMP:
+        return None
+    return str(_EPOCH + timedelta(microseconds=int(joined_at_us)))
+
+def _open_ndjson(path: str, mode: str, compress: Optional[bool] = None):
+    if compress is None:
+        compress = path.endswith('.gz')
+    if compress:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+def _index_term(index: Dict[str, array], tombstones: Dict[str, Set[int]], term: str, row: int):
+    removed = tombstones.get(term)
+    if removed and row in removed:
+        # Still packed in the index, just revive it
+        removed.discard(row)
+    else:
+        index[term].append(row)
+
+def _unindex_term(index: Dict[str, array], tombstones: Dict[str, Set[int]], term: str, row: int):
+    removed = tombstones.setdefault(term, set())
+    removed.add(row)
+    rows = index[term]
+    if len(removed) * 4 >= len(rows):
+        index[term] = array('I', (live for live in rows if live not in removed))
+        del tombstones[term]
+
+def _term_rows(index: Dict[str, array], tombstones: Dict[str, Set[int]], term: str) -> Iterable[int]:
+    rows = index.get(term, ())
+    removed = tombstones.get(term)
+    if not removed:
+        return rows
+    return (row for row in rows if row not in removed)
+
 class CommunityOnboardingEngine:
-    def __init__(self, initial_leader_wallet: str):
+    def __init__(self, initial_leader_wallet: str, score_weights: Optional[Dict[str, float]] = None):
         """
         Initialize the community onboarding system with the founding leader
         
         :param initial_leader_wallet: Wallet address of the project founder
+        :param score_weights: Contribution score weight per feature in SCORE_FEATURES
         """
-        self.members: Dict[str, CommunityMember] = {}
+        self.members: Mapping[str, CommunityMember] = _MemberView(self)
         self.leader_wallet = initial_leader_wallet
         
+        # Compact member storage: one row per member across the columns below
+        self.skill_vocabulary = TermVocabulary()
+        self.interest_vocabulary = TermVocabulary()
+        self._row_skills: List[bytes] = []
+        self._row_interests: List[bytes] = []
+        self._member_uuids = np.zeros((1024, 16), dtype=np.uint8)
+        self._joined_at_us = np.full(1024, _NO_TIMESTAMP, dtype=np.int64)
+        
+        # Inverted indexes: skill/interest -> packed rows of the members having it
+        self.skill_index: Dict[str, array] = defaultdict(lambda: array('I'))
+        self.interest_index: Dict[str, array] = defaultdict(lambda: array('I'))
+        # Rows removed from a term by an update but still in its packed index,
+        # compacted away once they make up a quarter of it
+        self._skill_tombstones: Dict[str, Set[int]] = {}
+        self._interest_tombstones: Dict[str, Set[int]] = {}
+        # Row of each member in the columnar arrays, also its insertion order
+        self._member_rows: Dict[str, int] = {}
+        self._row_wallets: List[str] = []
+        
+        # Columnar scoring state: one feature row and one cached score per member
+        self._features = np.zeros((1024, len(SCORE_FEATURES)), dtype=np.float64)
+        self._scores = np.zeros(1024, dtype=np.float64)
+        self._score_dirty = np.ones(1024, dtype=bool)
+        self._score_weights = np.zeros(len(SCORE_FEATURES), dtype=np.float64)
+        self.set_score_weights(score_weights or DEFAULT_SCORE_WEIGHTS)
+        
+        # Change tracking for delta exports: version at which each row last changed
+        self.change_version = 0
+        self._row_versions = np.zeros(1024, dtype=np.int64)
+        
         # Create initial leader profile
         self.add_member(
             wallet_address=initial_leader_wallet,
@@ -47,40 +194,320 @@ class CommunityOnboardingEngine:
         if wallet_address in self.members:
             raise ValueError("Member already exists")
         
-        member = CommunityMember(
-            id=str(uuid.uuid4()),
-            wallet_address=wallet_address,
-            skills=skills,
-            interests=interests,
-            joined_at=str(datetime.now())
+        self._insert_member(
+            wallet_address,
+            skills,
+            interests,
+            uuid.uuid4().bytes,
+            (datetime.now() - _EPOCH) // _MICROSECOND
         )
+        return self.members[wallet_address]
+    
+    def _insert_member(
+        self,
+        wallet_address: str,
+        skills: List[str],
+        interests: List[str],
+        member_uuid: bytes,
+        joined_at_us: int
+    ) -> int:
+        row = len(self._row_wallets)
+        if row >= len(self._scores):
+            self._grow_columns(row + 1)
+        self._member_rows[wallet_address] = row
+        self._row_wallets.append(wallet_address)
+        self._row_skills.append(self.skill_vocabulary.encode(skills))
+        self._row_interests.append(self.interest_vocabulary.encode(interests))
+        self._member_uuids[row] = np.frombuffer(member_uuid, dtype=np.uint8)
+        self._joined_at_us[row] = joined_at_us
+        self._index_row(row)
+        return row
+    
+    def add_members_bulk(self, records: Iterable, chunk_size: int = 50_000) -> BulkIngestResult:
+        """
+        Add many community members in one pass
+        
+        Records may be mappings with wallet_address, skills and interests
+        (plus optional id and joined_at) or (wallet_address, skills, interests)
+        tuples, and may come from any iterator such as a CSV reader. Malformed
+        records, and records whose wallet already exists in the community or
+        earlier in the same input, are reported as conflicts and skipped
+        without aborting the load.
+        Columns grow and member ids are generated once per chunk. If the
+        input raises, the records read before the error are still added.
+        
+        :param records: Iterable of member records
+        :param chunk_size: Records buffered before columnar state is written
+        :return: Number of members added and per-record conflicts
+        """
+        result = BulkIngestResult()
+        chunk = []
+        try:
+            for position, record in enumerate(records):
+                try:
+                    if isinstance(record, Mapping):
+                        wallet_address = record['wallet_address']
+                        skills = record.get('skills') or []
+                        interests = record.get('interests') or []
+                        member_id = record.get('id')
+                        joined_at = record.get('joined_at')
+                    else:
+                        wallet_address, skills, interests = record
+                        member_id = joined_at = None
+                    if not isinstance(wallet_address, str):
+                        raise TypeError("wallet_address must be a string")
+                    if isinstance(skills, str) or isinstance(interests, str):
+                        raise TypeError("skills and interests must be lists of strings")
+                    skills, interests = list(skills), list(interests)
+                    if not all(isinstance(term, str) for term in skills + interests):
+                        raise TypeError("skills and interests must be lists of strings")
+                    member_uuid = uuid.UUID(member_id).bytes if member_id else None
+                    joined_at_us = _to_epoch_us(joined_at) if joined_at else None
+                except (KeyError, TypeError, ValueError) as e:
+                    result.conflicts.append((position, None, f"Invalid record: {e!r}"))
+                    continue
+                
+                if wallet_address in self._member_rows:
+                    result.conflicts.append((position, wallet_address, "Member already exists"))
+                    continue
+                # Reserve the wallet now so later duplicates in the same input conflict
+                self._member_rows[wallet_address] = len(self._row_wallets) + len(chunk)
+                chunk.append((wallet_address, skills, interests, member_uuid, joined_at_us))
+                if len(chunk) >= chunk_size:
+                    pending, chunk = chunk, []
+                    self._insert_chunk(pending)
+                    result.added += len(pending)
+        finally:
+            # Also when the input fails mid-stream: every reserved wallet must get its row
+            if chunk:
+                self._insert_chunk(chunk)
+                result.added += len(chunk)
+        return result
+    
+    def _insert_chunk(self, chunk: list):
+        start = len(self._row_wallets)
+        try:
+            self._write_chunk(start, chunk)
+        except BaseException:
+            # All or nothing: a reserved wallet never points past the last row
+            self._truncate_rows(start, [record[0] for record in chunk])
+            raise
+    
+    def _write_chunk(self, start: int, chunk: list):
+        end = start + len(chunk)
+        if end > len(self._scores):
+            self._grow_columns(end)
+        
+        # Random version 4 UUIDs for the whole chunk at once
+        uuids = np.frombuffer(os.urandom(16 * len(chunk)), dtype=np.uint8).reshape(-1, 16).copy()
+        uuids[:, 6] = (uuids[:, 6] & 0x0F) | 0x40
+        uuids[:, 8] = (uuids[:, 8] & 0x3F) | 0x80
+        now_us = (datetime.now() - _EPOCH) // _MICROSECOND
+        self._joined_at_us[start:end] = now_us
+        
+        counts = []
+        skill_index, interest_index = self.skill_index, self.interest_index
+        encode_skills, encode_interests = self.skill_vocabulary.encode, self.interest_vocabulary.encode
+        for offset, (wallet_address, skills, interests, member_uuid, joined_at_us) in enumerate(chunk):
+            row = start + offset
+            self._row_wallets.append(wallet_address)
+            self._row_skills.append(encode_skills(skills))
+            self._row_interests.append(encode_interests(interests))
+            for skill in set(skills):
+                skill_index[skill].append(row)
+            for interest in set(interests):
+                interest_index[interest].append(row)
+            counts.append((len(skills), len(interests)))
+            if member_uuid is not None:
+                uuids[offset] = np.frombuffer(member_uuid, dtype=np.uint8)
+            if joined_at_us is not None:
+                self._joined_at_us[row] = joined_at_us
+        
+        self._member_uuids[start:end] = uuids
+        self._features[start:end] = np.array(counts, dtype=np.float64)
+        self._score_dirty[start:end] = True
+        self._row_versions[start:end] = np.arange(self.change_version + 1, self.change_version + 1 + len(chunk))
+        self.change_version += len(chunk)
+    
+    def _truncate_rows(self, start: int, wallets: Iterable[str]):
+        for index, vocabulary, packed_rows in (
+            (self.skill_index, self.skill_vocabulary, self._row_skills),
+            (self.interest_index, self.interest_vocabulary, self._row_interests),
+        ):
+            for packed in packed_rows[start:]:
+                for term in set(vocabulary.decode(packed)):
+                    rows = index.get(term)
+                    while rows and rows[-1] >= start:
+                        rows.pop()
+                    if rows is not None and not rows:
+                        del index[term]
+        for wallet_address in wallets:
+            if self._member_rows.get(wallet_address, -1) >= start:
+                del self._member_rows[wallet_address]
+        del self._row_wallets[start:]
+        del self._row_skills[start:]
+        del self._row_interests[start:]
+    
+    def _member_at(self, row: int) -> CommunityMember:
+        if self._score_dirty[row]:
+            self._scores[row] = self._features[row] @ self._score_weights
+            self._score_dirty[row] = False
+        return CommunityMember(
+            id=str(uuid.UUID(bytes=self._member_uuids[row].tobytes())),
+            wallet_address=self._row_wallets[row],
+            skills=self.skill_vocabulary.decode(self._row_skills[row]),
+            interests=self.interest_vocabulary.decode(self._row_interests[row]),
+            contribution_score=float(self._scores[row]),
+            joined_at=_from_epoch_us(self._joined_at_us[row])
+        )
+    
+    def update_member(
+        self,
+        wallet_address: str,
+        skills: Optional[List[str]] = None,
+        interests: Optional[List[str]] = None
+    ) -> CommunityMember:
+        """
+        Replace a member's skills and/or interests
+        
+        :param wallet_address: Wallet address of the member
+        :param skills: New list of skills (unchanged if None)
+        :param interests: New list of interests (unchanged if None)
+        :return: Updated community member profile
+        """
+        row = self._member_rows.get(wallet_address)
+        if row is None:
+            raise ValueError("Member does not exist")
+        
+        self._unindex_row(row)
+        if skills is not None:
+            self._row_skills[row] = self.skill_vocabulary.encode(skills)
+        if interests is not None:
+            self._row_interests[row] = self.interest_vocabulary.encode(interests)
+        self._index_row(row)
+        return self._member_at(row)
+    
+    def _index_row(self, row: int):
+        skills = self.skill_vocabulary.decode(self._row_skills[row])
+        interests = self.interest_vocabulary.decode(self._row_interests[row])
+        for skill in set(skills):
+            _index_term(self.skill_index, self._skill_tombstones, skill, row)
+        for interest in set(interests):
+            _index_term(self.interest_index, self._interest_tombstones, interest, row)
         
-        self.members[wallet_address] = member
-        return member
+        self._features[row] = (len(skills), len(interests))
+        self._score_dirty[row] = True
+        self.change_version += 1
+        self._row_versions[row] = self.change_version
+    
+    def _unindex_row(self, row: int):
+        for skill in set(self.skill_vocabulary.decode(self._row_skills[row])):
+            _unindex_term(self.skill_index, self._skill_tombstones, skill, row)
+        for interest in set(self.interest_vocabulary.decode(self._row_interests[row])):
+            _unindex_term(self.interest_index, self._interest_tombstones, interest, row)
+    
+    def _grow_columns(self, min_capacity: int):
+        capacity = max(min_capacity, len(self._scores) * 2)
+        grown = len(self._scores)
+        self._features = np.resize(self._features, (capacity, len(SCORE_FEATURES)))
+        self._scores = np.resize(self._scores, capacity)
+        self._score_dirty = np.resize(self._score_dirty, capacity)
+        self._score_dirty[grown:] = True
+        self._row_versions = np.resize(self._row_versions, capacity)
+        self._row_versions[grown:] = 0
+        self._member_uuids = np.resize(self._member_uuids, (capacity, 16))
+        self._joined_at_us = np.resize(self._joined_at_us, capacity)
     
     def match_potential_collaborators(
         self, 
         project_skills: List[str], 
-        project_interests: List[str]
+        project_interests: List[str],
+        limit: Optional[int] = None,
+        skill_weight: float = 1.0,
+        interest_weight: float = 0.0
     ) -> List[CommunityMember]:
         """
         Find potential collaborators based on skills and interests
         
+        Only members sharing at least one skill or interest are scored, via
+        the inverted indexes, and the top `limit` are selected with a heap.
+        With the default weights members are ranked by shared skills alone.
+        
         :param project_skills: Required skills for the project
         :param project_interests: Project domain interests
-        :return: List of matching community members
-        """
-        matching_members = [
-            member for member in self.members.values()
-            if any(skill in project_skills for skill in member.skills) or
-               any(interest in project_interests for interest in member.interests)
-        ]
-        
-        return sorted(
-            matching_members, 
-            key=lambda m: len(set(m.skills) & set(project_skills)), 
-            reverse=True
+        :param limit: Maximum number of members to return (None for all matches)
+        :param skill_weight: Score added per shared skill
+        :param interest_weight: Score added per shared interest
+        :return: List of matching community members, best match first
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for skill in set(project_skills):
+            for row in _term_rows(self.skill_index, self._skill_tombstones, skill):
+                scores[row] += skill_weight
+        for interest in set(project_interests):
+            for row in _term_rows(self.interest_index, self._interest_tombstones, interest):
+                scores[row] += interest_weight
+        
+        rank = lambda row: (scores[row], -row)
+        if limit is None:
+            ranked = sorted(scores, key=rank, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores, key=rank)
+        
+        return [self._member_at(row) for row in ranked]
+    
+    def set_score_weights(self, weights: Dict[str, float]):
+        """
+        Change the contribution score weights, invalidating every cached score
+        
+        :param weights: Weight per feature name in SCORE_FEATURES
+        """
+        unknown = set(weights) - set(SCORE_FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown score features: {sorted(unknown)}")
+        self._score_weights = np.array([weights.get(name, 0.0) for name in SCORE_FEATURES], dtype=np.float64)
+        self._score_dirty[:] = True
+    
+    def _refresh_scores(self):
+        # Only rows whose features changed since the last pass are recomputed
+        count = len(self._row_wallets)
+        dirty_rows = np.flatnonzero(self._score_dirty[:count])
+        if dirty_rows.size:
+            self._scores[dirty_rows] = self._features[dirty_rows] @ self._score_weights
+            self._score_dirty[dirty_rows] = False
+    
+    def calculate_contribution_scores(self, wallet_addresses: Optional[Iterable[str]] = None) -> np.ndarray:
+        """
+        Calculate contribution scores for many members in one vectorized pass
+        
+        :param wallet_addresses: Members to score; all members, in insertion order, if None
+        :return: Array of scores aligned with wallet_addresses (0.0 for unknown wallets)
+        """
+        self._refresh_scores()
+        count = len(self._row_wallets)
+        if wallet_addresses is None:
+            return self._scores[:count].copy()
+        
+        rows = np.fromiter(
+            (self._member_rows.get(wallet_address, -1) for wallet_address in wallet_addresses),
+            dtype=np.int64
         )
+        return np.where(rows >= 0, self._scores[np.maximum(rows, 0)], 0.0)
+    
+    def contribution_leaderboard(self, top_n: int = 100) -> List[Tuple[str, float]]:
+        """
+        Highest contribution scores across the whole community
+        
+        :param top_n: Number of leaderboard entries
+        :return: (wallet_address, score) pairs, best first
+        """
+        scores = self.calculate_contribution_scores()
+        top_n = min(top_n, scores.size)
+        if top_n <= 0:
+            return []
+        top_rows = np.argpartition(-scores, top_n - 1)[:top_n]
+        top_rows = top_rows[np.argsort(-scores[top_rows], kind='stable')]
+        return [(self._row_wallets[row], float(scores[row])) for row in top_rows]
     
     def calculate_contribution_score(self, wallet_address: str) -> float:
         """
@@ -89,15 +516,10 @@ class CommunityOnboardingEngine:
         :param wallet_address: Wallet address of the member
         :return: Contribution score
         """
-        member = self.members.get(wallet_address)
-        if not member:
+        if wallet_address not in self.members:
             return 0.0
         
-        # Placeholder scoring mechanism
-        skill_diversity_score = len(member.skills) * 0.5
-        interest_alignment_score = len(member.interests) * 0.3
-        
-        return skill_diversity_score + interest_alignment_score
+        return float(self.calculate_contribution_scores([wallet_address])[0])
     
     def export_community_data(self, output_path: str):
         """
@@ -113,6 +535,116 @@ class CommunityOnboardingEngine:
         
         with open(output_path, 'w') as f:
             json.dump(community_data, f, indent=2)
+    
+    def export_community_ndjson(
+        self,
+        output_path: str,
+        since: int = 0,
+        compress: Optional[bool] = None
+    ) -> int:
+        """
+        Stream community members to an NDJSON file, optionally gzip-compressed
+        
+        The first line is a header record; every following line is one member,
+        with its current contribution score (usable as a reward weight) and
+        the change version it was last modified at. With `since` set to a
+        checkpoint returned by an earlier export, only members added or
+        changed after that export are written.
+        
+        :param output_path: Destination path (gzip is used by default for *.gz)
+        :param since: Checkpoint of a previous export, 0 for a full snapshot
+        :param compress: Force gzip on or off regardless of the file extension
+        :return: Checkpoint to pass as `since` for the next delta export
+        """
+        checkpoint = self.change_version
+        count = len(self._row_wallets)
+        changed_rows = np.flatnonzero(self._row_versions[:count] > since)
+        
+        with _open_ndjson(output_path, 'w', compress) as f:
+            f.write(json.dumps({
+                'leader_wallet': self.leader_wallet,
+                'total_members': len(self.members),
+                'exported_members': int(changed_rows.size),
+                'since': since,
+                'checkpoint': checkpoint
+            }) + '\n')
+            for row in changed_rows:
+                record = asdict(self._member_at(row))
+                record['version'] = int(self._row_versions[row])
+                f.write(json.dumps(record) + '\n')
+        
+        return checkpoint
+    
+    def import_community_ndjson(
+        self,
+        input_path: str,
+        compress: Optional[bool] = None,
+        preserve_versions: bool = False
+    ) -> int:
+        """
+        Stream a full or delta NDJSON export into the community, line by line
+        
+        Members already present are updated in place; new ones are inserted
+        with their exported id and join date. Contribution scores are
+        recomputed from skills and interests with this engine's weights.
+        Imported members count as changes of this engine unless
+        `preserve_versions` keeps the exporter's change versions, which lets
+        delta checkpoints of the exporter carry over to this engine.
+        
+        :param input_path: File written by export_community_ndjson
+        :param compress: Force gzip on or off regardless of the file extension
+        :param preserve_versions: Keep each member's exported change version
+        :return: Number of member records applied
+        """
+        applied = 0
+        with _open_ndjson(input_path, 'r', compress) as f:
+            header = json.loads(f.readline())
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                wallet_address = record['wallet_address']
+                member_uuid = uuid.UUID(record['id']).bytes
+                joined_at_us = _to_epoch_us(record.get('joined_at'))
+                row = self._member_rows.get(wallet_address)
+                if row is None:
+                    self._insert_member(
+                        wallet_address,
+                        record['skills'],
+                        record['interests'],
+                        member_uuid,
+                        joined_at_us
+                    )
+                else:
+                    self.update_member(wallet_address, record['skills'], record['interests'])
+                    self._member_uuids[row] = np.frombuffer(member_uuid, dtype=np.uint8)
+                    self._joined_at_us[row] = joined_at_us
+                if preserve_versions and 'version' in record:
+                    self._row_versions[self._member_rows[wallet_address]] = record['version']
+                applied += 1
+        
+        if preserve_versions:
+            # Later changes must sort after everything the exporter had seen
+            self.change_version = max(self.change_version, header.get('checkpoint', 0))
+        return applied
+    
+    @classmethod
+    def from_ndjson(cls, input_path: str, compress: Optional[bool] = None) -> 'CommunityOnboardingEngine':
+        """
+        Rebuild a community from a full NDJSON snapshot
+        
+        Change versions are restored, so the snapshot's checkpoint remains a
+        valid `since` for delta exports of the rebuilt engine.
+        
+        :param input_path: File written by export_community_ndjson
+        :param compress: Force gzip on or off regardless of the file extension
+        :return: Community onboarding engine holding the snapshot's members
+        """
+        with _open_ndjson(input_path, 'r', compress) as f:
+            header = json.loads(f.readline())
+        engine = cls(header['leader_wallet'])
+        engine.import_community_ndjson(input_path, compress, preserve_versions=True)
+        return engine
 
 def initialize_eon_xrp_community(leader_wallet: str):
     """
@@ -0,0 +1,18 @@
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+
+from backend.src.models.activity import ActivityEvent
+
+def activity_event(action: str, username: Optional[str] = None, **detail: Any) -> ActivityEvent:
+    """
+    Build an activity row for the caller's session; the backend's feed picks it up
+    """
+    return ActivityEvent(
+        event_id=uuid.uuid4().hex,
+        occurred_at=datetime.utcnow(),
+        action=action,
+        username=username,
+        detail=json.dumps(detail)
+    )
@@ -0,0 +1,102 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+from xrpl.models.requests.request import Request
+from xrpl.models.response import Response
+
+from backend.src.integrations.node_pool import NodePool
+from backend.src.utils.metrics import XRPL_RPC_ERRORS, XRPL_RPC_SECONDS
+
+# Connection pool configuration
+XRPL_RPC_TIMEOUT = float(os.getenv('XRPL_RPC_TIMEOUT', '10'))
+XRPL_MAX_CONNECTIONS = int(os.getenv('XRPL_MAX_CONNECTIONS', '20'))
+XRPL_MAX_KEEPALIVE = int(os.getenv('XRPL_MAX_KEEPALIVE', '10'))
+
+
+class PooledAsyncJsonRpcClient(AsyncJsonRpcClient):
+    """
+    Async JSON-RPC client that reuses one keep-alive HTTP connection pool
+
+    xrpl-py's AsyncJsonRpcClient opens a fresh httpx client (and TLS session)
+    for every request; this one holds a single pooled client for its lifetime
+    and routes each call through a NodePool.
+    """
+
+    def __init__(
+        self,
+        pool: NodePool,
+        timeout: float = XRPL_RPC_TIMEOUT,
+        max_connections: int = XRPL_MAX_CONNECTIONS,
+        max_keepalive: int = XRPL_MAX_KEEPALIVE
+    ):
+        """
+        :param pool: rippled nodes to route between
+        :param timeout: Default timeout in seconds for each RPC call
+        :param max_connections: Upper bound on concurrent connections
+        :param max_keepalive: Idle connections kept open for reuse
+        """
+        super().__init__(pool.urls[0])
+        self.pool = pool
+        self.timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive
+        )
+        self._http: Optional[httpx.AsyncClient] = None
+        self._prober: Optional[asyncio.Task] = None
+
+    def _get_http(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(timeout=self.timeout, limits=self._limits)
+        return self._http
+
+    async def _send(self, url: str, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        http_response = await self._get_http().post(
+            url,
+            json=payload,
+            timeout=self.timeout if timeout is None else timeout
+        )
+        return http_response.json()
+
+    async def _request_impl(self, request: Request, timeout: Optional[float] = None) -> Response:
+        if self._prober is None and len(self.pool.nodes) > 1:
+            self._prober = asyncio.create_task(self.pool.probe_forever(self._send))
+        method = request.method.value
+        start = time.perf_counter()
+        try:
+            body = await self.pool.request(lambda url, payload: self._send(url, payload, timeout), request_to_json_rpc(request))
+            response = json_to_response(body)
+        except Exception as e:
+            XRPL_RPC_ERRORS.labels(method, type(e).__name__).inc()
+            raise
+        finally:
+            XRPL_RPC_SECONDS.labels(method).observe(time.perf_counter() - start)
+        if not response.is_successful():
+            XRPL_RPC_ERRORS.labels(method, response.result.get('error', 'unknown')).inc()
+        return response
+
+    async def request_with_timeout(self, request: Request, timeout: float) -> Response:
+        """
+        Send a request with a timeout that overrides the client default
+
+        :param request: XRPL request model
+        :param timeout: Timeout in seconds for this call only
+        :return: Parsed XRPL response
+        """
+        return await self._request_impl(request, timeout=timeout)
+
+    async def aclose(self):
+        """
+        Stop probing and close the pooled HTTP connections
+        """
+        if self._prober is not None:
+            self._prober.cancel()
+            self._prober = None
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
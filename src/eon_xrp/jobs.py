@@ -0,0 +1,423 @@
+import os
+import json
+import uuid
+import socket
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from sqlalchemy import Column, DateTime, Integer, String, Table, Text, Index, and_, inspect, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from backend.src.database import DATABASE_URL, async_database_url, resolve_database_url
+from backend.src.utils.logger import logger
+
+# Job persistence: the backend's database unless given its own
+MINT_JOBS_DATABASE_URL = resolve_database_url(os.getenv('MINT_JOBS_DATABASE_URL', DATABASE_URL))
+MINT_JOB_CONCURRENCY = int(os.getenv('MINT_JOB_CONCURRENCY', '4'))
+MINT_JOB_MAX_ATTEMPTS = int(os.getenv('MINT_JOB_MAX_ATTEMPTS', '5'))
+MINT_JOB_BACKOFF_SECONDS = float(os.getenv('MINT_JOB_BACKOFF_SECONDS', '2'))
+MINT_JOB_POLL_SECONDS = float(os.getenv('MINT_JOB_POLL_SECONDS', '1'))
+# A running job whose lease is not renewed for this long is taken over by another worker
+MINT_JOB_LEASE_SECONDS = float(os.getenv('MINT_JOB_LEASE_SECONDS', '60'))
+# How often a watched job's row is re-read, catching updates made by other processes
+MINT_JOB_WATCH_POLL_SECONDS = float(os.getenv('MINT_JOB_WATCH_POLL_SECONDS', '2'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+Base = declarative_base()
+
+class MintJob(Base):
+    __tablename__ = 'mint_jobs'
+
+    id = Column(String, primary_key=True)
+    kind = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default=QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    result = Column(Text, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow)
+    # Lease of the process running the job, renewed while it runs
+    locked_by = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime, nullable=True)
+    # Handler checkpoint (JSON) carried across attempts, see JobState
+    state = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index('ix_mint_jobs_claim', 'status', 'next_attempt_at'),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'attempts': self.attempts,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+        }
+
+def _add_missing_columns(conn):
+    # create_all never alters an existing table; every column added since
+    # the first release is nullable, so adding it is enough
+    existing = {column['name'] for column in inspect(conn).get_columns(MintJob.__tablename__)}
+    for column in MintJob.__table__.columns:
+        if column.name not in existing:
+            conn.execute(text(
+                f"ALTER TABLE {MintJob.__tablename__} ADD COLUMN {column.name} {column.type.compile(conn.dialect)}"
+            ))
+
+class LeaseLost(Exception):
+    """
+    The job's lease expired and another worker may have taken it over
+    """
+
+class JobState:
+    """
+    Handler scratch space persisted on the job row, so a retry of the same
+    job can pick up where the failed attempt stopped
+    """
+
+    def __init__(self, queue: 'MintJobQueue', job: 'MintJob'):
+        self.data: Dict[str, Any] = json.loads(job.state) if job.state else {}
+        self._queue = queue
+        self._job_id = job.id
+
+    async def save(self):
+        """
+        Persist data; raises LeaseLost if this worker no longer holds the job
+        """
+        await self._queue._save_state(self._job_id, self.data)
+
+JobHandler = Callable[[Dict[str, Any], JobState], Awaitable[Dict[str, Any]]]
+# (session, kind, payload, result), run in the transaction that marks the job succeeded
+JobRecorder = Callable[[AsyncSession, str, Dict[str, Any], Dict[str, Any]], Awaitable[None]]
+
+class MintJobQueue:
+    """
+    Persistent mint job queue processed by a bounded pool of async workers
+
+    Jobs are rows in `mint_jobs`, so they survive restarts; workers claim a
+    job with a conditional UPDATE, which keeps several app processes sharing
+    one database from running the same job twice. A claim is a lease that
+    the owning process renews while it runs; only jobs whose lease expired
+    (their process died) are taken over, so processes overlapping during a
+    deploy leave each other's jobs alone.
+    """
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        database_url: str = MINT_JOBS_DATABASE_URL,
+        concurrency: int = MINT_JOB_CONCURRENCY,
+        max_attempts: int = MINT_JOB_MAX_ATTEMPTS,
+        backoff_seconds: float = MINT_JOB_BACKOFF_SECONDS,
+        poll_seconds: float = MINT_JOB_POLL_SECONDS,
+        recorders: Optional[Dict[str, JobRecorder]] = None,
+        tables: Sequence[Table] = (),
+        lease_seconds: float = MINT_JOB_LEASE_SECONDS,
+        watch_poll_seconds: float = MINT_JOB_WATCH_POLL_SECONDS
+    ):
+        """
+        :param handlers: Job kind -> coroutine performing the mint, returning a result dict
+        :param database_url: SQLAlchemy URL of the job store
+        :param concurrency: Number of worker tasks
+        :param max_attempts: Attempts before a job is marked failed
+        :param backoff_seconds: Base of the exponential retry delay
+        :param poll_seconds: Idle polling interval for delayed or foreign jobs
+        :param lease_seconds: Lease on a running job, renewed every third of it
+        :param recorders: Job kind -> coroutine persisting a successful result
+            atomically with the job's status
+        :param tables: Tables the recorders write to, created with the job table
+        :param watch_poll_seconds: Interval at which watch() re-reads a followed job
+        """
+        self.handlers = handlers
+        self.recorders = recorders or {}
+        self.tables = tables
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.watch_poll_seconds = watch_poll_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._engine = create_async_engine(async_database_url(database_url))
+        self._sessions = async_sessionmaker(self._engine, expire_on_commit=False)
+        self._wakeup = asyncio.Event()
+        self._workers: List[asyncio.Task] = []
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchers: Set[asyncio.Queue] = set()
+        # Jobs this process is running; only their leases are renewed
+        self._running: Set[str] = set()
+
+    async def start(self):
+        """
+        Create the job table and start the workers and lease heartbeat
+
+        Jobs left running by a crashed process are picked up once their lease expires.
+        """
+        async with self._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_add_missing_columns)
+            for table in self.tables:
+                await conn.run_sync(table.create, checkfirst=True)
+        self._heartbeat = asyncio.create_task(self._renew_leases())
+        self._workers = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        tasks = self._workers + ([self._heartbeat] if self._heartbeat else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._heartbeat = None
+        await self._engine.dispose()
+
+    async def enqueue(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Persist a new job and wake an idle worker
+
+        :param kind: Handler name
+        :param payload: JSON-serializable job arguments
+        :return: Job status dict
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = MintJob(id=str(uuid.uuid4()), kind=kind, payload=json.dumps(payload), status=QUEUED)
+        async with self._sessions() as db:
+            db.add(job)
+            await db.commit()
+        self._wakeup.set()
+        self._publish(job)
+        return job.to_dict()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        async with self._sessions() as db:
+            job = await db.get(MintJob, job_id)
+            return job.to_dict() if job else None
+
+    async def watch(
+        self,
+        job_id: Optional[str] = None,
+        heartbeat_seconds: Optional[float] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Yield job status updates as they happen
+
+        Updates made in this process arrive immediately. A followed job is also
+        re-read every watch_poll_seconds, since another process sharing the
+        database may be the one running it.
+
+        :param job_id: Follow one job until it finishes; all jobs if None
+        :param heartbeat_seconds: Yield None after this long without an update,
+            so callers can keep their connection alive
+        """
+        loop = asyncio.get_running_loop()
+        updates: asyncio.Queue = asyncio.Queue(maxsize=1000)
+        self._watchers.add(updates)
+        try:
+            last = None
+            if job_id is not None:
+                last = await self.get(job_id)
+                if last is None:
+                    return
+                yield last
+                if last['status'] in TERMINAL_STATUSES:
+                    return
+            quiet_since = loop.time()
+            while True:
+                timeout = self.watch_poll_seconds if job_id is not None else None
+                if heartbeat_seconds is not None:
+                    remaining = max(0.0, quiet_since + heartbeat_seconds - loop.time())
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                try:
+                    job_update = await asyncio.wait_for(updates.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    job_update = None
+                    if job_id is not None:
+                        try:
+                            job_update = await self.get(job_id)
+                        except Exception as e:
+                            logger.error(f"Reading mint job {job_id} failed: {e}")
+                        else:
+                            if job_update is None:
+                                return
+                if job_update is not None and job_id is not None and job_update['job_id'] != job_id:
+                    continue
+                if job_update is None or job_update == last:
+                    if heartbeat_seconds is not None and loop.time() - quiet_since >= heartbeat_seconds:
+                        quiet_since = loop.time()
+                        yield None
+                    continue
+                last = job_update
+                quiet_since = loop.time()
+                yield job_update
+                if job_id is not None and job_update['status'] in TERMINAL_STATUSES:
+                    return
+        finally:
+            self._watchers.discard(updates)
+
+    def _publish(self, job: MintJob):
+        snapshot = job.to_dict()
+        for updates in self._watchers:
+            if not updates.full():
+                updates.put_nowait(snapshot)
+
+    def _claimable(self, now: datetime):
+        return or_(
+            and_(MintJob.status == QUEUED, MintJob.next_attempt_at <= now),
+            and_(
+                MintJob.status == RUNNING,
+                or_(
+                    MintJob.lease_expires_at < now,
+                    # Claimed before leases existed
+                    and_(MintJob.lease_expires_at.is_(None), MintJob.updated_at < now - timedelta(seconds=self.lease_seconds))
+                )
+            )
+        )
+
+    async def _claim(self) -> Optional[MintJob]:
+        now = datetime.utcnow()
+        async with self._sessions() as db:
+            candidate = (await db.execute(
+                select(MintJob.id)
+                .where(self._claimable(now))
+                .order_by(MintJob.created_at)
+                .limit(1)
+            )).scalar()
+            if candidate is None:
+                return None
+            claimed = await db.execute(
+                update(MintJob)
+                .where(MintJob.id == candidate, self._claimable(now))
+                .values(
+                    status=RUNNING,
+                    attempts=MintJob.attempts + 1,
+                    locked_by=self.owner,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    updated_at=now
+                )
+            )
+            await db.commit()
+            if claimed.rowcount != 1:
+                # Another worker won the race, look again right away
+                self._wakeup.set()
+                return None
+            return await db.get(MintJob, candidate, populate_existing=True)
+
+    async def _renew_leases(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not self._running:
+                continue
+            try:
+                async with self._sessions() as db:
+                    await db.execute(
+                        update(MintJob)
+                        .where(
+                            MintJob.id.in_(list(self._running)),
+                            MintJob.locked_by == self.owner,
+                            MintJob.status == RUNNING
+                        )
+                        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds))
+                    )
+                    await db.commit()
+            except Exception as e:
+                # Leases lapse and the jobs move to a healthy process
+                logger.error(f"Mint job lease renewal failed: {e}")
+
+    def _owned(self, job_id: str):
+        return and_(MintJob.id == job_id, MintJob.locked_by == self.owner, MintJob.status == RUNNING)
+
+    async def _save_state(self, job_id: str, data: Dict[str, Any]):
+        async with self._sessions() as db:
+            saved = await db.execute(update(MintJob).where(self._owned(job_id)).values(state=json.dumps(data)))
+            await db.commit()
+        if saved.rowcount != 1:
+            raise LeaseLost(f"Lost the lease on job {job_id}")
+
+    async def _finish(self, job: MintJob, result: Optional[Dict[str, Any]], error: Optional[str]):
+        now = datetime.utcnow()
+        values = {'updated_at': now, 'locked_by': None, 'lease_expires_at': None}
+        if error is None:
+            values.update(status=SUCCEEDED, result=json.dumps(result), error=None)
+        elif job.attempts >= self.max_attempts:
+            values.update(status=FAILED, error=error)
+        else:
+            delay = self.backoff_seconds * (2 ** (job.attempts - 1))
+            values.update(status=QUEUED, error=error, next_attempt_at=now + timedelta(seconds=delay))
+        async with self._sessions() as db:
+            finished = await db.execute(update(MintJob).where(self._owned(job.id)).values(**values))
+            if finished.rowcount != 1:
+                # Taken over after our lease expired; the new owner reports the outcome
+                await db.rollback()
+                return
+            recorder = self.recorders.get(job.kind)
+            if error is None and recorder is not None:
+                await recorder(db, job.kind, json.loads(job.payload), result)
+            await db.commit()
+            job = await db.get(MintJob, job.id, populate_existing=True)
+        self._publish(job)
+
+    async def _settle(self, job: MintJob, result: Optional[Dict[str, Any]], error: Optional[str]):
+        try:
+            await self._finish(job, result, error)
+            return
+        except Exception as e:
+            # e.g. the recorder hit a constraint; retry or fail the job
+            # rather than leave it running under this process's lease
+            logger.error(f"Finishing mint job {job.id} failed: {e}")
+            error = f"Finishing the job failed: {e}"
+        try:
+            await self._finish(job, None, error)
+        except Exception as e:
+            # No longer renewed, so the lease lapses and another worker retries it
+            logger.error(f"Releasing mint job {job.id} failed: {e}")
+
+    async def _run(self, job: MintJob):
+        self._running.add(job.id)
+        try:
+            self._publish(job)
+            try:
+                result = await self.handlers[job.kind](json.loads(job.payload), JobState(self, job))
+            except LeaseLost:
+                return
+            except Exception as e:
+                logger.error(f"Mint job {job.id} attempt {job.attempts} failed: {e}")
+                await self._settle(job, None, str(e))
+                return
+            if result.get('status') == 'error':
+                await self._settle(job, None, result.get('message', 'Mint failed'))
+            else:
+                await self._settle(job, result, None)
+        finally:
+            self._running.discard(job.id)
+
+    async def _work(self):
+        while True:
+            # Cleared before claiming so an enqueue during the claim is not missed
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+                if job is not None:
+                    await self._run(job)
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Job store unavailable; the job stays claimable once it recovers
+                logger.error(f"Mint job worker error: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
@@ -1,57 +1,217 @@
 import os
+import sys
+import json
+import asyncio
+from functools import lru_cache
+import httpx
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from xrpl.wallet import Wallet
-from xrpl.clients import JsonRpcClient
-from xrpl.models.transactions import Payment, TokenMint
-from xrpl.transaction import submit
-from typing import Dict, Any
+from fastapi import FastAPI, HTTPException, status
+from fastapi.responses import StreamingResponse
+from typing import TYPE_CHECKING, Dict, Any, Optional
+
+from backend.src.utils.metrics import InstrumentedRoute, metrics_response
+
+from .jobs import JobState, LeaseLost, MintJobQueue
+from .registry import REGISTRY_TABLES, record_mint, uri_slug
+
+if TYPE_CHECKING:
+    # xrpl-py is imported on first use, keeping it out of worker cold start
+    from xrpl.wallet import Wallet
 
 # Load environment variables
 load_dotenv()
 
 # Platform Configuration
 PLATFORM_SUPPORT_EMAIL = os.getenv('PLATFORM_SUPPORT_EMAIL', 'support@eonxrp.com')
+XRPL_SUBMIT_TIMEOUT = float(os.getenv('XRPL_SUBMIT_TIMEOUT', '20'))
+# Interval between checks for a submitted transaction's validation
+XRPL_VALIDATION_POLL_SECONDS = float(os.getenv('XRPL_VALIDATION_POLL_SECONDS', '1'))
+# Timeout of each of those checks; a slow one is retried at the next poll
+XRPL_LOOKUP_TIMEOUT = float(os.getenv('XRPL_LOOKUP_TIMEOUT', '5'))
+# Idle interval after which a job event stream sends a keepalive comment
+JOB_EVENTS_HEARTBEAT_SECONDS = float(os.getenv('JOB_EVENTS_HEARTBEAT_SECONDS', '15'))
+
+MEME_TOKEN_UNSUPPORTED = (
+    "Meme token minting is unavailable: the installed xrpl-py has no TokenMint "
+    "transaction (fungible XRPL tokens are issued over trust lines instead)"
+)
+
+@lru_cache(maxsize=None)
+def token_mint_model():
+    """
+    The TokenMint transaction model, or None if xrpl-py does not provide one
+    """
+    try:
+        from xrpl.models.transactions import TokenMint
+    except ImportError:
+        return None
+    return TokenMint
 
 class EONXRPPlatform:
     def __init__(self, network='testnet'):
         """
         Initialize the EON XRP Platform
         
-        :param network: Network to connect to (testnet or mainnet)
+        :param network: Network to connect to (testnet, mainnet or devnet)
         """
-        if network == 'testnet':
-            self.client = JsonRpcClient('https://s.altnet.rippletest.net:51234/')
-        elif network == 'mainnet':
-            self.client = JsonRpcClient('https://xrplcluster.com/')
-        else:
-            raise ValueError("Invalid network. Choose 'testnet' or 'mainnet'")
+        from backend.src.integrations.node_pool import NodePool, node_urls
+
+        from .async_client import PooledAsyncJsonRpcClient
+        
+        # Same endpoint defaults as the backend; XRPL_RPC_URL(S) override them
+        urls = node_urls(network)
+        if urls is None:
+            raise ValueError("Invalid network. Choose 'testnet', 'mainnet' or 'devnet'")
+        self.client = PooledAsyncJsonRpcClient(NodePool(urls))
         
         self.support_email = PLATFORM_SUPPORT_EMAIL
+        self.submit_timeout = XRPL_SUBMIT_TIMEOUT
     
-    def create_meme_token(self, creator_wallet: Wallet, token_name: str, total_supply: int = 1_000_000_000):
+    async def _sign_and_submit(self, transaction, wallet: 'Wallet', checkpoint: Optional[JobState] = None) -> Dict[str, Any]:
+        """
+        Autofill, sign and submit a transaction without blocking the event loop,
+        then wait for it to be validated
+        
+        The signed blob and its hash are checkpointed before the first
+        submission. A retry looks the hash up first and resubmits the same blob,
+        which cannot apply twice; a new transaction is only signed once the old
+        one was rejected, failed or can no longer make it into a ledger.
+        
+        :param transaction: Unsigned transaction model, ignored if the checkpoint holds a signed one
+        :param wallet: Wallet used to sign the transaction
+        :param checkpoint: Mint job state carried across retries
+        :return: Transaction hash, signing account and validated ledger index
+        :raises RuntimeError: If the transaction was rejected, failed or expired
+        """
+        from xrpl.asyncio.ledger import get_latest_validated_ledger_sequence
+        from xrpl.asyncio.transaction import autofill_and_sign
+        from xrpl.models.requests import SubmitOnly, Tx
+        
+        signed = checkpoint.data if checkpoint is not None else {}
+        
+        async def _validated(tx_hash: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+            if timeout is None:
+                found = await self.client.request(Tx(transaction=tx_hash))
+            else:
+                found = await self.client.request_with_timeout(Tx(transaction=tx_hash), timeout)
+            if not found.is_successful() or not found.result.get('validated'):
+                return None
+            return found.result
+        
+        async def _expired() -> bool:
+            return await get_latest_validated_ledger_sequence(self.client) > signed['last_ledger_sequence']
+        
+        async def _forget():
+            # The next attempt signs afresh
+            signed.clear()
+            if checkpoint is not None:
+                await checkpoint.save()
+        
+        async def _run():
+            final = None
+            if 'tx_hash' in signed:
+                # An earlier attempt may have got it into a ledger
+                final = await _validated(signed['tx_hash'])
+                if final is None and await _expired():
+                    signed.clear()
+            if final is None:
+                if 'tx_hash' not in signed:
+                    signed_tx = await autofill_and_sign(transaction=transaction, wallet=wallet, client=self.client)
+                    signed.update(
+                        account=signed_tx.account,
+                        tx_blob=signed_tx.blob(),
+                        tx_hash=signed_tx.get_hash(),
+                        last_ledger_sequence=signed_tx.last_ledger_sequence
+                    )
+                    if checkpoint is not None:
+                        await checkpoint.save()
+                response = await self.client.request(SubmitOnly(tx_blob=signed['tx_blob']))
+                engine_result = response.result.get('engine_result', '')
+                if engine_result[:3] in ('tem', 'tel', 'tef') and engine_result not in ('tefALREADY', 'tefPAST_SEQ'):
+                    # Never applied
+                    await _forget()
+                    raise RuntimeError(f"Transaction rejected: {engine_result}")
+                if not response.is_successful():
+                    raise RuntimeError(f"Transaction rejected: {response.result}")
+                # Preliminary results (tes, tec, ter) are not final until validated
+                while final is None:
+                    await asyncio.sleep(XRPL_VALIDATION_POLL_SECONDS)
+                    try:
+                        # A slow node costs one poll rather than the whole submit timeout
+                        final = await _validated(signed['tx_hash'], XRPL_LOOKUP_TIMEOUT)
+                    except httpx.TimeoutException:
+                        continue
+                    if final is None and await _expired():
+                        # Look once more: it may have been validated in the meantime
+                        final = await _validated(signed['tx_hash'])
+                        if final is None:
+                            await _forget()
+                            raise RuntimeError("Transaction expired without being validated")
+            result = final.get('meta', {}).get('TransactionResult')
+            if result != 'tesSUCCESS':
+                # A tec result took the fee but minted nothing
+                await _forget()
+                raise RuntimeError(f"Transaction failed: {result}")
+            return {**signed, 'ledger_index': final.get('ledger_index')}
+        
+        return await asyncio.wait_for(_run(), timeout=self.submit_timeout)
+    
+    async def close(self):
+        """
+        Release pooled XRPL connections
+        """
+        await self.client.aclose()
+    
+    async def create_meme_token(
+        self,
+        creator_wallet: 'Wallet',
+        token_name: str,
+        total_supply: int = 1_000_000_000,
+        checkpoint: Optional[JobState] = None
+    ):
         """
         Create a new meme token on the XRP Ledger
         
         :param creator_wallet: Wallet of the token creator
         :param token_name: Name of the meme token
         :param total_supply: Total supply of tokens
+        :param checkpoint: Mint job state, making retries idempotent
         :return: Token creation transaction result
         """
+        TokenMint = token_mint_model()
+        if TokenMint is None:
+            return {
+                "status": "error",
+                "message": MEME_TOKEN_UNSUPPORTED,
+                "support_contact": self.support_email
+            }
+        
+        slug = uri_slug(token_name)
         # Mint tokens
         mint_tx = TokenMint(
             account=creator_wallet.classic_address,
             token_tax_amount='0',
-            uri=f"https://eonxrp.com/memes/{token_name.lower().replace(' ', '-')}",
+            uri=f"https://eonxrp.com/memes/{slug}",
             flags=8  # Enable transferable flag
         )
         
         try:
-            response = submit(mint_tx, creator_wallet, self.client)
+            submitted = await self._sign_and_submit(mint_tx, creator_wallet, checkpoint)
             return {
                 "status": "success",
                 "token_name": token_name,
-                "transaction_hash": response.result.get('tx_json', {}).get('hash'),
+                "creator": submitted['account'],
+                "uri_slug": slug,
+                "transaction_hash": submitted['tx_hash'],
+                "ledger_index": submitted['ledger_index'],
+                "support_contact": self.support_email
+            }
+        except LeaseLost:
+            raise
+        except asyncio.TimeoutError:
+            return {
+                "status": "error",
+                "message": f"XRPL transaction not validated within {self.submit_timeout}s",
                 "support_contact": self.support_email
             }
         except Exception as e:
@@ -61,28 +221,51 @@ class EONXRPPlatform:
                 "support_contact": self.support_email
             }
     
-    def create_nft_collection(self, creator_wallet: Wallet, collection_name: str, description: str):
+    async def create_nft_collection(
+        self,
+        creator_wallet: 'Wallet',
+        collection_name: str,
+        description: str,
+        checkpoint: Optional[JobState] = None
+    ):
         """
         Create an NFT collection on the XRP Ledger
         
         :param creator_wallet: Wallet of the NFT collection creator
         :param collection_name: Name of the NFT collection
         :param description: Description of the NFT collection
+        :param checkpoint: Mint job state, making retries idempotent
         :return: Collection creation result
         """
+        from xrpl.models.transactions import NFTokenMint, NFTokenMintFlag
+        from xrpl.utils import str_to_hex
+        
+        slug = uri_slug(collection_name)
         # Mint a collection NFT
-        mint_tx = TokenMint(
+        mint_tx = NFTokenMint(
             account=creator_wallet.classic_address,
-            uri=f"https://eonxrp.com/nft-collections/{collection_name.lower().replace(' ', '-')}",
-            flags=8,  # Enable transferable flag
+            nftoken_taxon=0,
+            uri=str_to_hex(f"https://eonxrp.com/nft-collections/{slug}"),
+            flags=NFTokenMintFlag.TF_TRANSFERABLE,
         )
         
         try:
-            response = submit(mint_tx, creator_wallet, self.client)
+            submitted = await self._sign_and_submit(mint_tx, creator_wallet, checkpoint)
             return {
                 "status": "success",
                 "collection_name": collection_name,
-                "transaction_hash": response.result.get('tx_json', {}).get('hash'),
+                "creator": submitted['account'],
+                "uri_slug": slug,
+                "transaction_hash": submitted['tx_hash'],
+                "ledger_index": submitted['ledger_index'],
+                "support_contact": self.support_email
+            }
+        except LeaseLost:
+            raise
+        except asyncio.TimeoutError:
+            return {
+                "status": "error",
+                "message": f"XRPL transaction not validated within {self.submit_timeout}s",
                 "support_contact": self.support_email
             }
         except Exception as e:
@@ -102,58 +285,141 @@ app = FastAPI(
         "email": PLATFORM_SUPPORT_EMAIL,
     }
 )
+# Must be set before any route is declared
+app.router.route_class = InstrumentedRoute
+
+# Global platform instance, built by the first mint job
+_platform: Optional[EONXRPPlatform] = None
+
+def get_platform() -> EONXRPPlatform:
+    global _platform
+    if _platform is None:
+        _platform = EONXRPPlatform()
+    return _platform
+
+async def _mint_meme_token(token_details: Dict[str, Any], state: JobState) -> Dict[str, Any]:
+    from xrpl.wallet import Wallet
+    # In a real-world scenario, you'd validate the wallet and credentials.
+    # Unused on a retry that already holds a signed transaction.
+    creator_wallet = Wallet.create()
+    return await get_platform().create_meme_token(
+        creator_wallet,
+        token_details.get('name', 'EON Meme'),
+        token_details.get('total_supply', 1_000_000_000),
+        checkpoint=state
+    )
+
+async def _mint_nft_collection(collection_details: Dict[str, Any], state: JobState) -> Dict[str, Any]:
+    from xrpl.wallet import Wallet
+    # In a real-world scenario, you'd validate the wallet and credentials.
+    # Unused on a retry that already holds a signed transaction.
+    creator_wallet = Wallet.create()
+    return await get_platform().create_nft_collection(
+        creator_wallet,
+        collection_details.get('name', 'EON NFT Collection'),
+        collection_details.get('description', 'A unique NFT collection'),
+        checkpoint=state
+    )
+
+# Background mint jobs, processed outside the request
+mint_jobs = MintJobQueue(
+    {
+        'meme_token': _mint_meme_token,
+        'nft_collection': _mint_nft_collection,
+    },
+    # Successful mints land in token_registry, listed by the backend's /admin/tokens
+    recorders={
+        'meme_token': record_mint,
+        'nft_collection': record_mint,
+    },
+    tables=REGISTRY_TABLES
+)
+
+@app.on_event("startup")
+async def start_mint_jobs():
+    await mint_jobs.start()
 
-# Global platform instance
-platform = EONXRPPlatform()
+@app.on_event("shutdown")
+async def close_platform():
+    await mint_jobs.stop()
+    if _platform is not None:
+        await _platform.close()
 
-@app.post("/create-meme-token")
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
+
+@app.post("/create-meme-token", status_code=status.HTTP_202_ACCEPTED)
 async def create_meme_token(token_details: Dict[str, Any]):
     """
     API endpoint to create a meme token
     
     :param token_details: Details of the meme token to create
-    :return: Token creation result
+    :return: Queued mint job; poll /jobs/{job_id} for the result
     """
+    if token_mint_model() is None:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=MEME_TOKEN_UNSUPPORTED)
     try:
-        # In a real-world scenario, you'd validate the wallet and credentials
-        creator_wallet = Wallet.create()
-        
-        result = platform.create_meme_token(
-            creator_wallet, 
-            token_details.get('name', 'EON Meme'),
-            token_details.get('total_supply', 1_000_000_000)
-        )
-        
-        return result
+        return await mint_jobs.enqueue('meme_token', token_details)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.post("/create-nft-collection")
+@app.post("/create-nft-collection", status_code=status.HTTP_202_ACCEPTED)
 async def create_nft_collection(collection_details: Dict[str, Any]):
     """
     API endpoint to create an NFT collection
     
     :param collection_details: Details of the NFT collection to create
-    :return: Collection creation result
+    :return: Queued mint job; poll /jobs/{job_id} for the result
     """
     try:
-        # In a real-world scenario, you'd validate the wallet and credentials
-        creator_wallet = Wallet.create()
-        
-        result = platform.create_nft_collection(
-            creator_wallet,
-            collection_details.get('name', 'EON NFT Collection'),
-            collection_details.get('description', 'A unique NFT collection')
-        )
-        
-        return result
+        return await mint_jobs.enqueue('nft_collection', collection_details)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/jobs/{job_id}")
+async def get_mint_job(job_id: str):
+    """
+    Current status of a mint job
+    
+    :param job_id: Job ID returned by a create endpoint
+    :return: Job status, with the mint result once it has succeeded
+    """
+    job = await mint_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{job_id}/events")
+async def stream_mint_job(job_id: str):
+    """
+    Server-Sent Events stream of a mint job's status until it finishes
+    
+    The stream closes once the job has succeeded or failed, with keepalive
+    comments while nothing changes.
+    
+    :param job_id: Job ID returned by a create endpoint
+    """
+    if await mint_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        async for job in mint_jobs.watch(job_id, heartbeat_seconds=JOB_EVENTS_HEARTBEAT_SECONDS):
+            if job is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: job\ndata: {json.dumps(job)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
 def main():
     """
     Main entry point for the EON XRP Platform
     """
+    if '--profile-startup' in sys.argv:
+        from backend.src.utils.startup_profile import print_startup_report
+        print_startup_report('src.eon_xrp.main')
+        return
     print("EON XRP Platform Initialized")
     print(f"Support Contact: {PLATFORM_SUPPORT_EMAIL}")
     print("Ready to create meme tokens and NFT collections!")
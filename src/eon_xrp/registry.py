@@ -0,0 +1,50 @@
+import re
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.models.activity import ActivityEvent
+from backend.src.models.stats import PlatformStats, stats_increment
+from backend.src.models.token import RegisteredToken
+
+from .activity import activity_event
+
+# Created alongside mint_jobs, in case the eon_xrp app starts before the backend migrates
+REGISTRY_TABLES = (RegisteredToken.__table__, ActivityEvent.__table__, PlatformStats.__table__)
+
+def uri_slug(name: str) -> str:
+    return name.lower().replace(' ', '-')
+
+def symbol_from_name(name: str, length: int = 10) -> str:
+    return re.sub(r'[^A-Z0-9]', '', name.upper())[:length] or 'TOKEN'
+
+async def record_mint(db: AsyncSession, kind: str, payload: Dict[str, Any], result: Dict[str, Any]):
+    """
+    Add a successful mint to the registry, the platform token count and the
+    activity feed, in the job's finishing transaction
+
+    :param db: Session the job status update is committed with
+    :param kind: Mint job kind
+    :param payload: Job arguments, as submitted
+    :param result: Mint result returned by EONXRPPlatform
+    """
+    name = result.get('token_name') or result.get('collection_name')
+    symbol = payload.get('symbol') or symbol_from_name(name)
+    db.add(RegisteredToken(
+        kind=kind,
+        symbol=symbol,
+        name=name,
+        creator=result['creator'],
+        tx_hash=result.get('transaction_hash'),
+        uri_slug=result['uri_slug'],
+        ledger_index=result.get('ledger_index'),
+    ))
+    await db.execute(stats_increment(db.get_bind().dialect.name, total_tokens=1))
+    db.add(activity_event(
+        'mint',
+        kind=kind,
+        symbol=symbol,
+        name=name,
+        creator=result['creator'],
+        transaction_hash=result.get('transaction_hash')
+    ))